@@ -0,0 +1,8 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from labkit import bench  # noqa: E402
+
+if __name__ == "__main__":
+    raise SystemExit(bench.main())
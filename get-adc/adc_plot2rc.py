@@ -1,88 +1,12 @@
-import RPi.GPIO as GPIO
+import os
+import sys
 import time
-import matplotlib.pyplot as plt
-import numpy as np
 
-class R2R_ADC:
-    def __init__(self, dynamic_range, compare_time=0.001, verbose=True):
-        self.dynamic_range = dynamic_range
-        self.verbose = verbose
-        self.compare_time = compare_time
-        
-        self.bits_gpio = [26, 20, 19, 16, 13, 12, 25, 11]
-        self.comp_gpio = 21
-
-        print(f"Пины ЦАП: {self.bits_gpio}")
-        print(f"Пин компаратора: {self.comp_gpio}")
-        
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(self.bits_gpio, GPIO.OUT, initial=0)
-        GPIO.setup(self.comp_gpio, GPIO.IN)
-        
-        # Протестируем компаратор
-        print("Тестирование компаратора...")
-        self.number_to_dac(0)
-        time.sleep(0.1)
-        comp_state_low = GPIO.input(self.comp_gpio)
-        
-        self.number_to_dac(255)
-        time.sleep(0.1)
-        comp_state_high = GPIO.input(self.comp_gpio)
-        
-        print(f"Состояние компаратора (ЦАП=0): {comp_state_low}")
-        print(f"Состояние компаратора (ЦАП=255): {comp_state_high}")
-    
-    def __del__(self):
-        GPIO.output(self.bits_gpio, 0)
-        GPIO.cleanup()
-    
-    def number_to_dac(self, number):
-        binary = format(number, '08b')
-        for i, pin in enumerate(self.bits_gpio):
-            GPIO.output(pin, int(binary[i]))
-    
-    def test_comparator(self):
-        print("\nТестирование компаратора на разных значениях ЦАП:")
-        test_values = [0, 64, 128, 192, 255]
-        
-        for val in test_values:
-            self.number_to_dac(val)
-            time.sleep(0.1)
-            comp_state = GPIO.input(self.comp_gpio)
-            voltage = (val / 255) * self.dynamic_range
-            print(f"ЦАП={val:3d} ({voltage:.2f} В) -> Компаратор: {comp_state}")
-    
-    def fast_sequential_adc(self):
-        """Быстрый последовательный АЦП с измерением времени выполнения"""
-        start_measure_time = time.time()
-        
-        if self.verbose:
-            print("Начало измерения АЦП...")
-            
-        for number in range(256):
-            self.number_to_dac(number)
-            time.sleep(self.compare_time)
-            
-            comp_state = GPIO.input(self.comp_gpio)
-            
-            if self.verbose and number % 32 == 0:
-                voltage = (number / 255) * self.dynamic_range
-                print(f"Шаг {number:3d} ({voltage:.2f} В) -> Компаратор: {comp_state}")
-            
-            if comp_state == 1:
-                if self.verbose:
-                    print(f"Найден переход при числе: {number}")
-                measurement_time = time.time() - start_measure_time
-                return number, measurement_time
-        
-        measurement_time = time.time() - start_measure_time
-        return 255, measurement_time
-    
-    def get_sc_voltage(self):
-        """Возвращает измеренное напряжение в Вольтах и время измерения"""
-        digital_value, measurement_time = self.fast_sequential_adc()
-        voltage = (digital_value / 255) * self.dynamic_range
-        return voltage, measurement_time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from labkit import R2R_ADC  # noqa: E402
+from labkit.rc_fit import IncrementalRCFitter, fit_capture, print_fit  # noqa: E402
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
 
 
 def plot_voltage_vs_time(time_data, voltage_data, max_voltage):
@@ -165,12 +89,23 @@ def plot_sampling_period_hist(measurement_times):
     plt.show()
 
 
+def print_rc_fits(time_data, voltage_data):
+    """Постоянные времени по всей записи"""
+    fits = fit_capture(time_data, voltage_data)
+    if not fits:
+        print("Участков заряда и разряда не найдено")
+    for fit in fits:
+        print_fit(fit)
+
+
 # Основной скрипт
 if __name__ == "__main__":
     voltage_values = []
     time_values = []
     measurement_times = []  # Список для хранения времени каждого измерения
     duration = 15.0
+    # Подбор экспоненты по ходу записи: результат - как только кривая установилась
+    fitter = IncrementalRCFitter(threshold=0.1, settle_band=0.05, settle_points=10)
     
     adc = None
     try:
@@ -181,7 +116,7 @@ if __name__ == "__main__":
         print("GPIO21 -> физический пин 40 (компаратор)")
         print("Убедитесь, что компаратор подключен к правильному пину!\n")
         
-        adc = R2R_ADC(dynamic_range=3.3, verbose=False)
+        adc = R2R_ADC(dynamic_range=3.3, algorithm="counting", self_test="quick", verbose=False)
         
         start_time = time.time()
         measurement_count = 0
@@ -193,7 +128,7 @@ if __name__ == "__main__":
             current_time = time.time() - start_time
             
             # Получаем напряжение и время измерения
-            voltage, measurement_time = adc.get_sc_voltage()
+            voltage, measurement_time = adc.get_timed_voltage()
             
             voltage_values.append(voltage)
             time_values.append(current_time)
@@ -201,10 +136,15 @@ if __name__ == "__main__":
             measurement_count += 1
             
             print(f"Измерение {measurement_count:3d}: Время {current_time:5.1f} с, Напряжение: {voltage:.2f} В, Длительность: {measurement_time:.3f} с")
+
+            fit = fitter.add(current_time, voltage)
+            if fit is not None:
+                print_fit(fit)
             
             time.sleep(0.1)  # Небольшая пауза между измерениями
         
         print(f"\nИзмерения завершены! Всего измерений: {measurement_count}")
+        print_rc_fits(time_values, voltage_values)
         
         # Отображаем график напряжения
         plot_voltage_vs_time(time_values, voltage_values, adc.dynamic_range)
@@ -215,6 +155,7 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print(f"\nИзмерения прерваны. Всего измерений: {len(voltage_values)}")
         if voltage_values:
+            print_rc_fits(time_values, voltage_values)
             plot_voltage_vs_time(time_values, voltage_values, adc.dynamic_range if adc else 3.3)
         if measurement_times:
             plot_sampling_period_hist(measurement_times)
@@ -222,5 +163,5 @@ if __name__ == "__main__":
         print(f"Ошибка: {e}")
     finally:
         if adc is not None:
-            adc.__del__()
+            adc.deinit()
         print("Программа завершена")
\ No newline at end of file
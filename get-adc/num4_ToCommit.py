@@ -1,126 +1,11 @@
-import RPi.GPIO as GPIO
+import os
+import sys
 import time
-import matplotlib.pyplot as plt
-import numpy as np
 
-class R2R_ADC:
-    def __init__(self, dynamic_range, compare_time=0.001, verbose=False):
-        self.dynamic_range = dynamic_range
-        self.verbose = verbose
-        self.compare_time = compare_time
-        
-        self.bits_gpio = [26, 20, 19, 16, 13, 12, 25, 11]
-        self.comp_gpio = 21
-
-        print(f"Пины ЦАП: {self.bits_gpio}")
-        print(f"Пин компаратора: {self.comp_gpio}")
-        
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(self.bits_gpio, GPIO.OUT, initial=0)
-        GPIO.setup(self.comp_gpio, GPIO.IN)
-        
-        # Протестируем компаратор
-        print("Тестирование компаратора...")
-        self.number_to_dac(0)
-        time.sleep(0.1)
-        comp_state_low = GPIO.input(self.comp_gpio)
-        
-        self.number_to_dac(255)
-        time.sleep(0.1)
-        comp_state_high = GPIO.input(self.comp_gpio)
-        
-        print(f"Состояние компаратора (ЦАП=0): {comp_state_low}")
-        print(f"Состояние компаратора (ЦАП=255): {comp_state_high}")
-    
-    def __del__(self):
-        """Деструктор - выставляет 0 на выход ЦАП и очищает настройки GPIO"""
-        GPIO.output(self.bits_gpio, 0)
-        GPIO.cleanup()
-    
-    def number_to_dac(self, number):
-        """Подает число number на вход ЦАП"""
-        binary = format(number, '08b')
-        for i, pin in enumerate(self.bits_gpio):
-            GPIO.output(pin, int(binary[i]))
-    
-    def fast_sequential_adc(self):
-        """Быстрый последовательный АЦП с измерением времени выполнения"""
-        start_measure_time = time.time()
-        
-        if self.verbose:
-            print("Начало измерения АЦП...")
-            
-        for number in range(256):
-            self.number_to_dac(number)
-            time.sleep(self.compare_time)
-            
-            comp_state = GPIO.input(self.comp_gpio)
-            
-            if self.verbose and number % 32 == 0:
-                voltage = (number / 255) * self.dynamic_range
-                print(f"Шаг {number:3d} ({voltage:.2f} В) -> Компаратор: {comp_state}")
-            
-            if comp_state == 1:
-                if self.verbose:
-                    print(f"Найден переход при числе: {number}")
-                measurement_time = time.time() - start_measure_time
-                return number, measurement_time
-        
-        measurement_time = time.time() - start_measure_time
-        return 255, measurement_time
-    
-    def get_sc_voltage(self):
-        """Возвращает измеренное напряжение в Вольтах и время измерения"""
-        digital_value, measurement_time = self.fast_sequential_adc()
-        voltage = (digital_value / 255) * self.dynamic_range
-        return voltage, measurement_time
-
-    def successive_approximation_adc(self):
-        """Реализует алгоритм бинарного поиска напряжения на входе АЦП"""
-        if self.verbose:
-            print("Начало измерения методом последовательного приближения (SAR)...")
-        
-        # Начинаем со среднего значения 8-битного диапазона
-        result = 0
-        # Маска для установки битов, начиная со старшего
-        bit_mask = 0b10000000  # 128 в десятичной
-        
-        for _ in range(8):  # 8 итераций для 8-битного АЦП
-            # Устанавливаем текущий бит
-            test_value = result | bit_mask
-            self.number_to_dac(test_value)
-            time.sleep(self.compare_time)
-            
-            # Читаем состояние компаратора
-            comp_state = GPIO.input(self.comp_gpio)
-            
-            if self.verbose:
-                voltage = (test_value / 255) * self.dynamic_range
-                print(f"Тестовое значение: {test_value:3d} ({voltage:.2f} В) -> Компаратор: {comp_state}")
-            
-            if comp_state == 0:
-                # U_DAC < U_ADC - оставляем бит установленным
-                result = test_value
-                if self.verbose:
-                    print(f"  Бит установлен: {bin(test_value)}")
-            else:
-                # U_DAC > U_ADC - сбрасываем бит
-                if self.verbose:
-                    print(f"  Бит сброшен")
-            
-            # Переходим к следующему биту
-            bit_mask = bit_mask >> 1
-        
-        if self.verbose:
-            print(f"Результат SAR: {result}")
-        
-        return result
-
-    def get_sar_voltage(self):
-        """Возвращает измеренное алгоритмом бинарного поиска напряжение в Вольтах"""
-        digital_value = self.successive_approximation_adc()
-        voltage = (digital_value / 255) * self.dynamic_range
-        return voltage
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from labkit import R2R_ADC  # noqa: E402
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
 
 
 def plot_voltage_vs_time(time_data, voltage_data, max_voltage):
@@ -202,7 +87,7 @@ if __name__ == "__main__":
     try:
         # Создаем объект класса R2R_ADC
         print("Инициализация АЦП...")
-        adc = R2R_ADC(dynamic_range=3.3, compare_time=0.001, verbose=False)
+        adc = R2R_ADC(dynamic_range=3.3, compare_time=0.001, self_test="quick", verbose=False)
         
         print("Начало измерений напряжения методом последовательного приближения (SAR)")
         print("Для остановки нажмите Ctrl+C\n")
@@ -229,5 +114,5 @@ if __name__ == "__main__":
     finally:
         # Вызываем деструктор объекта класса R2R_ADC
         if adc is not None:
-            adc.__del__()
+            adc.deinit()
         print("Программа завершена, ресурсы освобождены")
\ No newline at end of file
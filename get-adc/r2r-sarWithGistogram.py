@@ -1,82 +1,11 @@
-import RPi.GPIO as GPIO
+import os
+import sys
 import time
-import matplotlib.pyplot as plt
-import numpy as np
 
-class R2R_ADC:
-    def __init__(self, dynamic_range, compare_time=0.001, verbose=False):
-        self.dynamic_range = dynamic_range
-        self.verbose = verbose
-        self.compare_time = compare_time
-        
-        self.bits_gpio = [26, 20, 19, 16, 13, 12, 25, 11]
-        self.comp_gpio = 21
-
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(self.bits_gpio, GPIO.OUT, initial=0)
-        GPIO.setup(self.comp_gpio, GPIO.IN)
-    
-    def __del__(self):
-        """Деструктор - выставляет 0 на выход ЦАП и очищает настройки GPIO"""
-        GPIO.output(self.bits_gpio, 0)
-        GPIO.cleanup()
-    
-    def number_to_dac(self, number):
-        """Подает число number на вход ЦАП"""
-        binary = format(number, '08b')
-        for i, pin in enumerate(self.bits_gpio):
-            GPIO.output(pin, int(binary[i]))
-    
-    def successive_approximation_adc(self):
-        """Реализует алгоритм бинарного поиска напряжения на входе АЦП"""
-        start_measure_time = time.time()
-        
-        if self.verbose:
-            print("Начало измерения методом последовательного приближения (SAR)...")
-        
-        # Начинаем со среднего значения 8-битного диапазона
-        result = 0
-        # Маска для установки битов, начиная со старшего
-        bit_mask = 0b10000000  # 128 в десятичной
-        
-        for _ in range(8):  # 8 итераций для 8-битного АЦП
-            # Устанавливаем текущий бит
-            test_value = result | bit_mask
-            self.number_to_dac(test_value)
-            time.sleep(self.compare_time)
-            
-            # Читаем состояние компаратора
-            comp_state = GPIO.input(self.comp_gpio)
-            
-            if self.verbose:
-                voltage = (test_value / 255) * self.dynamic_range
-                print(f"Тестовое значение: {test_value:3d} ({voltage:.2f} В) -> Компаратор: {comp_state}")
-            
-            if comp_state == 0:
-                # U_DAC < U_ADC - оставляем бит установленным
-                result = test_value
-                if self.verbose:
-                    print(f"  Бит установлен: {bin(test_value)}")
-            else:
-                # U_DAC > U_ADC - сбрасываем бит
-                if self.verbose:
-                    print(f"  Бит сброшен")
-            
-            # Переходим к следующему биту
-            bit_mask = bit_mask >> 1
-        
-        measurement_time = time.time() - start_measure_time
-        
-        if self.verbose:
-            print(f"Результат SAR: {result}, Время измерения: {measurement_time:.3f} с")
-        
-        return result, measurement_time
-
-    def get_sar_voltage(self):
-        """Возвращает измеренное алгоритмом бинарного поиска напряжение в Вольтах и время измерения"""
-        digital_value, measurement_time = self.successive_approximation_adc()
-        voltage = (digital_value / 255) * self.dynamic_range
-        return voltage, measurement_time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from labkit import R2R_ADC  # noqa: E402
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
 
 
 def plot_voltage_vs_time(time_data, voltage_data, max_voltage):
@@ -185,7 +114,7 @@ if __name__ == "__main__":
             current_time = time.time() - start_time
             
             # Получаем напряжение и время измерения
-            voltage, measurement_time = adc.get_sar_voltage()
+            voltage, measurement_time = adc.get_timed_voltage("sar")
             
             voltage_values.append(voltage)
             time_values.append(current_time)
@@ -222,5 +151,5 @@ if __name__ == "__main__":
     finally:
         # Вызываем деструктор класса
         if adc is not None:
-            adc.__del__()
+            adc.deinit()
         print("Программа завершена, ресурсы освобождены")
\ No newline at end of file
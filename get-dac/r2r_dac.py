@@ -1,32 +1,8 @@
-import RPi.GPIO as GPIO
+import os
+import sys
 
-class R2R_DAC:
-    def __init__(self, gpio_bits, dynamic_range, verbose = False):
-        self.gpio_bits = gpio_bits
-        self.dynamic_range = dynamic_range
-        self.verbose = verbose
-        GPIO.setmode(GPIO.BCM)
-        GPIO.setup(self.gpio_bits, GPIO.OUT, initial = 0)
-
-    def deinit(self):
-        GPIO.output(self.gpio_bits, 0)
-        GPIO.cleanup()
-
-    def set_number(self, number):
-        dec2bin = [int(element) for element in bin(number)[2:].zfill(8)]
-        for i in range(len(dec2bin)):
-            if dec2bin[i] == 1:
-                GPIO.output(self.gpio_bits[i], 1)
-            else:
-                GPIO.output(self.gpio_bits[i], 0)
-
-    def set_voltage(self, voltage):
-        if not(0.0 <= voltage <= self.dynamic_range):
-            print(f"Напряжение выходит за динамический диапазон ЦАП (0.00 - {self.dynamic_range:.2f} B")
-            print("Устанавливаем 0.0 В")
-            return 0
-        a = int(voltage / self.dynamic_range * 255)
-        self.set_number(a)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from labkit.dac import R2R_DAC  # noqa: E402
 
 if __name__ == "__main__":
     try:
@@ -1,12 +1,23 @@
-import RPi.GPIO as GPIO
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import RPi.GPIO as GPIO  # noqa: E402
+from labkit.inputs import Dispatcher  # noqa: E402
+
 GPIO.setmode(GPIO.BCM)
 led = 26
 GPIO.setup(led, GPIO.OUT)
 state = 1
 sens = 6
-GPIO.setup(sens, GPIO.IN)
-while True:
-    if GPIO.input(sens):
-        GPIO.output(led, state)
-    else:
-        GPIO.output(led, not state)
\ No newline at end of file
+
+inputs = Dispatcher(debounce=0.05)
+inputs.add_input(sens)
+GPIO.output(led, state if inputs.level(sens) else not state)
+# Светодиод переключается только при изменении уровня датчика
+inputs.on(sens, None, lambda event: GPIO.output(led, state if event.level else not state))
+try:
+    inputs.run()
+finally:
+    inputs.deinit()
+    GPIO.cleanup()
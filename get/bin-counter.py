@@ -1,31 +1,38 @@
-import RPi.GPIO as GPIO
-import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import RPi.GPIO as GPIO  # noqa: E402
+from labkit.inputs import RISING, Dispatcher  # noqa: E402
+
 GPIO.setmode(GPIO.BCM)
 leds = [16, 12, 25, 17, 27, 23, 22, 24]
 GPIO.setup(leds, GPIO.OUT)
 GPIO.output(leds, 0)
 up = 9
 down = 10
-GPIO.setup(up, GPIO.IN)
-GPIO.setup(down, GPIO.IN)
 num = 0
 def dec2bin(value):
     return [int(element) for element in bin(value)[2:].zfill(8)]
 
-sleep_time = 0.2
-while True:
-    if GPIO.input(up) and (num <= 254):
-        num = num + 1
-        print(num, dec2bin(num))
-        time.sleep(sleep_time)
 
-    if GPIO.input(down) and (num >= 1):
-        num = num - 1
-        print(num, dec2bin(num))
-        time.sleep(sleep_time)
+def change(step):
+    def handler(event):
+        global num
+        if 0 <= num + step <= 255:
+            num = num + step
+            print(num, dec2bin(num))
+            GPIO.output(leds, dec2bin(num))
+    return handler
+
 
-    for led in leds:
-        if dec2bin(num)[led]:
-            GPIO.output(led, 1)
-        else:
-            GPIO.output(led, 0)
+# Каждое нажатие - ровно один шаг, без опроса и пауз
+inputs = Dispatcher(debounce=0.02)
+inputs.on(up, RISING, change(1))
+inputs.on(down, RISING, change(-1))
+try:
+    inputs.run()
+finally:
+    inputs.deinit()
+    GPIO.output(leds, 0)
+    GPIO.cleanup()
@@ -1,11 +1,18 @@
-import RPi.GPIO as GPIO
-import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import RPi.GPIO as GPIO  # noqa: E402
+from labkit.timeline import Timeline, blink  # noqa: E402
+
 GPIO.setmode(GPIO.BCM)
 led = 26
 GPIO.setup(led, GPIO.OUT)
-state = 0
-period=1.0
-while True:
-    GPIO.output(led, state)
-    state = not state
-    time.sleep(period/2)
\ No newline at end of file
+period = 1.0
+timeline = Timeline()
+timeline.add(blink(led, period))
+try:
+    timeline.run()
+finally:
+    GPIO.output(led, 0)
+    GPIO.cleanup()
@@ -1,14 +1,28 @@
-import RPi.GPIO as GPIO
-import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import RPi.GPIO as GPIO  # noqa: E402
+from labkit.inputs import RISING, Dispatcher  # noqa: E402
+
 GPIO.setmode(GPIO.BCM)
 led = 26
 GPIO.setup(led, GPIO.OUT)
 state = 0
-period=1.0
 button = 13
-GPIO.setup(button, GPIO.IN)
-while True:
-    if GPIO.input(button):
-        state = not state
-        GPIO.output(led, state)
-        time.sleep(0.2)
\ No newline at end of file
+
+
+def toggle(event):
+    global state
+    state = not state
+    GPIO.output(led, state)
+
+
+# Нажатие обрабатывается по прерыванию, в ожидании процессор свободен
+inputs = Dispatcher(debounce=0.02)
+inputs.on(button, RISING, toggle)
+try:
+    inputs.run()
+finally:
+    inputs.deinit()
+    GPIO.cleanup()
@@ -1,15 +1,20 @@
-import RPi.GPIO as GPIO
-import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import RPi.GPIO as GPIO  # noqa: E402
+from labkit.timeline import Timeline, chase  # noqa: E402
+
 GPIO.setmode(GPIO.BCM)
 leds = [24, 22, 23, 27, 17, 25, 12, 16]
 GPIO.setup(leds, GPIO.OUT)
 GPIO.output(leds, 0)
 light_time = 0.2
-for led in leds:
-    GPIO.output(led, 1)
-    time.sleep(light_time)
-    GPIO.output(led, 0)
-for led in reversed(leds):
-    GPIO.output(led, 1)
-    time.sleep(light_time)
-    GPIO.output(led, 0)
\ No newline at end of file
+# Туда и обратно; в тот же Timeline можно добавить и другие эффекты
+timeline = Timeline()
+timeline.add(chase(leds, light_time, bounce=True))
+try:
+    timeline.run()
+finally:
+    GPIO.output(leds, 0)
+    GPIO.cleanup()
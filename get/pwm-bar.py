@@ -0,0 +1,23 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from labkit.pwm import SoftPWM  # noqa: E402
+
+# Все 8 светодиодов шкалы ведет один поток ШИМ
+leds = [16, 12, 25, 17, 27, 23, 22, 24]
+pwm = SoftPWM(leds, frequency=100)
+pwm.start()
+level = 0.0
+step = 0.05
+try:
+    while True:
+        pwm.set_bar(level)
+        level += step
+        if level > len(leds) or level < 0:
+            step = -step
+            level += step
+        time.sleep(0.02)
+finally:
+    pwm.deinit()
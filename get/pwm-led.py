@@ -1,14 +1,17 @@
-import RPi.GPIO as GPIO
-import time
-GPIO.setmode(GPIO.BCM)
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from labkit.pwm import SoftPWM  # noqa: E402
+from labkit.timeline import Timeline, fade  # noqa: E402
+
 led = 26
-GPIO.setup(led, GPIO.OUT)
-pwm = GPIO.PWM(led, 200)
-duty = 0.0
-pwm.start(duty)
-while True:
-    pwm.ChangeDutyCycle(duty)
-    time.sleep(0.05)
-    duty += 1.0
-    if duty > 100.0:
-        duty = 0.0
\ No newline at end of file
+pwm = SoftPWM([led], frequency=200)
+pwm.start()
+# Нарастание яркости за 5 с (100 шагов по 0.05 с) по гамма-кривой
+timeline = Timeline(pwm=pwm)
+timeline.add(fade(led, period=5.0, steps=100))
+try:
+    timeline.run()
+finally:
+    pwm.deinit()
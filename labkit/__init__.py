@@ -0,0 +1,4 @@
+"""Общие драйверы и утилиты лабораторных работ с Raspberry Pi"""
+from labkit.r2r_adc import R2R_ADC
+
+__all__ = ["R2R_ADC"]
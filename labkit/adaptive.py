@@ -0,0 +1,141 @@
+"""
+Адаптивная частота измерений для долгого мониторинга
+
+Пока сигнал стоит на месте, период между измерениями растет в backoff раз
+до max_period. Как только напряжение изменилось больше чем на threshold
+или скорость его изменения превысила slope_threshold, период сразу
+сбрасывается к min_period. Каждое измерение пишется в CSV с меткой
+времени в формате команды acquire, поэтому его читает python -m labkit analyze.
+"""
+import collections
+import time
+
+# Отсчет: время от старта, напряжение, время измерения и период до следующего отсчета, с
+Sample = collections.namedtuple("Sample", "time voltage measurement_time period")
+
+
+class AdaptiveSampler:
+    def __init__(self, read, min_period=0.05, max_period=2.0, threshold=0.02, slope_threshold=None,
+                 backoff=2.0, clock=None, sleep=None):
+        """
+        Args:
+            read (callable): Функция измерения, возвращает напряжение в Вольтах (например, adc.get_voltage)
+            min_period (float): Период измерений при активном сигнале, с
+            max_period (float): Наибольший период для неподвижного сигнала, с
+            threshold (float): Изменение напряжения, считающееся активностью, В
+            slope_threshold (float): Скорость изменения, считающаяся активностью, В/с (None - не учитывать)
+            backoff (float): Во сколько раз растет период после каждого спокойного отсчета
+            clock (callable): Часы в секундах (по умолчанию - time.perf_counter)
+            sleep (callable): Функция ожидания (по умолчанию - time.sleep)
+        """
+        if not 0 < min_period <= max_period:
+            raise ValueError("Нужно 0 < min_period <= max_period")
+        if backoff < 1:
+            raise ValueError("backoff должен быть не меньше 1")
+
+        self.read = read
+        self.min_period = min_period
+        self.max_period = max_period
+        self.threshold = threshold
+        self.slope_threshold = slope_threshold
+        self.backoff = backoff
+        self.clock = clock if clock is not None else time.perf_counter
+        self.sleep = sleep if sleep is not None else time.sleep
+
+        self.period = min_period
+        self.last_time = None
+        self.last_voltage = None
+        self.samples = 0
+
+    def next_period(self, current_time, voltage):
+        """Обновляет период по новому отсчету и возвращает его"""
+        if self.last_voltage is not None:
+            change = abs(voltage - self.last_voltage)
+            dt = current_time - self.last_time
+            active = change > self.threshold
+            if not active and self.slope_threshold is not None and dt > 0:
+                active = change / dt > self.slope_threshold
+            if active:
+                self.period = self.min_period
+            else:
+                self.period = min(self.period * self.backoff, self.max_period)
+        self.last_time = current_time
+        self.last_voltage = voltage
+        return self.period
+
+    def run(self, duration, output=None):
+        """
+        Измеряет duration секунд с адаптивным периодом
+
+        Args:
+            duration (float): Продолжительность мониторинга, с (None - до Ctrl+C)
+            output: Открытый текстовый файл для CSV (None - не записывать)
+
+        Yields:
+            Sample: Очередной отсчет
+        """
+        clock = self.clock
+        read = self.read
+        if output is not None:
+            output.write("time,voltage,measurement_time\n")
+
+        start_time = clock()
+        next_time = start_time
+        while True:
+            current_time = clock() - start_time
+            if duration is not None and current_time >= duration:
+                return
+            voltage = read()
+            measurement_time = clock() - start_time - current_time
+            period = self.next_period(current_time, voltage)
+            self.samples += 1
+            if output is not None:
+                output.write(f"{current_time:.6f},{voltage:.4f},{measurement_time:.6f}\n")
+            yield Sample(current_time, voltage, measurement_time, period)
+
+            # Отсчет от запланированного момента - без накопления сдвига
+            next_time += period
+            delay = next_time - clock()
+            if delay > 0:
+                self.sleep(delay)
+            else:
+                next_time = clock()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from labkit import sim
+
+    parser = argparse.ArgumentParser(description="Мониторинг напряжения с адаптивной частотой")
+    parser.add_argument("--duration", type=float, default=600.0, help="Продолжительность, с")
+    parser.add_argument("--output", default="adaptive.csv", help="Файл для записи")
+    parser.add_argument("--min-period", type=float, default=0.05)
+    parser.add_argument("--max-period", type=float, default=2.0)
+    parser.add_argument("--threshold", type=float, default=0.02, help="Порог изменения, В")
+    parser.add_argument("--sim", action="store_true", help="Ступеньки напряжения в симуляторе")
+    args = parser.parse_args()
+
+    if args.sim:
+        # Ступенька каждые 100 с на виртуальных часах - полчаса модели за секунды
+        simulator = sim.SimulatedGPIO(lambda t: 1.0 + 0.5 * (int(t // 100) % 3))
+        adc = simulator.make_adc(compare_time=0.0)
+        sampler = AdaptiveSampler(adc.get_voltage, args.min_period, args.max_period, args.threshold,
+                                  clock=lambda: simulator.clock, sleep=simulator.sleep)
+    else:
+        from labkit import R2R_ADC
+        adc = R2R_ADC(dynamic_range=3.3, compare_time=0.001)
+        sampler = AdaptiveSampler(adc.get_voltage, args.min_period, args.max_period, args.threshold)
+
+    try:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for sample in sampler.run(args.duration, f):
+                if sample.period == sampler.min_period:
+                    print(f"{sample.time:9.3f} с: {sample.voltage:.3f} В (активность)")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        adc.deinit()
+
+    fixed = args.duration / args.min_period
+    print(f"Отсчетов: {sampler.samples} вместо {fixed:.0f} при постоянном периоде {args.min_period} с")
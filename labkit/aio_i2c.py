@@ -0,0 +1,226 @@
+"""
+Асинхронные драйверы MCP3021 и MCP4725 с общим арбитром шины I2C
+
+Все транзакции идут через BusArbiter: он держит очередь запросов для каждого
+устройства, выбирает их по кругу (ни одно устройство не захватывает шину) и
+выполняет накопившиеся запросы пачкой в одном рабочем потоке. Цикл событий
+при этом не блокируется, и один цикл может опрашивать несколько АЦП и
+одновременно управлять ЦАП.
+"""
+import asyncio
+import collections
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from labkit.i2c_bus import POOL
+from labkit.mcp3021 import DEFAULT_ADDRESS as MCP3021_ADDRESS
+from labkit.mcp3021 import MAX_NUMBER as MCP3021_MAX
+from labkit.mcp3021 import decode_word
+from labkit.mcp4725 import DEFAULT_ADDRESS as MCP4725_ADDRESS
+from labkit.mcp4725 import MAX_NUMBER as MCP4725_MAX
+from labkit.mcp4725 import encode_number
+
+
+class BusArbiter:
+    def __init__(self, bus=None, bus_number=1, max_batch=32):
+        """
+        Арбитр шины I2C
+
+        Args:
+            bus: Объект с интерфейсом smbus.SMBus (по умолчанию - общая шина bus_number из POOL)
+            bus_number (int): Номер шины I2C
+            max_batch (int): Максимум транзакций за один переход в рабочий поток
+        """
+        self.owns_bus = bus is None
+        self.bus = POOL.acquire(bus_number) if bus is None else bus
+        self.max_batch = max_batch
+        self.queues = collections.OrderedDict()  # адрес -> очередь (функция, аргументы, future)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="i2c")
+        self.pending = None
+        self.worker = None
+        self.in_flight = []  # Пачка, которая сейчас выполняется в рабочем потоке
+        self.closed = False
+        self.batches = 0
+        self.transactions = 0
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def start(self):
+        if self.worker is None:
+            self.pending = asyncio.Event()
+            self.worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        self.closed = True
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+            self.worker = None
+        # Запросы выполняемой пачки уже вынуты из очередей: их отменяем отдельно
+        for _, _, future in self.in_flight:
+            future.cancel()
+        self.in_flight = []
+        for queue in self.queues.values():
+            for _, _, future in queue:
+                future.cancel()
+        self.queues.clear()
+        self.executor.shutdown(wait=True)
+        # Повторный close() не должен второй раз отпускать общую шину
+        if self.owns_bus and self.bus is not None:
+            self.bus.close()
+        self.bus = None
+
+    def submit(self, address, method, *args):
+        """
+        Ставит транзакцию bus.<method>(*args) в очередь устройства address
+
+        Returns:
+            asyncio.Future: Результат транзакции
+
+        Raises:
+            RuntimeError: Если арбитр уже закрыт
+        """
+        if self.closed:
+            raise RuntimeError("Арбитр шины I2C закрыт")
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        self.queues.setdefault(address, collections.deque()).append((method, args, future))
+        self.pending.set()
+        return future
+
+    def _take_batch(self):
+        """Берет до max_batch запросов, по одному от каждого устройства по кругу"""
+        batch = []
+        while len(batch) < self.max_batch and self.queues:
+            for address in list(self.queues):
+                queue = self.queues[address]
+                batch.append(queue.popleft())
+                if not queue:
+                    del self.queues[address]
+                else:
+                    # Устройство уходит в конец круга
+                    self.queues.move_to_end(address)
+                if len(batch) == self.max_batch:
+                    break
+        return batch
+
+    def _execute(self, batch):
+        results = []
+        for method, args, _ in batch:
+            try:
+                results.append((getattr(self.bus, method)(*args), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.pending.wait()
+            self.pending.clear()
+            while self.queues:
+                batch = [item for item in self._take_batch() if not item[2].cancelled()]
+                if not batch:
+                    continue
+                self.in_flight = batch
+                results = await loop.run_in_executor(self.executor, self._execute, batch)
+                self.in_flight = []
+                self.batches += 1
+                self.transactions += len(batch)
+                for (_, _, future), (result, error) in zip(batch, results):
+                    if future.cancelled():
+                        continue
+                    if error is not None:
+                        future.set_exception(error)
+                    else:
+                        future.set_result(result)
+
+
+class AsyncMCP3021:
+    def __init__(self, arbiter, dynamic_range, address=MCP3021_ADDRESS):
+        self.arbiter = arbiter
+        self.dynamic_range = dynamic_range
+        self.address = address
+
+    async def get_number(self):
+        """Читает 10-битное число (0-1023)"""
+        data = await self.arbiter.submit(self.address, "read_word_data", self.address, 0)
+        return decode_word(data)
+
+    async def get_voltage(self):
+        return await self.get_number() / MCP3021_MAX * self.dynamic_range
+
+    async def read_into(self, codes_buf, ts_buf, clock=time.monotonic_ns):
+        """Заполняет буферы кодами и метками времени (нс) на месте; возвращает число отсчетов"""
+        count = min(len(codes_buf), len(ts_buf))
+        for i in range(count):
+            data = await self.arbiter.submit(self.address, "read_word_data", self.address, 0)
+            codes_buf[i] = decode_word(data)
+            ts_buf[i] = clock()
+        return count
+
+
+class AsyncMCP4725:
+    def __init__(self, arbiter, dynamic_range, address=MCP4725_ADDRESS, wm=0x00, pds=0x00):
+        self.arbiter = arbiter
+        self.dynamic_range = dynamic_range
+        self.address = address
+        self.wm = wm
+        self.pds = pds
+
+    async def set_number(self, number):
+        if not (0 <= number <= MCP4725_MAX):
+            raise ValueError(f"Число {number} выходит за разрядность MCP4725 (12 bit)")
+        first_byte, second_byte = encode_number(number, self.wm, self.pds)
+        await self.arbiter.submit(self.address, "write_byte_data", self.address, first_byte, second_byte)
+
+    async def set_voltage(self, voltage):
+        if not (0.0 <= voltage <= self.dynamic_range):
+            raise ValueError(f"Напряжение выходит за динамический диапазон ЦАП (0.00 - {self.dynamic_range:.2f}) B")
+        await self.set_number(int(voltage / self.dynamic_range * MCP4725_MAX))
+
+
+async def _demo(duration=2.0):
+    from labkit import signals, sim
+
+    bus = sim.FakeSMBus({
+        0x4D: sim.FakeMCP3021(sim.sine_signal(2.5, 2.0, 1.0)),
+        0x48: sim.FakeMCP3021(sim.dc_signal(1.2)),
+        MCP4725_ADDRESS: sim.FakeMCP4725(),
+    }, transaction_time=1e-4)
+
+    async with BusArbiter(bus) as arbiter:
+        adcs = [AsyncMCP3021(arbiter, 5.0, 0x4D), AsyncMCP3021(arbiter, 5.0, 0x48)]
+        dac = AsyncMCP4725(arbiter, 5.11)
+        counts = [0] * len(adcs)
+        end = time.monotonic() + duration
+
+        async def poll(i):
+            while time.monotonic() < end:
+                await adcs[i].get_voltage()
+                counts[i] += 1
+
+        async def drive():
+            start = time.monotonic()
+            while time.monotonic() < end:
+                t = time.monotonic() - start
+                await dac.set_voltage(signals.get_sin_wave_amplitude(1.0, t) * 5.0)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(drive(), *(poll(i) for i in range(len(adcs))))
+
+        for adc, count in zip(adcs, counts):
+            print(f"MCP3021 0x{adc.address:02X}: {count / duration:.0f} измерений/с")
+        print(f"Транзакций: {arbiter.transactions}, пачек: {arbiter.batches}")
+
+
+if __name__ == "__main__":
+    asyncio.run(_demo())
@@ -0,0 +1,363 @@
+"""
+Сжатый архив многодневных записей с индексом по времени
+
+Отсчеты (код АЦП и метка времени в нс) копятся в куски по chunk_size.
+Кусок кодируется так: разности соседних кодов и вторые разности меток
+времени переводятся в неотрицательные числа (zigzag) и пишутся varint -
+при медленном сигнале и ровном шаге почти все они занимают один байт, -
+а затем сжимаются zlib. Метки времени хранятся с точностью
+time_resolution (по умолчанию 1 мкс): дрожание планировщика в
+наносекундах сжатию не поддается, а смысла в нем нет. Файлы сменяются
+по размеру (и, по желанию, по возрасту), старые можно удалять
+автоматически.
+
+Рядом с каждым файлом данных лежит индекс: одна запись фиксированного
+размера на кусок (первая и последняя метки времени, смещение, канал,
+число отсчетов). Чтобы прочитать окно времени, читаются только индексы
+и распаковываются только куски, попавшие в окно.
+"""
+import array
+import bisect
+import glob
+import os
+import struct
+import time
+import zlib
+
+MAGIC = b"LKA1"
+# Заголовок куска: магия, канал, число отсчетов, шаг меток времени в нс,
+# длина сжатых данных, CRC32 сжатых данных
+CHUNK_HEADER = struct.Struct("<4sHIIII")
+# Запись индекса: первая и последняя метки времени, смещение куска в файле, канал, число отсчетов
+INDEX_RECORD = struct.Struct("<qqQHI")
+DATA_SUFFIX = ".lka"
+INDEX_SUFFIX = ".idx"
+
+
+def _put_varints(values, out):
+    """Дописывает в out неотрицательные целые в формате varint"""
+    append = out.append
+    for value in values:
+        while value >= 0x80:
+            append((value & 0x7F) | 0x80)
+            value >>= 7
+        append(value)
+
+
+def _get_varints(data, count):
+    """Читает count чисел varint из начала data; возвращает (числа, позиция после них)"""
+    values = [0] * count
+    pos = 0
+    for i in range(count):
+        byte = data[pos]
+        pos += 1
+        if byte < 0x80:
+            values[i] = byte
+            continue
+        value = byte & 0x7F
+        shift = 7
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        values[i] = value
+    return values, pos
+
+
+def encode_chunk(codes, timestamps, resolution=1):
+    """Кодирует кусок: zigzag-varint разностей кодов и вторых разностей времени (в единицах resolution нс)"""
+    out = bytearray()
+    previous = 0
+    deltas = []
+    for code in codes:
+        delta = code - previous
+        deltas.append(delta << 1 if delta >= 0 else ((-delta) << 1) - 1)
+        previous = code
+    _put_varints(deltas, out)
+
+    previous = 0
+    previous_step = 0
+    deltas = []
+    for timestamp in timestamps:
+        timestamp //= resolution
+        step = timestamp - previous
+        delta = step - previous_step
+        deltas.append(delta << 1 if delta >= 0 else ((-delta) << 1) - 1)
+        previous = timestamp
+        previous_step = step
+    _put_varints(deltas, out)
+    return out
+
+
+def decode_chunk(payload, count, resolution=1):
+    """Обратное к encode_chunk (payload уже распакован); возвращает (array('H'), array('q'))"""
+    code_deltas, pos = _get_varints(payload, count)
+    time_deltas, _ = _get_varints(memoryview(payload)[pos:], count)
+
+    codes = array.array("H", bytes(2 * count))
+    code = 0
+    for i, z in enumerate(code_deltas):
+        code += (z >> 1) if not z & 1 else -((z + 1) >> 1)
+        codes[i] = code
+
+    timestamps = array.array("q", bytes(8 * count))
+    timestamp = 0
+    step = 0
+    for i, z in enumerate(time_deltas):
+        step += (z >> 1) if not z & 1 else -((z + 1) >> 1)
+        timestamp += step
+        timestamps[i] = timestamp * resolution
+    return codes, timestamps
+
+
+class ArchiveWriter:
+    def __init__(self, directory, prefix="archive", chunk_size=4096, rotate_bytes=64 << 20,
+                 rotate_seconds=None, keep_files=None, level=6, time_resolution=1000):
+        """
+        Args:
+            directory (str): Каталог архива
+            prefix (str): Начало имен файлов
+            chunk_size (int): Отсчетов в куске (на канал)
+            rotate_bytes (int): Размер файла, после которого начинается новый
+            rotate_seconds (float): Возраст файла, после которого начинается новый (None - без ограничения)
+            keep_files (int): Сколько последних файлов хранить, не меньше 1 (None - все)
+            level (int): Уровень сжатия zlib
+            time_resolution (int): Точность хранения меток времени, нс
+        """
+        if keep_files is not None and keep_files < 1:
+            raise ValueError(f"keep_files = {keep_files}: текущий файл удалить нельзя, нужно не меньше 1")
+        self.directory = directory
+        self.prefix = prefix
+        self.chunk_size = chunk_size
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.keep_files = keep_files
+        self.level = level
+        self.time_resolution = time_resolution
+        self.buffers = {}  # канал -> (array('H') кодов, array('q') меток времени)
+        self.data_file = None
+        self.index_file = None
+        self.opened_at = 0.0
+        self.samples = 0
+        self.bytes_written = 0
+
+        os.makedirs(directory, exist_ok=True)
+        existing = archive_files(directory, prefix)
+        self.file_number = _file_number(existing[-1]) + 1 if existing else 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, code, timestamp, channel=0):
+        """Добавляет один отсчет (метка времени в нс)"""
+        buffer = self.buffers.get(channel)
+        if buffer is None:
+            buffer = self.buffers[channel] = (array.array("H"), array.array("q"))
+        buffer[0].append(code)
+        buffer[1].append(timestamp)
+        if len(buffer[0]) >= self.chunk_size:
+            self._flush_channel(channel)
+
+    def write_block(self, codes, timestamps, channel=0):
+        """Добавляет блок отсчетов (например, из MCP3021 MultiChannelReader.blocks())"""
+        buffer = self.buffers.get(channel)
+        if buffer is None:
+            buffer = self.buffers[channel] = (array.array("H"), array.array("q"))
+        buffer[0].extend(codes)
+        buffer[1].extend(timestamps)
+        while len(buffer[0]) >= self.chunk_size:
+            self._flush_channel(channel)
+
+    def flush(self):
+        """Записывает неполные куски всех каналов"""
+        for channel in list(self.buffers):
+            while self.buffers[channel][0]:
+                self._flush_channel(channel)
+        if self.data_file is not None:
+            self.data_file.flush()
+            self.index_file.flush()
+
+    def close(self):
+        self.flush()
+        self._close_files()
+
+    def _flush_channel(self, channel):
+        codes, timestamps = self.buffers[channel]
+        count = min(len(codes), self.chunk_size)
+        chunk_codes, chunk_times = codes[:count], timestamps[:count]
+        del codes[:count]
+        del timestamps[:count]
+
+        self._maybe_rotate()
+        resolution = self.time_resolution
+        compressed = zlib.compress(encode_chunk(chunk_codes, chunk_times, resolution), self.level)
+        offset = self.data_file.tell()
+        self.data_file.write(CHUNK_HEADER.pack(MAGIC, channel, count, resolution, len(compressed),
+                                               zlib.crc32(compressed)))
+        self.data_file.write(compressed)
+        # Кусок должен оказаться в файле раньше записи индекса: читатель
+        # во время записи иначе найдет в индексе еще не записанные данные
+        self.data_file.flush()
+        first = chunk_times[0] // resolution * resolution
+        last = chunk_times[-1] // resolution * resolution
+        self.index_file.write(INDEX_RECORD.pack(first, last, offset, channel, count))
+        self.index_file.flush()
+        self.samples += count
+        self.bytes_written += CHUNK_HEADER.size + len(compressed) + INDEX_RECORD.size
+
+    def _maybe_rotate(self):
+        if self.data_file is not None:
+            too_big = self.data_file.tell() >= self.rotate_bytes
+            too_old = self.rotate_seconds is not None and time.monotonic() - self.opened_at >= self.rotate_seconds
+            if not (too_big or too_old):
+                return
+            self._close_files()
+
+        base = os.path.join(self.directory, f"{self.prefix}-{self.file_number:06d}")
+        self.file_number += 1
+        self.data_file = open(base + DATA_SUFFIX, "wb")
+        self.index_file = open(base + INDEX_SUFFIX, "wb")
+        self.opened_at = time.monotonic()
+
+        if self.keep_files is not None:
+            for path in archive_files(self.directory, self.prefix)[:-self.keep_files]:
+                os.remove(path)
+                os.remove(path[:-len(DATA_SUFFIX)] + INDEX_SUFFIX)
+
+    def _close_files(self):
+        if self.data_file is not None:
+            self.data_file.close()
+            self.index_file.close()
+            self.data_file = None
+            self.index_file = None
+
+
+def archive_files(directory, prefix="archive"):
+    """Файлы данных архива по порядку записи"""
+    return sorted(glob.glob(os.path.join(glob.escape(directory), f"{prefix}-*{DATA_SUFFIX}")))
+
+
+def _file_number(path):
+    return int(os.path.basename(path)[:-len(DATA_SUFFIX)].rsplit("-", 1)[1])
+
+
+class ArchiveReader:
+    def __init__(self, directory, prefix="archive"):
+        """Загружает индексы всех файлов архива (сами данные не читаются)"""
+        self.chunks = []  # (первая метка, последняя метка, путь, смещение, канал, число отсчетов)
+        for path in archive_files(directory, prefix):
+            with open(path[:-len(DATA_SUFFIX)] + INDEX_SUFFIX, "rb") as f:
+                index = f.read()
+            # Неполная последняя запись (файл пишется прямо сейчас) пропускается
+            usable = len(index) - len(index) % INDEX_RECORD.size
+            for first, last, offset, channel, count in INDEX_RECORD.iter_unpack(index[:usable]):
+                self.chunks.append((first, last, path, offset, channel, count))
+        self.chunks.sort(key=lambda chunk: chunk[0])
+        self.starts = [chunk[0] for chunk in self.chunks]
+        # Для поиска: наибольшая последняя метка среди кусков до i включительно
+        self.max_ends = []
+        running = None
+        for chunk in self.chunks:
+            running = chunk[1] if running is None else max(running, chunk[1])
+            self.max_ends.append(running)
+        self.chunks_decoded = 0
+
+    def channels(self):
+        return sorted({chunk[4] for chunk in self.chunks})
+
+    def read_chunk(self, path, offset):
+        with open(path, "rb") as f:
+            f.seek(offset)
+            magic, channel, count, resolution, length, crc = CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))
+            compressed = f.read(length)
+        if magic != MAGIC or zlib.crc32(compressed) != crc:
+            raise ValueError(f"Поврежденный кусок архива: {path} @ {offset}")
+        self.chunks_decoded += 1
+        return decode_chunk(zlib.decompress(compressed), count, resolution)
+
+    def read_window(self, start, end, channel=0):
+        """
+        Отсчеты канала с метками времени в [start, end) нс
+
+        Returns:
+            tuple: (array('H') кодов, array('q') меток времени)
+        """
+        codes = array.array("H")
+        timestamps = array.array("q")
+        # Первый кусок, который может заканчиваться после start
+        first = bisect.bisect_left(self.max_ends, start)
+        last = bisect.bisect_left(self.starts, end)
+        for chunk_start, chunk_end, path, offset, chunk_channel, _ in self.chunks[first:last]:
+            if chunk_channel != channel or chunk_end < start:
+                continue
+            chunk_codes, chunk_times = self.read_chunk(path, offset)
+            lo = bisect.bisect_left(chunk_times, start)
+            hi = bisect.bisect_left(chunk_times, end)
+            codes.extend(chunk_codes[lo:hi])
+            timestamps.extend(chunk_times[lo:hi])
+        return codes, timestamps
+
+
+if __name__ == "__main__":
+    import argparse
+    import math
+    import random
+    import shutil
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Скорость записи и чтения архива на синтетическом потоке")
+    parser.add_argument("--samples", type=int, default=1_000_000, help="Отсчетов в потоке")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Частота отсчетов, Гц")
+    parser.add_argument("--bits", type=int, default=10, help="Разрядность кодов")
+    parser.add_argument("--windows", type=int, default=200, help="Сколько случайных окон прочитать")
+    parser.add_argument("--window", type=float, default=1.0, help="Длина окна, с")
+    args = parser.parse_args()
+
+    # Медленный сигнал с шумом в 1 МЗР и дрожанием меток времени в 20 мкс
+    rng = random.Random(0)
+    max_code = (1 << args.bits) - 1
+    period_ns = int(1e9 / args.rate)
+    codes = array.array("H", (min(max(int(max_code / 2 * (1 + 0.8 * math.sin(i / args.rate / 60)))
+                                          + rng.randint(-1, 1), 0), max_code) for i in range(args.samples)))
+    timestamps = array.array("q", (i * period_ns + rng.randint(-20_000, 20_000) for i in range(args.samples)))
+
+    directory = tempfile.mkdtemp(prefix="labkit-archive-")
+    try:
+        start = time.perf_counter()
+        with ArchiveWriter(directory, rotate_bytes=256 << 10) as writer:
+            for i in range(0, args.samples, 256):
+                writer.write_block(codes[i:i + 256], timestamps[i:i + 256])
+        elapsed = time.perf_counter() - start
+        raw_bytes = args.samples * (2 + 8)
+        print(f"Запись: {args.samples / elapsed:,.0f} отсчетов/с, файлов {len(archive_files(directory))}, "
+              f"{writer.bytes_written / args.samples:.2f} байт/отсчет "
+              f"(сжатие {raw_bytes / writer.bytes_written:.1f}x)")
+
+        start = time.perf_counter()
+        reader = ArchiveReader(directory)
+        print(f"Загрузка индекса: {(time.perf_counter() - start) * 1e3:.1f} мс, кусков {len(reader.chunks)}")
+
+        span_ns = timestamps[-1] - timestamps[0]
+        window_ns = int(args.window * 1e9)
+        read_samples = 0
+        start = time.perf_counter()
+        for _ in range(args.windows):
+            t0 = timestamps[0] + rng.randrange(max(span_ns - window_ns, 1))
+            window_codes, window_times = reader.read_window(t0, t0 + window_ns)
+            read_samples += len(window_codes)
+        elapsed = time.perf_counter() - start
+        print(f"Чтение окон {args.window} с: {elapsed / args.windows * 1e3:.2f} мс на окно, "
+              f"{read_samples / args.windows:.0f} отсчетов, "
+              f"распаковано кусков {reader.chunks_decoded / args.windows:.1f} на окно")
+
+        check_codes, check_times = reader.read_window(timestamps[1000] // 1000 * 1000, timestamps[5000] // 1000 * 1000)
+        assert check_codes == codes[1000:5000]
+        assert check_times == array.array("q", (t // 1000 * 1000 for t in timestamps[1000:5000]))
+    finally:
+        shutil.rmtree(directory)
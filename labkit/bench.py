@@ -0,0 +1,239 @@
+import argparse
+import glob
+import json
+import math
+import os
+import subprocess
+import time
+
+from labkit import sim
+
+DYNAMIC_RANGE = 3.3
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench_results")
+
+RAMP_PERIOD = 0.5
+
+# Профили входного сигнала: (сигнал, СКО шума, период скачков сигнала в с или None)
+PROFILES = {
+    "dc": (sim.dc_signal(1.65), 0.0, None),
+    "ramp": (sim.ramp_signal(0.2, 3.1, RAMP_PERIOD), 0.0, RAMP_PERIOD),
+    "sine": (sim.sine_signal(1.65, 1.2, 5.0), 0.0, None),
+    "noisy": (sim.dc_signal(1.65), 0.02, None),
+}
+
+# Название случая: (метод R2R_ADC, дополнительные параметры конструктора)
+ALGORITHMS = {
+    "sequential_counting_adc": ("sequential_counting_adc", {}),
+    "fast_sequential_adc": ("fast_sequential_adc", {}),
+    "successive_approximation_adc": ("successive_approximation_adc", {}),
+    "sar_adaptive_vote": ("successive_approximation_adc", {"vote_reads": 5, "vote_margin": 2}),
+    "redundant_sar_adc": ("redundant_sar_adc", {}),
+    "subranging_adc": ("subranging_adc", {}),
+}
+
+# Дополнительные компараторы для subranging_adc: пин и смещение порога от U_ЦАП в МЗР
+SUBRANGING_OFFSETS_LSB = {5: -32, 6: 32, 7: -8, 8: 8, 9: -2, 10: 2}
+
+
+def run_case(adc, simulator, method, profile, samples):
+    """Выполняет samples преобразований и возвращает метрики"""
+    signal, noise, jump_period = PROFILES[profile]
+    simulator.reset(signal, noise=noise)
+    convert = getattr(adc, method)
+
+    lsb = adc.dynamic_range / adc.max_value
+    errors = []
+    start = time.perf_counter()
+    for _ in range(samples):
+        started_at = simulator.clock
+        number = convert()
+        # Преобразование, захватившее скачок сигнала (сброс пилы), измеряет
+        # сам скачок, а не точность АЦП: в ошибку его не включаем
+        if jump_period and started_at // jump_period != simulator.clock // jump_period:
+            continue
+        errors.append(number * lsb - simulator.last_true_voltage)
+    elapsed = time.perf_counter() - start
+
+    abs_errors = [abs(e) for e in errors] or [0.0]
+    measured = max(len(errors), 1)
+    return {
+        "conversions_per_s": samples / elapsed if elapsed > 0 else float("inf"),
+        "sim_conversions_per_s": samples / simulator.clock,
+        "trials_per_sample": simulator.input_count / samples,
+        "dac_steps_per_sample": simulator.output_count / samples,
+        "mean_error_v": sum(errors) / measured,
+        "mean_abs_error_lsb": sum(abs_errors) / measured / lsb,
+        "rms_error_lsb": math.sqrt(sum(e * e for e in errors) / measured) / lsb,
+        "max_abs_error_lsb": max(abs_errors) / lsb,
+    }
+
+
+def run_suite(samples, compare_time, trial_time=1e-4):
+    """Прогоняет все алгоритмы на всех профилях, возвращает {"алгоритм/профиль": метрики}"""
+    simulator = sim.SimulatedGPIO(sim.dc_signal(0.0), dynamic_range=DYNAMIC_RANGE, trial_time=trial_time)
+    # ЦАП в модели устанавливается до 0.5 МЗР за compare_time после скачка на всю шкалу
+    max_value = (1 << len(simulator.bits_gpio)) - 1
+    simulator.settle_tau = compare_time / math.log(2 * max_value) if compare_time else 0.0
+    for pin, offset in SUBRANGING_OFFSETS_LSB.items():
+        simulator.add_comparator(pin, 1.0, offset * DYNAMIC_RANGE / max_value)
+    results = {}
+    for name, (method, options) in ALGORITHMS.items():
+        adc = simulator.make_adc(compare_time=compare_time, **options)
+        for profile in PROFILES:
+            results[f"{name}/{profile}"] = run_case(adc, simulator, method, profile, samples)
+        adc.deinit()
+    return results
+
+
+def run_multichannel(channels, samples, compare_time, trial_time=1e-4):
+    """
+    Сравнивает N проходов счетного АЦП по одному каналу с одним общим проходом на N каналов
+
+    Returns:
+        dict: {"sequential"/"shared": (модельное время на набор каналов в с, макс. ошибка в МЗР)}
+    """
+    # Каналы - синусы с разными частотами и смещениями на отдельных компараторах
+    signals = [sim.sine_signal(0.4 + 2.5 * k / max(channels - 1, 1), 0.3, 1.0 + k) for k in range(channels)]
+    simulator = sim.SimulatedGPIO(signals[0], dynamic_range=DYNAMIC_RANGE, trial_time=trial_time)
+    pins = [simulator.comp_gpio] + [5 + k for k in range(channels - 1)]
+    for pin, signal in zip(pins[1:], signals[1:]):
+        simulator.add_comparator(pin, signal=signal)
+    shared = simulator.make_adc(compare_time=compare_time)
+    # По одному АЦП на канал на том же симуляторе: каждый видит только свой компаратор
+    single = [simulator.make_adc(compare_time=compare_time, comp_gpio=pin) for pin in pins]
+    lsb = shared.dynamic_range / shared.max_value
+
+    results = {}
+    for mode in ("sequential", "shared"):
+        simulator.reset(signals[0])
+        error = 0.0
+        for _ in range(samples):
+            if mode == "shared":
+                numbers = shared.multichannel_counting_adc()
+            else:
+                numbers = [adc.sequential_counting_adc() for adc in single]
+            truths = [simulator.last_voltages[pin] for pin in pins]
+            error = max(error, max(abs(n * lsb - v) for n, v in zip(numbers, truths)) / lsb)
+        results[mode] = (simulator.clock / samples, error)
+    for adc in [shared] + single:
+        adc.deinit()
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "nogit"
+
+
+def save_results(results, samples, compare_time):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    revision = git_revision()
+    path = os.path.join(RESULTS_DIR, f"{revision}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "revision": revision,
+            "timestamp": time.time(),
+            "samples": samples,
+            "compare_time": compare_time,
+            "results": results,
+        }, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def find_baseline(current_path):
+    """Последний сохраненный результат, кроме текущего"""
+    paths = [p for p in glob.glob(os.path.join(RESULTS_DIR, "*.json"))
+             if os.path.abspath(p) != os.path.abspath(current_path)]
+    return max(paths, key=os.path.getmtime) if paths else None
+
+
+def print_report(results):
+    print(f"{'Алгоритм/профиль':45s} {'преобр./с':>10s} {'модель/с':>10s} {'сравн./отсч.':>13s} "
+          f"{'шагов ЦАП':>10s} {'|ош.|, МЗР':>11s} {'СКО, МЗР':>9s} {'макс, МЗР':>10s}")
+    for case, m in results.items():
+        print(f"{case:45s} {m['conversions_per_s']:10.0f} {m.get('sim_conversions_per_s', 0):10.0f} "
+              f"{m['trials_per_sample']:13.1f} {m.get('dac_steps_per_sample', 0):10.1f} "
+              f"{m['mean_abs_error_lsb']:11.2f} {m['rms_error_lsb']:9.2f} {m['max_abs_error_lsb']:10.2f}")
+
+
+def compare_with_baseline(results, baseline_path, rate_tolerance=0.02, error_tolerance=0.5, step_tolerance=0.02,
+                          compare_time=None):
+    """
+    Печатает изменения относительно прошлого запуска, возвращает число регрессий
+
+    Регрессия определяется по модельной скорости (виртуальные часы
+    симулятора), числу сравнений и шагов ЦАП - они не зависят от загрузки
+    машины. Скорость по настенным часам печатается только для сведения.
+    rate_tolerance и step_tolerance - допустимое относительное ухудшение,
+    error_tolerance - допустимый рост СКО в МЗР.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print(f"\nСравнение с {baseline['revision']} ({os.path.basename(baseline_path)}):")
+    if compare_time is not None and baseline.get("compare_time") != compare_time:
+        print(f"Пропущено: в базовом запуске compare_time = {baseline.get('compare_time')}, сейчас {compare_time}")
+        return 0
+    regressions = 0
+    for case, m in results.items():
+        old = baseline["results"].get(case)
+        if old is None:
+            continue
+        wall_change = m["conversions_per_s"] / old["conversions_per_s"] - 1
+        # Старые результаты могли быть сохранены без модельных метрик
+        rate_change = m["sim_conversions_per_s"] / old["sim_conversions_per_s"] - 1 \
+            if "sim_conversions_per_s" in old else 0.0
+        steps_change = m["dac_steps_per_sample"] - old.get("dac_steps_per_sample", m["dac_steps_per_sample"])
+        error_change = m["rms_error_lsb"] - old["rms_error_lsb"]
+        trials_change = m["trials_per_sample"] - old["trials_per_sample"]
+
+        flag = ""
+        more_trials = trials_change > step_tolerance * old["trials_per_sample"]
+        more_steps = steps_change > step_tolerance * old.get("dac_steps_per_sample", m["dac_steps_per_sample"])
+        if rate_change < -rate_tolerance or error_change > error_tolerance or more_trials or more_steps:
+            flag = "  <-- РЕГРЕССИЯ"
+            regressions += 1
+        print(f"{case:45s} модель {rate_change:+7.1%} (часы {wall_change:+7.1%}), СКО {error_change:+6.2f} МЗР, "
+              f"сравнений {trials_change:+5.1f}, шагов ЦАП {steps_change:+5.1f}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Сравнение алгоритмов АЦП на симуляторе компаратора")
+    parser.add_argument("--samples", type=int, default=500, help="Число преобразований на случай")
+    parser.add_argument("--compare-time", type=float, default=0.001,
+                        help="Время установления ЦАП в модели, с")
+    parser.add_argument("--trial-time", type=float, default=1e-4,
+                        help="Время одного чтения компаратора в модели, с")
+    parser.add_argument("--baseline", help="Файл результатов для сравнения (по умолчанию - последний)")
+    parser.add_argument("--no-save", action="store_true", help="Не сохранять результаты")
+    parser.add_argument("--channels", type=int,
+                        help="Вместо набора случаев сравнить счетный АЦП на N каналов: N проходов или один общий")
+    args = parser.parse_args(argv)
+
+    if args.channels:
+        for mode, (seconds, error) in run_multichannel(args.channels, args.samples, args.compare_time,
+                                                       args.trial_time).items():
+            print(f"{mode:10s}: {seconds * 1e3:8.1f} мс на {args.channels} каналов, "
+                  f"макс. ошибка {error:.2f} МЗР")
+        return 0
+
+    results = run_suite(args.samples, args.compare_time, args.trial_time)
+    print_report(results)
+
+    current_path = ""
+    if not args.no_save:
+        current_path = save_results(results, args.samples, args.compare_time)
+        print(f"\nРезультаты сохранены в {current_path}")
+
+    baseline_path = args.baseline or find_baseline(current_path)
+    if baseline_path and compare_with_baseline(results, baseline_path, compare_time=args.compare_time):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
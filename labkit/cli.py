@@ -0,0 +1,370 @@
+"""
+Единая точка входа для экспериментов: python -m labkit <команда>
+
+Тяжелые модули (matplotlib, numpy, RPi.GPIO) импортируются только внутри
+команд, которым они действительно нужны, чтобы запуск без графиков
+на Raspberry Pi начинал измерения сразу.
+"""
+import argparse
+import configparser
+import os
+import sys
+import time
+
+DEFAULT_CONFIG = "labkit.ini"
+
+# Бюджет времени импорта labkit.cli в секундах и модули, которые не должны в него попадать
+STARTUP_BUDGET = 0.15
+HEAVY_MODULES = ("numpy", "matplotlib", "RPi", "smbus")
+
+DEFAULTS = {
+    "adc": {
+        "dynamic_range": "3.3",
+        "compare_time": "0.001",
+        "algorithm": "sar",
+        "bits_gpio": "26, 20, 19, 16, 13, 12, 25, 11",
+        "comp_gpio": "21",
+        "comp_taps": "",
+        "self_test": "",
+    },
+    "acquire": {
+        "duration": "10.0",
+        "period": "0.1",
+        "output": "capture.csv",
+        "plot": "no",
+        "adaptive": "no",
+        "max_period": "2.0",
+        "threshold": "0.02",
+    },
+    "generate": {
+        "dac": "r2r",
+        "gpio_bits": "16, 20, 21, 25, 26, 17, 27, 22",
+        "gpio_pin": "12",
+        "pwm_frequency": "500",
+        "dynamic_range": "3.16",
+        "signal_frequency": "10",
+        "amplitude": "1.7",
+        "sampling_frequency": "1000",
+        "duration": "",
+    },
+    "analyze": {
+        "input": "capture.csv",
+        "plot": "no",
+        "sine_frequency": "",
+    },
+}
+
+
+def load_config(path):
+    """Читает INI-файл с параметрами эксперимента поверх значений по умолчанию"""
+    config = configparser.ConfigParser()
+    config.read_dict(DEFAULTS)
+    if path is not None:
+        if not config.read(path, encoding="utf-8") and path != DEFAULT_CONFIG:
+            raise FileNotFoundError(f"Файл настроек не найден: {path}")
+    return config
+
+
+def parse_pins(value):
+    return [int(pin) for pin in value.replace(",", " ").split()]
+
+
+def optional_float(section, key):
+    """Число из настроек; пустое значение - None"""
+    value = section.get(key, "").strip()
+    return float(value) if value else None
+
+
+def parse_taps(value):
+    """"1:0, 1:-0.41, ..." -> [(1.0, 0.0), (1.0, -0.41), ...]; пусто - None"""
+    if not value.strip():
+        return None
+    return [tuple(float(x) for x in tap.split(":")) for tap in value.replace(",", " ").split()]
+
+
+def make_adc(config, use_sim=False, tracer=None):
+    from labkit.r2r_adc import R2R_ADC
+
+    section = config["adc"]
+    kwargs = dict(
+        compare_time=section.getfloat("compare_time"),
+        algorithm=section["algorithm"],
+        self_test=section["self_test"] or None,
+        tracer=tracer,
+    )
+    dynamic_range = section.getfloat("dynamic_range")
+
+    if use_sim:
+        from labkit import sim
+        simulator = sim.SimulatedGPIO(sim.sine_signal(dynamic_range / 2, dynamic_range / 3, 0.5),
+                                      dynamic_range=dynamic_range)
+        return simulator.make_adc(**kwargs)
+
+    comp_pins = parse_pins(section["comp_gpio"])
+    return R2R_ADC(dynamic_range, bits_gpio=parse_pins(section["bits_gpio"]),
+                   comp_gpio=comp_pins[0] if len(comp_pins) == 1 else comp_pins,
+                   comp_taps=parse_taps(section["comp_taps"]), **kwargs)
+
+
+def _fixed_rate_samples(adc, duration, period, f):
+    f.write("time,voltage,measurement_time\n")
+    start_time = time.perf_counter()
+    while True:
+        current_time = time.perf_counter() - start_time
+        # duration None - до Ctrl+C, как у AdaptiveSampler.run
+        if duration is not None and current_time >= duration:
+            return
+        voltage, measurement_time = adc.get_timed_voltage()
+        f.write(f"{current_time:.6f},{voltage:.4f},{measurement_time:.6f}\n")
+        yield current_time, voltage, measurement_time
+        if period:
+            time.sleep(period)
+
+
+def cmd_acquire(args, config):
+    section = config["acquire"]
+    duration = args.duration if args.duration is not None else optional_float(section, "duration")
+    period = section.getfloat("period")
+    output = args.output or section["output"]
+    plot = args.plot or section.getboolean("plot")
+    adaptive = args.adaptive or section.getboolean("adaptive")
+
+    time_values = []
+    voltage_values = []
+    measurement_times = []
+
+    tracer = None
+    if args.trace:
+        from labkit.trace import ConversionTracer
+        tracer = ConversionTracer()
+
+    adc = make_adc(config, use_sim=args.sim, tracer=tracer)
+    try:
+        with open(output, "w", encoding="utf-8") as f:
+            if adaptive:
+                from labkit.adaptive import AdaptiveSampler
+                # period из настроек - период при активном сигнале
+                sampler = AdaptiveSampler(adc.get_voltage, period, section.getfloat("max_period"),
+                                          section.getfloat("threshold"))
+                samples = ((s.time, s.voltage, s.measurement_time) for s in sampler.run(duration, f))
+            else:
+                samples = _fixed_rate_samples(adc, duration, period, f)
+            for current_time, voltage, measurement_time in samples:
+                if plot:
+                    time_values.append(current_time)
+                    voltage_values.append(voltage)
+                    measurement_times.append(measurement_time)
+                if args.verbose:
+                    print(f"{current_time:8.3f} с: {voltage:.3f} В")
+    except KeyboardInterrupt:
+        print("\nИзмерения прерваны пользователем")
+    finally:
+        adc.deinit()
+
+    print(f"Данные сохранены в {output}")
+
+    if tracer is not None:
+        tracer.save(args.trace)
+        print(f"Трасса ({tracer.count} интервалов, отброшено {tracer.dropped}) сохранена в {args.trace}")
+        for name, total in tracer.totals().items():
+            print(f"  {name:15s} {total * 1e3:10.2f} мс")
+
+    if plot and voltage_values:
+        from labkit import plotting
+        plotting.plot_voltage_vs_time(time_values, voltage_values, adc.dynamic_range)
+        plotting.plot_sampling_period_hist(measurement_times)
+    return 0
+
+
+def cmd_generate(args, config):
+    from labkit import signals
+
+    section = config["generate"]
+    dynamic_range = section.getfloat("dynamic_range")
+    duration = args.duration if args.duration is not None else optional_float(section, "duration")
+
+    if section["dac"] == "pwm":
+        from labkit.dac import PWM_DAC
+        dac = PWM_DAC(section.getint("gpio_pin"), section.getfloat("pwm_frequency"), dynamic_range)
+    else:
+        from labkit.dac import R2R_DAC
+        dac = R2R_DAC(parse_pins(section["gpio_bits"]), dynamic_range)
+
+    try:
+        signals.generate_signal(dac, section.getfloat("signal_frequency"), section.getfloat("amplitude"),
+                                section.getfloat("sampling_frequency"), duration)
+    except KeyboardInterrupt:
+        print("\nГенерация сигнала остановлена пользователем")
+    finally:
+        dac.deinit()
+    return 0
+
+
+def cmd_monitor(args, config):
+    from labkit.pipeline import run_pipeline
+
+    section = config["adc"]
+    bits = len(parse_pins(section["bits_gpio"]))
+    duration = args.duration if args.duration is not None else optional_float(config["acquire"], "duration")
+    serve = None
+    if args.serve:
+        from labkit.stream_server import parse_address
+        serve = parse_address(args.serve)
+    total = run_pipeline(dict(section), duration, use_sim=args.sim, cpu=args.cpu, rt_priority=args.rt_priority,
+                         plot=args.plot, max_value=(1 << bits) - 1,
+                         dynamic_range=section.getfloat("dynamic_range"), serve=serve,
+                         dashboard_port=args.dashboard)
+    print(f"Всего отсчетов: {total}")
+    return 0
+
+
+def read_capture(path):
+    """Читает CSV, записанный командой acquire, и возвращает три списка"""
+    time_values, voltage_values, measurement_times = [], [], []
+    with open(path, encoding="utf-8") as f:
+        if next(f, None) is None:
+            raise ValueError(f"Файл {path} пуст: нет даже заголовка записи acquire")
+        for line in f:
+            t, v, m = line.split(",")
+            time_values.append(float(t))
+            voltage_values.append(float(v))
+            measurement_times.append(float(m))
+    return time_values, voltage_values, measurement_times
+
+
+def cmd_analyze(args, config):
+    import statistics
+
+    section = config["analyze"]
+    path = args.input or section["input"]
+    time_values, voltage_values, measurement_times = read_capture(path)
+    if not voltage_values:
+        print("Нет данных для анализа")
+        return 1
+
+    span = time_values[-1] - time_values[0]
+    print(f"Измерений: {len(voltage_values)} за {span:.2f} с")
+    if span > 0:
+        print(f"Средняя частота измерений: {(len(voltage_values) - 1) / span:.1f} Гц")
+    print(f"Напряжение: среднее {statistics.fmean(voltage_values):.3f} В, "
+          f"мин {min(voltage_values):.3f} В, макс {max(voltage_values):.3f} В, "
+          f"СКО {statistics.pstdev(voltage_values):.4f} В")
+    print(f"Время измерения: среднее {statistics.fmean(measurement_times) * 1e3:.2f} мс, "
+          f"макс {max(measurement_times) * 1e3:.2f} мс")
+
+    plot = args.plot or section.getboolean("plot")
+    sine_frequency = args.sine if args.sine is not None else optional_float(section, "sine_frequency")
+    if (sine_frequency or plot) and len(voltage_values) > 1:
+        from labkit import spectrum
+        # Метка отсчета - середина измерения
+        times = [t + m / 2 for t, m in zip(time_values, measurement_times)]
+        values, rate = spectrum.to_uniform(times, voltage_values)
+        if sine_frequency:
+            print(f"Частота дискретизации для спектра: {rate:.1f} Гц")
+            spectrum.print_metrics(spectrum.sine_metrics(values, rate, sine_frequency,
+                                                         full_scale=config["adc"].getfloat("dynamic_range")))
+        if plot:
+            from labkit import plotting
+            if sine_frequency:
+                plotting.plot_spectrum(*spectrum.power_spectrum(values, rate))
+            else:
+                # Без известного синуса важен шумовой фон: усреднение по сегментам уменьшает его разброс
+                plotting.plot_spectrum(*spectrum.welch(values, rate), title="Спектральная плотность мощности")
+
+    if plot:
+        from labkit import plotting
+        plotting.plot_voltage_vs_time(time_values, voltage_values, max(voltage_values))
+        plotting.plot_sampling_period_hist(measurement_times)
+    return 0
+
+
+def measure_startup(runs=5):
+    """
+    Измеряет время импорта labkit.cli в чистом интерпретаторе
+
+    Returns:
+        tuple: (лучшее время из runs запусков в секундах, список загруженных тяжелых модулей)
+    """
+    import subprocess
+
+    code = ("import sys, time\n"
+            "t = time.perf_counter()\n"
+            "import labkit.cli\n"
+            "print(time.perf_counter() - t)\n"
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+
+    best = float("inf")
+    heavy = []
+    for _ in range(runs):
+        out = subprocess.check_output([sys.executable, "-c", code], env=env, text=True).splitlines()
+        best = min(best, float(out[0]))
+        heavy = [m for m in out[1].split(",") if m] if len(out) > 1 else []
+    return best, heavy
+
+
+def cmd_check_startup(args, config):
+    elapsed, heavy = measure_startup()
+    print(f"Импорт labkit.cli: {elapsed * 1e3:.1f} мс (бюджет {args.budget * 1e3:.0f} мс)")
+    ok = True
+    if heavy:
+        print(f"При запуске загружаются тяжелые модули: {', '.join(heavy)}")
+        ok = False
+    if elapsed > args.budget:
+        print("Бюджет времени запуска превышен")
+        ok = False
+    return 0 if ok else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="labkit", description="Измерения с R2R АЦП и генерация сигналов")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="INI-файл с параметрами эксперимента")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    acquire = subparsers.add_parser("acquire", help="Записать измерения АЦП в CSV")
+    acquire.add_argument("--duration", type=float, help="Продолжительность измерений, с")
+    acquire.add_argument("--output", help="Файл для записи")
+    acquire.add_argument("--plot", action="store_true", help="Построить графики после измерений")
+    acquire.add_argument("--sim", action="store_true", help="Использовать симулятор вместо платы")
+    acquire.add_argument("--verbose", action="store_true", help="Печатать каждое измерение")
+    acquire.add_argument("--adaptive", action="store_true",
+                         help="Реже измерять, пока сигнал не меняется (период до max_period)")
+    acquire.add_argument("--trace", metavar="JSON",
+                         help="Записать шаги преобразований в трассу для chrome://tracing или Perfetto")
+    acquire.set_defaults(handler=cmd_acquire)
+
+    monitor = subparsers.add_parser("monitor", help="Непрерывные измерения в отдельных процессах")
+    monitor.add_argument("--duration", type=float, help="Продолжительность измерений, с")
+    monitor.add_argument("--cpu", type=int, help="Ядро для процесса измерения")
+    monitor.add_argument("--rt-priority", type=int, help="Приоритет SCHED_FIFO процесса измерения")
+    monitor.add_argument("--plot", action="store_true", help="Показывать график в отдельном процессе")
+    monitor.add_argument("--sim", action="store_true", help="Использовать симулятор вместо платы")
+    monitor.add_argument("--serve", metavar="ADDRESS",
+                         help="Рассылать отсчеты клиентам: хост:порт или путь к Unix-сокету")
+    monitor.add_argument("--dashboard", type=int, metavar="PORT",
+                         help="Показывать измерения в браузере на этом порту")
+    monitor.set_defaults(handler=cmd_monitor)
+
+    generate = subparsers.add_parser("generate", help="Генерировать синусоиду на ЦАП")
+    generate.add_argument("--duration", type=float, help="Продолжительность генерации, с")
+    generate.set_defaults(handler=cmd_generate)
+
+    analyze = subparsers.add_parser("analyze", help="Статистика по записанным измерениям")
+    analyze.add_argument("--input", help="CSV, записанный командой acquire")
+    analyze.add_argument("--plot", action="store_true", help="Построить графики")
+    analyze.add_argument("--sine", type=float, metavar="HZ",
+                         help="Частота синуса на входе: посчитать SNR, SINAD, SFDR и ENOB")
+    analyze.set_defaults(handler=cmd_analyze)
+
+    check = subparsers.add_parser("check-startup", help="Проверить бюджет времени запуска")
+    check.add_argument("--budget", type=float, default=STARTUP_BUDGET, help="Допустимое время импорта, с")
+    check.set_defaults(handler=cmd_check_startup)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    config = load_config(args.config)
+    return args.handler(args, config)
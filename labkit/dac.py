@@ -0,0 +1,78 @@
+from labkit.r2r_adc import _load_gpio
+
+
+class R2R_DAC:
+    def __init__(self, gpio_bits, dynamic_range, verbose=False, gpio=None):
+        """
+        Конструктор класса R2R_DAC
+
+        Args:
+            gpio_bits (sequence): Пины ЦАП, начиная со старшего бита
+            dynamic_range (float): Динамический диапазон ЦАП в Вольтах
+            verbose (bool): Флаг отладочного вывода
+            gpio: Модуль с интерфейсом RPi.GPIO (по умолчанию - сам RPi.GPIO)
+        """
+        self.gpio_bits = list(gpio_bits)
+        self.dynamic_range = dynamic_range
+        self.verbose = verbose
+        self.gpio = gpio if gpio is not None else _load_gpio()
+
+        self.bits = len(self.gpio_bits)
+        self.max_value = (1 << self.bits) - 1
+        self._levels = [tuple((number >> (self.bits - 1 - i)) & 1 for i in range(self.bits))
+                        for number in range(self.max_value + 1)]
+
+        self.gpio.setmode(self.gpio.BCM)
+        self.gpio.setup(self.gpio_bits, self.gpio.OUT, initial=0)
+
+    def deinit(self):
+        self.gpio.output(self.gpio_bits, 0)
+        self.gpio.cleanup()
+
+    def set_number(self, number):
+        self.gpio.output(self.gpio_bits, self._levels[number])
+
+    def set_voltage(self, voltage):
+        if not (0.0 <= voltage <= self.dynamic_range):
+            print(f"Напряжение выходит за динамический диапазон ЦАП (0.00 - {self.dynamic_range:.2f} B")
+            print("Устанавливаем 0.0 В")
+            return 0
+        self.set_number(int(voltage / self.dynamic_range * self.max_value))
+
+
+class PWM_DAC:
+    def __init__(self, gpio_pin, pwm_frequency, dynamic_range, verbose=False, gpio=None):
+        """
+        Конструктор класса PWM_DAC
+
+        Args:
+            gpio_pin (int): Пин с ШИМ-сигналом
+            pwm_frequency (float): Частота ШИМ в Герцах
+            dynamic_range (float): Динамический диапазон ЦАП в Вольтах
+            verbose (bool): Флаг отладочного вывода
+            gpio: Модуль с интерфейсом RPi.GPIO (по умолчанию - сам RPi.GPIO)
+        """
+        self.gpio_pin = gpio_pin
+        self.pwm_frequency = pwm_frequency
+        self.dynamic_range = dynamic_range
+        self.verbose = verbose
+        self.gpio = gpio if gpio is not None else _load_gpio()
+
+        self.gpio.setmode(self.gpio.BCM)
+        self.gpio.setup(self.gpio_pin, self.gpio.OUT)
+        self.pwm = self.gpio.PWM(self.gpio_pin, self.pwm_frequency)
+        self.pwm.start(0)
+
+    def deinit(self):
+        self.pwm.stop()
+        self.gpio.cleanup()
+
+    def set_voltage(self, voltage):
+        if not (0.0 <= voltage <= self.dynamic_range):
+            print(f"Напряжение выходит за динамический диапазон ЦАП (0.00 - {self.dynamic_range:.2f}) B")
+            print("Устанавливаем 0.0 В")
+            return 0
+        duty = voltage * 100 / self.dynamic_range
+        if self.verbose:
+            print(f"Коэффициент заполнения: {duty:.1f} %")
+        self.pwm.ChangeDutyCycle(duty)
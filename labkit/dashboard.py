@@ -0,0 +1,296 @@
+"""
+Панель в браузере для наблюдения за измерениями
+
+Вместо matplotlib на Raspberry Pi: встроенный HTTP-сервер отдает
+страницу и поток server-sent events (/events). На Pi отсчеты только
+прореживаются - для каждого интервала bucket секунд остаются минимум и
+максимум, так что короткие выбросы не теряются, - и считаются
+гистограммы (логарифмические корзины) интервалов между отсчетами и
+задержки от отсчета до его поступления в панель.
+Рисует браузер любого компьютера в локальной сети.
+"""
+import collections
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Корзины гистограмм интервалов и задержек: [2^k, 2^(k+1)) мкс
+HISTOGRAM_BINS = 24
+
+
+def lan_address():
+    """
+    Адрес этого компьютера в локальной сети
+
+    UDP-сокет ничего не отправляет при connect(), но ядро выбирает для него
+    исходящий интерфейс. Без сети - имя компьютера.
+    """
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("10.255.255.255", 1))
+            return s.getsockname()[0]
+    except OSError:
+        return socket.gethostname()
+
+
+class MinMaxDecimator:
+    def __init__(self, bucket=0.01, scale=1.0, history=6000, clock=time.monotonic_ns):
+        """
+        Args:
+            bucket (float): Длительность одной точки графика, с
+            scale (float): Множитель кода в Вольты
+            history (int): Сколько последних точек хранить для новых клиентов
+            clock (callable): Часы меток времени отсчетов, нс - по ним считается задержка
+        """
+        self.bucket_ns = int(bucket * 1e9)
+        self.scale = scale
+        self.points = collections.deque(maxlen=history)  # (номер, t в с, мин, макс)
+        self.total_points = 0
+        self.clock = clock
+        self.interval_histogram = [0] * HISTOGRAM_BINS
+        self.latency_histogram = [0] * HISTOGRAM_BINS
+        self.samples = 0
+        self.lock = threading.Lock()
+        self._bucket_start = None
+        self._low = self._high = 0
+        self._last_timestamp = None
+        self._start = None
+
+    def add(self, codes, timestamps):
+        """Добавляет блок кодов и меток времени в нс"""
+        # Задержка - от метки отсчета до поступления блока сюда
+        now = self.clock()
+        bucket_ns = self.bucket_ns
+        intervals = self.interval_histogram
+        latency = self.latency_histogram
+        finished = []
+        start = self._bucket_start
+        low, high = self._low, self._high
+        last = self._last_timestamp
+        if self._start is None and len(timestamps):
+            self._start = timestamps[0]
+        for code, timestamp in zip(codes, timestamps):
+            if last is not None:
+                interval_us = (timestamp - last) // 1000
+                intervals[min(max(interval_us, 1).bit_length() - 1, HISTOGRAM_BINS - 1)] += 1
+            latency_us = (now - timestamp) // 1000
+            latency[min(max(latency_us, 1).bit_length() - 1, HISTOGRAM_BINS - 1)] += 1
+            last = timestamp
+            if start is None or timestamp - start >= bucket_ns:
+                if start is not None:
+                    finished.append((start, low, high))
+                start = timestamp - (timestamp - self._start) % bucket_ns
+                low = high = code
+            elif code < low:
+                low = code
+            elif code > high:
+                high = code
+        self._bucket_start, self._low, self._high = start, low, high
+        self._last_timestamp = last
+
+        with self.lock:
+            self.samples += len(codes)
+            for bucket_start, bucket_low, bucket_high in finished:
+                self.points.append((self.total_points, (bucket_start - self._start) * 1e-9,
+                                    bucket_low * self.scale, bucket_high * self.scale))
+                self.total_points += 1
+
+    def snapshot(self, after):
+        """Точки с номерами не меньше after и копии гистограмм интервалов и задержек"""
+        with self.lock:
+            skip = max(0, len(self.points) - (self.total_points - after))
+            points = list(self.points)[skip:]
+            return (points, list(self.interval_histogram), list(self.latency_histogram),
+                    self.samples, self.total_points)
+
+
+PAGE = """<!DOCTYPE html>
+<html lang="ru"><head><meta charset="utf-8"><title>labkit</title>
+<style>
+body { font-family: sans-serif; margin: 16px; background: #fafafa; }
+canvas { background: #fff; border: 1px solid #ccc; display: block; margin-bottom: 12px; }
+#status { color: #555; }
+</style></head>
+<body>
+<h3>Напряжение, последние <span id="window"></span> с</h3>
+<canvas id="trace" width="1000" height="320"></canvas>
+<h3>Интервалы между отсчетами</h3>
+<canvas id="intervals" width="1000" height="200"></canvas>
+<h3>Задержка от отсчета до панели</h3>
+<canvas id="latency" width="1000" height="200"></canvas>
+<div id="status">Подключение...</div>
+<script>
+const WINDOW = %(window)s, RANGE = %(range)s;
+document.getElementById("window").textContent = WINDOW;
+const points = [];
+let intervals = [], latency = [], delivery = 0;
+const source = new EventSource("events");
+source.onmessage = (e) => {
+  const m = JSON.parse(e.data);
+  for (const p of m.points) points.push(p);
+  if (points.length) {
+    const t0 = points[points.length - 1][1] - WINDOW;
+    while (points.length && points[0][1] < t0) points.shift();
+  }
+  intervals = m.intervals;
+  latency = m.latency;
+  delivery = Date.now() / 1000 - m.sent;
+  document.getElementById("status").textContent =
+    `Отсчетов: ${m.samples}, точек на экране: ${points.length}, доставка в браузер: ${(delivery * 1000).toFixed(0)} мс`;
+};
+source.onerror = () => { document.getElementById("status").textContent = "Нет связи с сервером"; };
+
+function drawTrace() {
+  const c = document.getElementById("trace"), g = c.getContext("2d");
+  g.clearRect(0, 0, c.width, c.height);
+  if (!points.length) return;
+  const t1 = points[points.length - 1][1], t0 = t1 - WINDOW;
+  const x = (t) => (t - t0) / WINDOW * c.width, y = (v) => c.height - v / RANGE * c.height;
+  g.strokeStyle = "#1f5fbf";
+  g.beginPath();
+  for (const [, t, lo, hi] of points) { g.moveTo(x(t), y(lo)); g.lineTo(x(t), y(hi) - 1); }
+  g.stroke();
+}
+
+function drawHistogram(id, histogram) {
+  const c = document.getElementById(id), g = c.getContext("2d");
+  g.clearRect(0, 0, c.width, c.height);
+  const top = Math.max(1, ...histogram), w = c.width / Math.max(1, histogram.length);
+  g.font = "11px sans-serif";
+  histogram.forEach((n, k) => {
+    const h = n ? Math.log10(n + 1) / Math.log10(top + 1) * (c.height - 20) : 0;
+    g.fillStyle = "#7aa6e0";
+    g.fillRect(k * w + 1, c.height - 15 - h, w - 2, h);
+    g.fillStyle = "#333";
+    const us = 2 ** k;
+    g.fillText(us >= 1000 ? `${us / 1000}мс` : `${us}мкс`, k * w + 2, c.height - 3);
+  });
+}
+
+(function frame() {
+  drawTrace();
+  drawHistogram("intervals", intervals);
+  drawHistogram("latency", latency);
+  requestAnimationFrame(frame);
+})();
+</script></body></html>
+"""
+
+
+class Dashboard:
+    def __init__(self, decimator, port=8000, host="0.0.0.0", refresh=0.2, window=10.0, voltage_range=3.3):
+        """
+        Args:
+            decimator (MinMaxDecimator): Источник точек и гистограмм
+            port (int): Порт HTTP
+            host (str): Адрес, на котором слушать ("0.0.0.0" - вся локальная сеть)
+            refresh (float): Период отправки событий, с
+            window (float): Ширина окна графика в браузере, с
+            voltage_range (float): Верх шкалы напряжения, В
+        """
+        self.decimator = decimator
+        self.refresh = refresh
+        self.stopped = threading.Event()
+        page = (PAGE % {"window": window, "range": voltage_range}).encode("utf-8")
+        dashboard = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/":
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(page)))
+                    self.end_headers()
+                    self.wfile.write(page)
+                elif self.path == "/events":
+                    dashboard._stream_events(self)
+                else:
+                    self.send_error(404)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="dashboard", daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        # По адресу 0.0.0.0 браузер на другом компьютере страницу не откроет
+        if host in ("0.0.0.0", ""):
+            host = lan_address()
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _stream_events(self, handler):
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.end_headers()
+        cursor = 0
+        try:
+            while not self.stopped.is_set():
+                points, intervals, latency, samples, cursor = self.decimator.snapshot(cursor)
+                message = json.dumps({
+                    "points": [[n, round(t, 4), round(low, 4), round(high, 4)] for n, t, low, high in points],
+                    "intervals": intervals,
+                    "latency": latency,
+                    "samples": samples,
+                    "sent": time.time(),
+                }, separators=(",", ":"))
+                handler.wfile.write(f"data: {message}\n\n".encode("utf-8"))
+                handler.wfile.flush()
+                time.sleep(self.refresh)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from labkit import sim
+
+    parser = argparse.ArgumentParser(description="Измерения с графиком в браузере")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--duration", type=float, help="Продолжительность, с (по умолчанию - до Ctrl+C)")
+    parser.add_argument("--sim", action="store_true", help="Использовать симулятор вместо платы")
+    args = parser.parse_args()
+
+    if args.sim:
+        simulator = sim.SimulatedGPIO(sim.sine_signal(1.65, 1.2, 0.5), noise=0.01)
+        adc = simulator.make_adc(compare_time=0.0)
+    else:
+        from labkit import R2R_ADC
+        adc = R2R_ADC(dynamic_range=3.3, compare_time=0.001)
+
+    decimator = MinMaxDecimator(scale=adc.dynamic_range / adc.max_value)
+    dashboard = Dashboard(decimator, port=args.port, voltage_range=adc.dynamic_range)
+    dashboard.start()
+    print(f"Откройте {dashboard.url} в браузере (Ctrl+C - остановка)")
+
+    codes, timestamps = [], []
+    start = time.monotonic()
+    try:
+        while args.duration is None or time.monotonic() - start < args.duration:
+            codes.append(adc.get_number())
+            timestamps.append(time.monotonic_ns())
+            if len(codes) >= 64:
+                decimator.add(codes, timestamps)
+                codes, timestamps = [], []
+            if args.sim:
+                time.sleep(0.0005)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dashboard.stop()
+        adc.deinit()
@@ -0,0 +1,236 @@
+"""
+Стробоскопический режим (эквивалентное время) для периодических сигналов
+
+АЦП успевает сделать меньше тысячи измерений в секунду, но сигналы от
+signal_generator периодические. Если брать отсчеты с шагом чуть больше
+целого числа периодов, каждый следующий отсчет попадает в фазу сигнала
+на period / points позже предыдущего. Собрав отсчеты по фазе, получаем
+один период с высоким разрешением по времени.
+
+Фаза отсчитывается либо от известного периода (по меткам времени самих
+измерений), либо от срабатывания триггера - тогда точкой отсчета служит
+момент триггера, а отсчет берется с задержкой, которая растет от цикла
+к циклу.
+
+Выборки-хранения у R2R АЦП нет: за время одного преобразования сигнал
+должен меняться меньше чем на МЗР, иначе поиск даст неверное число.
+Стробоскоп поднимает частоту дискретизации, но не сокращает это время.
+"""
+import math
+import time
+
+import numpy as np
+
+
+def sampling_interval(period, points, conversion_time):
+    """
+    Шаг между отсчетами: целое число периодов, за которое успевает пройти
+    преобразование, плюс period / points
+    """
+    cycles = max(1, math.ceil(conversion_time / period))
+    return cycles * period + period / points
+
+
+def reconstruct(times, values, period, bins, t0=0.0):
+    """
+    Собирает один период из отсчетов по их фазе
+
+    Args:
+        times (array): Метки времени отсчетов (или задержки от триггера), с
+        values (array): Измеренные значения
+        period (float): Период сигнала (или окно после триггера), с
+        bins (int): Число точек восстановленного периода
+        t0 (float): Момент нулевой фазы
+
+    Returns:
+        tuple: (np.ndarray времен точек внутри периода, np.ndarray средних значений;
+                в точках без отсчетов - nan)
+    """
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    phase = np.mod(times - t0, period)
+    index = np.minimum((phase * (bins / period)).astype(np.intp), bins - 1)
+    sums = np.bincount(index, weights=values, minlength=bins)
+    counts = np.bincount(index, minlength=bins)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    return (np.arange(bins) + 0.5) * (period / bins), means
+
+
+def refine_period(times, values, period, span=1e-3, candidates=201, bins=100):
+    """
+    Уточняет период генератора: из candidates значений в пределах
+    period * (1 ± span) выбирает то, при котором отсчеты в каждой точке
+    фазы разбросаны меньше всего. Все кандидаты считаются одной
+    операцией numpy.
+    """
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    periods = period * np.linspace(1 - span, 1 + span, candidates)
+
+    phase = np.mod(times[None, :] - times[0], periods[:, None]) / periods[:, None]
+    index = np.minimum((phase * bins).astype(np.intp), bins - 1) + np.arange(candidates)[:, None] * bins
+    index = index.ravel()
+    flat_values = np.broadcast_to(values, phase.shape).ravel()
+
+    size = candidates * bins
+    counts = np.bincount(index, minlength=size).reshape(candidates, bins)
+    sums = np.bincount(index, weights=flat_values, minlength=size).reshape(candidates, bins)
+    squares = np.bincount(index, weights=flat_values ** 2, minlength=size).reshape(candidates, bins)
+    # Сумма квадратов отклонений от среднего в каждой точке фазы
+    with np.errstate(invalid="ignore", divide="ignore"):
+        spread = np.where(counts > 0, squares - sums ** 2 / counts, 0.0).sum(axis=1)
+    return float(periods[np.argmin(spread)])
+
+
+def level_trigger(read, level, rising=True, timeout=1.0, clock=None):
+    """
+    Программный триггер: измеряет, пока сигнал не пересечет level
+
+    Точность момента срабатывания - одно преобразование АЦП.
+
+    Returns:
+        float: Время срабатывания по clock или None по таймауту
+    """
+    clock = clock if clock is not None else time.perf_counter
+    end_time = clock() + timeout
+    previous = read()
+    while clock() < end_time:
+        current = read()
+        if (previous < level <= current) if rising else (previous > level >= current):
+            return clock()
+        previous = current
+    return None
+
+
+class EquivalentTimeSampler:
+    def __init__(self, read, clock=None, sleep=None):
+        """
+        Args:
+            read (callable): Функция измерения (например, adc.get_voltage)
+            clock (callable): Часы в секундах (по умолчанию - time.perf_counter)
+            sleep (callable): Функция ожидания (по умолчанию - time.sleep)
+        """
+        self.read = read
+        self.clock = clock if clock is not None else time.perf_counter
+        self.sleep = sleep if sleep is not None else time.sleep
+
+    def conversion_time(self, repeats=5):
+        """Время одного измерения, с (лучшее из repeats)"""
+        best = float("inf")
+        for _ in range(repeats):
+            start = self.clock()
+            self.read()
+            best = min(best, self.clock() - start)
+        return best
+
+    def capture_periodic(self, period, points, passes=1):
+        """
+        Отсчеты периодического сигнала с известным периодом
+
+        Метка времени отсчета - середина измерения, поэтому неточность
+        ожидания не искажает фазу, а лишь меняет, в какую точку попадет отсчет.
+
+        Returns:
+            tuple: (np.ndarray меток времени, np.ndarray значений)
+        """
+        clock = self.clock
+        read = self.read
+        interval = sampling_interval(period, points, self.conversion_time())
+        count = points * passes
+        times = np.empty(count)
+        values = np.empty(count)
+
+        next_time = clock()
+        for i in range(count):
+            delay = next_time - clock()
+            if delay > 0:
+                self.sleep(delay)
+            start = clock()
+            values[i] = read()
+            times[i] = (start + clock()) / 2
+            next_time += interval
+        return times, values
+
+    def capture_triggered(self, trigger, window, points, passes=1):
+        """
+        Отсчеты после триггера: в k-м цикле - с задержкой k * window / points
+
+        Args:
+            trigger (callable): Ждет события и возвращает его время по clock (None - не дождались)
+            window (float): Длительность восстанавливаемого участка после триггера, с
+
+        Returns:
+            tuple: (np.ndarray задержек от триггера, np.ndarray значений)
+        """
+        clock = self.clock
+        read = self.read
+        delays = []
+        values = []
+        for i in range(points * passes):
+            trigger_time = trigger()
+            if trigger_time is None:
+                continue
+            delay = trigger_time + (i % points) * window / points - clock()
+            if delay > 0:
+                self.sleep(delay)
+            start = clock()
+            value = read()
+            delays.append((start + clock()) / 2 - trigger_time)
+            values.append(value)
+        return np.array(delays), np.array(values)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from labkit import sim
+
+    parser = argparse.ArgumentParser(description="Стробоскопическая запись периодического сигнала")
+    parser.add_argument("--frequency", type=float, default=10.0, help="Частота сигнала генератора, Гц")
+    parser.add_argument("--points", type=int, default=200, help="Точек на период")
+    parser.add_argument("--passes", type=int, default=2, help="Сколько раз пройти период")
+    parser.add_argument("--trigger", type=float, help="Уровень программного триггера, В (иначе - по периоду)")
+    parser.add_argument("--refine", action="store_true", help="Уточнить период по данным")
+    parser.add_argument("--plot", action="store_true", help="Построить восстановленный период")
+    parser.add_argument("--sim", action="store_true", help="Использовать симулятор вместо платы")
+    args = parser.parse_args()
+
+    period = 1.0 / args.frequency
+    if args.sim:
+        # Частота генератора в модели на 0.05 % отличается от заданной
+        simulator = sim.SimulatedGPIO(sim.sine_signal(1.65, 1.2, args.frequency * 1.0005), trial_time=1e-5)
+        adc = simulator.make_adc(compare_time=1e-3)
+        sampler = EquivalentTimeSampler(adc.get_voltage, clock=lambda: simulator.clock, sleep=simulator.sleep)
+    else:
+        from labkit import R2R_ADC
+        adc = R2R_ADC(dynamic_range=3.3, compare_time=0.001)
+        sampler = EquivalentTimeSampler(adc.get_voltage)
+
+    try:
+        conversion_time = sampler.conversion_time()
+        print(f"Время измерения: {conversion_time * 1e3:.2f} мс, "
+              f"эквивалентный шаг: {period / args.points * 1e3:.3f} мс")
+        if args.trigger is not None:
+            def trigger():
+                return level_trigger(adc.get_voltage, args.trigger, clock=sampler.clock)
+            times, values = sampler.capture_triggered(trigger, period, args.points, args.passes)
+            t0 = 0.0
+        else:
+            times, values = sampler.capture_periodic(period, args.points, args.passes)
+            t0 = times[0]
+            if args.refine:
+                period = refine_period(times, values, period)
+                print(f"Уточненный период: {period * 1e3:.4f} мс")
+    finally:
+        adc.deinit()
+
+    phase_times, waveform = reconstruct(times, values, period, args.points, t0)
+    filled = ~np.isnan(waveform)
+    print(f"Отсчетов: {len(values)}, заполнено точек: {filled.sum()} из {args.points}")
+    print(f"Мин {np.nanmin(waveform):.3f} В, макс {np.nanmax(waveform):.3f} В")
+
+    if args.plot:
+        from labkit import plotting
+        plotting.plot_voltage_vs_time(phase_times[filled], waveform[filled], adc.dynamic_range,
+                                      label='Период в эквивалентном времени')
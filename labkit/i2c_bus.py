@@ -0,0 +1,125 @@
+"""
+Общие на весь процесс дескрипторы шин I2C
+
+Драйверы берут шину из POOL вместо smbus.SMBus(1): одна и та же шина
+открывается один раз, закрывается, когда ее отпустил последний драйвер,
+а каждая транзакция выполняется под блокировкой своей шины, поэтому
+несколько потоков могут работать с разными устройствами одновременно.
+"""
+import threading
+
+
+def open_bus(bus_number):
+    """Открывает шину; smbus2 предпочтительнее - он поддерживает i2c_rdwr"""
+    try:
+        import smbus2 as smbus
+    except ImportError:
+        import smbus
+    return smbus.SMBus(bus_number)
+
+
+class SharedBus:
+    """Потокобезопасная обертка над smbus.SMBus с тем же набором методов"""
+
+    def __init__(self, pool, bus_number, bus):
+        self.pool = pool
+        self.bus_number = bus_number
+        self.bus = bus
+        self.lock = threading.RLock()
+
+    def __enter__(self):
+        """Захватывает шину на несколько транзакций подряд"""
+        self.lock.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.lock.release()
+
+    def read_byte(self, address):
+        with self.lock:
+            return self.bus.read_byte(address)
+
+    def write_byte(self, address, value):
+        with self.lock:
+            return self.bus.write_byte(address, value)
+
+    def read_word_data(self, address, cmd):
+        with self.lock:
+            return self.bus.read_word_data(address, cmd)
+
+    def write_byte_data(self, address, cmd, value):
+        with self.lock:
+            return self.bus.write_byte_data(address, cmd, value)
+
+    def read_i2c_block_data(self, address, cmd, length):
+        with self.lock:
+            return self.bus.read_i2c_block_data(address, cmd, length)
+
+    def write_i2c_block_data(self, address, cmd, data):
+        with self.lock:
+            return self.bus.write_i2c_block_data(address, cmd, data)
+
+    def _check_rdwr(self):
+        if not hasattr(self.bus, "i2c_rdwr"):
+            raise RuntimeError("Шина не поддерживает i2c_rdwr, установите smbus2")
+
+    def i2c_rdwr(self, *messages):
+        """Несколько сообщений одной транзакцией с повторным START (нужен smbus2)"""
+        self._check_rdwr()
+        with self.lock:
+            return self.bus.i2c_rdwr(*messages)
+
+    def write_read(self, address, data, length):
+        """Запись data и чтение length байт без STOP между ними"""
+        self._check_rdwr()
+        from smbus2 import i2c_msg
+
+        write = i2c_msg.write(address, data)
+        read = i2c_msg.read(address, length)
+        self.i2c_rdwr(write, read)
+        return bytes(read)
+
+    def close(self):
+        """Отпускает шину; настоящий дескриптор закрывается последним владельцем"""
+        self.pool.release(self.bus_number)
+
+
+class BusPool:
+    def __init__(self, opener=open_bus):
+        self.opener = opener
+        self.lock = threading.Lock()
+        self.buses = {}  # номер шины -> [SharedBus, число владельцев]
+
+    def register(self, bus_number, bus):
+        """Подставляет готовый объект шины (например, sim.FakeSMBus) вместо открытия устройства"""
+        with self.lock:
+            if bus_number in self.buses:
+                raise RuntimeError(f"Шина {bus_number} уже открыта")
+            self.buses[bus_number] = [SharedBus(self, bus_number, bus), 0]
+
+    def acquire(self, bus_number=1):
+        """Возвращает общую обертку шины, открывая ее при первом обращении"""
+        with self.lock:
+            entry = self.buses.get(bus_number)
+            if entry is None:
+                entry = self.buses[bus_number] = [SharedBus(self, bus_number, self.opener(bus_number)), 0]
+            entry[1] += 1
+            return entry[0]
+
+    def release(self, bus_number):
+        with self.lock:
+            entry = self.buses.get(bus_number)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self.buses[bus_number]
+                entry[0].bus.close()
+
+    def refcount(self, bus_number):
+        with self.lock:
+            entry = self.buses.get(bus_number)
+            return 0 if entry is None else entry[1]
+
+
+POOL = BusPool()
@@ -0,0 +1,119 @@
+"""
+Событийный ввод с GPIO: прерывания по фронтам, программный антидребезг, очередь
+
+Вместо опроса GPIO.input() в цикле пины регистрируются через
+GPIO.add_event_detect(). Обработчик фронта только ставит событие с меткой
+времени в очередь, а Dispatcher.run() спит на очереди и вызывает функции
+пользователя - в ожидании процесс не занимает процессор.
+"""
+import collections
+import queue
+import threading
+import time
+
+from labkit.r2r_adc import _load_gpio
+
+RISING = "rising"
+FALLING = "falling"
+
+# Событие: пин, новый уровень, фронт и время фронта в нс (time.monotonic_ns)
+InputEvent = collections.namedtuple("InputEvent", "pin level edge timestamp")
+
+_STOP = object()
+
+
+class Dispatcher:
+    def __init__(self, debounce=0.005, gpio=None):
+        """
+        Args:
+            debounce (float): Время антидребезга по умолчанию, с
+            gpio: Модуль с интерфейсом RPi.GPIO (по умолчанию - сам RPi.GPIO)
+        """
+        self.gpio = gpio if gpio is not None else _load_gpio()
+        self.debounce_ns = int(debounce * 1e9)
+        self.events = queue.Queue()
+        self.handlers = collections.defaultdict(list)  # (пин, фронт) -> функции
+        self.pins = {}  # пин -> [антидребезг в нс, последний уровень, время последнего фронта, таймер]
+        self.lock = threading.Lock()
+        self.gpio.setmode(self.gpio.BCM)
+
+    def add_input(self, pin, pull_up_down=None, debounce=None):
+        """Настраивает пин на вход и включает прерывания по обоим фронтам"""
+        if pull_up_down is None:
+            self.gpio.setup(pin, self.gpio.IN)
+        else:
+            self.gpio.setup(pin, self.gpio.IN, pull_up_down=pull_up_down)
+        debounce_ns = self.debounce_ns if debounce is None else int(debounce * 1e9)
+        self.pins[pin] = [debounce_ns, self.gpio.input(pin), 0, None]
+        self.gpio.add_event_detect(pin, self.gpio.BOTH, callback=self._on_edge)
+
+    def on(self, pin, edge, callback):
+        """
+        Регистрирует callback(event) на фронт edge (RISING, FALLING или None - оба)
+        """
+        if pin not in self.pins:
+            self.add_input(pin)
+        for e in ((RISING, FALLING) if edge is None else (edge,)):
+            self.handlers[(pin, e)].append(callback)
+
+    def level(self, pin):
+        """Последний принятый (после антидребезга) уровень пина"""
+        return self.pins[pin][1]
+
+    def _on_edge(self, pin):
+        # Вызывается из потока RPi.GPIO: только проверка и постановка в очередь
+        now = time.monotonic_ns()
+        level = self.gpio.input(pin)
+        with self.lock:
+            state = self.pins[pin]
+            debounce_ns, last_level, last_time, timer = state
+            if now - last_time < debounce_ns:
+                # Дребезг: перепроверим уровень, когда окно антидребезга закончится
+                if timer is None:
+                    delay = (last_time + debounce_ns - now) * 1e-9
+                    state[3] = threading.Timer(delay, self._recheck, (pin,))
+                    state[3].daemon = True
+                    state[3].start()
+                return
+            if level == last_level:
+                return
+            state[1] = level
+            state[2] = now
+        self.events.put(InputEvent(pin, level, RISING if level else FALLING, now))
+
+    def _recheck(self, pin):
+        with self.lock:
+            self.pins[pin][3] = None
+        self._on_edge(pin)
+
+    def dispatch(self, event):
+        for callback in self.handlers.get((event.pin, event.edge), ()):
+            callback(event)
+
+    def run(self, timeout=None):
+        """
+        Обрабатывает события до stop() (или до timeout секунд без событий)
+
+        Returns:
+            int: Число обработанных событий
+        """
+        handled = 0
+        while True:
+            try:
+                event = self.events.get(timeout=timeout)
+            except queue.Empty:
+                return handled
+            if event is _STOP:
+                return handled
+            self.dispatch(event)
+            handled += 1
+
+    def stop(self):
+        self.events.put(_STOP)
+
+    def deinit(self):
+        for pin, state in self.pins.items():
+            if state[3] is not None:
+                state[3].cancel()
+            self.gpio.remove_event_detect(pin)
+        self.pins.clear()
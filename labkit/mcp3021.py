@@ -0,0 +1,261 @@
+import array
+import time
+
+from labkit.i2c_bus import POOL
+
+DEFAULT_ADDRESS = 0x4D  # Адрес MCP3021 по умолчанию
+MAX_NUMBER = 1023
+
+
+def decode_word(data):
+    """
+    Выделяет 10-битное число из слова, прочитанного read_word_data
+
+    Формат данных MCP3021: [XXXX XXDD DDDD DDDD] где D - биты данных
+    """
+    lower_data_byte = data & 0xFF
+    upper_data_byte = (data >> 8) & 0xFF
+    return ((upper_data_byte & 0x0F) << 6) | (lower_data_byte >> 2)
+
+
+class MCP3021:
+    def __init__(self, dynamic_range, verbose=False, address=DEFAULT_ADDRESS, bus=None, bus_number=1):
+        """
+        Конструктор класса MCP3021
+
+        Args:
+            dynamic_range (float): Динамический диапазон АЦП в Вольтах
+            verbose (bool): Флаг отладочного вывода
+            address (int): Адрес микросхемы на шине I2C
+            bus: Объект с интерфейсом smbus.SMBus (по умолчанию - общая шина bus_number из POOL)
+            bus_number (int): Номер шины I2C
+        """
+        self.owns_bus = bus is None
+        self.bus = POOL.acquire(bus_number) if bus is None else bus
+        self.dynamic_range = dynamic_range
+        self.address = address
+        self.verbose = verbose
+
+        if self.verbose:
+            print(f"MCP3021 инициализирован:")
+            print(f"  Адрес: 0x{self.address:02X}")
+            print(f"  Динамический диапазон: {self.dynamic_range} В")
+            print(f"  Шина I2C: {bus_number}")
+
+    def deinit(self):
+        """Деструктор - освобождает шину I2C (повторный вызов ничего не делает)"""
+        if self.bus is None:
+            return
+        if self.owns_bus:
+            self.bus.close()
+        self.bus = None
+        if self.verbose:
+            print("Шина I2C освобождена")
+
+    def get_number(self):
+        """
+        Читает число из микросхемы MCP3021
+
+        Returns:
+            int: 10-битное число (0-1023)
+        """
+        try:
+            data = self.bus.read_word_data(self.address, 0)
+            number = decode_word(data)
+
+            if self.verbose:
+                print(f"Принятые данные: 0x{data:04X}")
+                print(f"  Старший байт: 0x{(data >> 8) & 0xFF:02X}")
+                print(f"  Младший байт: 0x{data & 0xFF:02X}")
+                print(f"  Число (10 бит): {number} ({number:010b})")
+
+            return number
+
+        except Exception as e:
+            if self.verbose:
+                print(f"Ошибка чтения MCP3021: {e}")
+            return 0
+
+    def read_into(self, codes_buf, ts_buf, clock=time.monotonic_ns):
+        """
+        Заполняет буферы кодами и метками времени (нс) на месте, как R2R_ADC.read_into
+
+        При ошибке шины заполнение прекращается.
+
+        Returns:
+            int: Сколько отсчетов записано
+        """
+        read_word_data = self.bus.read_word_data
+        address = self.address
+        count = min(len(codes_buf), len(ts_buf))
+        for i in range(count):
+            try:
+                data = read_word_data(address, 0)
+            except OSError as e:
+                if self.verbose:
+                    print(f"Ошибка чтения MCP3021: {e}")
+                return i
+            codes_buf[i] = decode_word(data)
+            ts_buf[i] = clock()
+        return count
+
+    def get_voltage(self):
+        """
+        Возвращает измеренное микросхемой MCP3021 напряжение в Вольтах
+
+        Returns:
+            float: Напряжение в Вольтах
+        """
+        return self.get_number() / MAX_NUMBER * self.dynamic_range
+
+
+# Все адреса, которые бывают у вариантов MCP3021 (A0-A7)
+SCAN_ADDRESSES = range(0x48, 0x50)
+
+
+def scan(bus, addresses=SCAN_ADDRESSES):
+    """
+    Ищет MCP3021 на шине
+
+    У MCP3021 нет регистров, поэтому проверкой служит обычное чтение:
+    отсутствующее устройство не подтверждает адрес и дает OSError.
+
+    Returns:
+        list: Адреса ответивших устройств
+    """
+    found = []
+    for address in addresses:
+        try:
+            bus.read_word_data(address, 0)
+        except OSError:
+            continue
+        found.append(address)
+    return found
+
+
+def weighted_schedule(weights):
+    """
+    Порядок опроса каналов на один цикл (плавный взвешенный round-robin)
+
+    Каналы с большим весом опрашиваются чаще, но равномерно по циклу:
+    веса [2, 1] дают порядок [0, 1, 0].
+    """
+    total = sum(weights)
+    current = [0] * len(weights)
+    order = []
+    for _ in range(total):
+        for i, weight in enumerate(weights):
+            current[i] += weight
+        best = max(range(len(weights)), key=current.__getitem__)
+        current[best] -= total
+        order.append(best)
+    return order
+
+
+class MultiChannelReader:
+    def __init__(self, bus, addresses, weights=None, block_size=256):
+        """
+        Опрос нескольких MCP3021 на общей шине
+
+        Args:
+            bus: Объект с интерфейсом smbus.SMBus
+            addresses (sequence): Адреса каналов (например, результат scan())
+            weights (sequence): Относительные частоты опроса каналов (по умолчанию равные)
+            block_size (int): Число отсчетов в блоке одного канала
+        """
+        self.bus = bus
+        self.addresses = list(addresses)
+        self.weights = list(weights) if weights is not None else [1] * len(self.addresses)
+        if len(self.weights) != len(self.addresses) or min(self.weights) <= 0:
+            raise ValueError("Нужен положительный вес для каждого канала")
+        self.block_size = block_size
+        self.schedule = weighted_schedule(self.weights)
+        self.counts = [0] * len(self.addresses)
+        self.errors = [0] * len(self.addresses)
+        self.elapsed = 0.0
+
+    def _new_block(self):
+        return array.array("q"), array.array("H")
+
+    def blocks(self, duration=None, cycles=None):
+        """
+        Генератор блоков отсчетов по мере их заполнения
+
+        Yields:
+            tuple: (адрес, метки времени в нс array('q'), коды array('H')).
+            Блоки разных каналов идут вперемешку; в конце отдаются неполные блоки.
+        """
+        read = self.bus.read_word_data
+        clock = time.monotonic_ns
+        addresses = self.addresses
+        schedule = self.schedule
+        block_size = self.block_size
+        buffers = [self._new_block() for _ in addresses]
+
+        start = clock()
+        end = None if duration is None else start + int(duration * 1e9)
+        cycle = 0
+        try:
+            while (cycles is None or cycle < cycles) and (end is None or clock() < end):
+                cycle += 1
+                for channel in schedule:
+                    address = addresses[channel]
+                    try:
+                        data = read(address, 0)
+                    except OSError:
+                        self.errors[channel] += 1
+                        continue
+                    timestamps, codes = buffers[channel]
+                    timestamps.append(clock())
+                    codes.append(decode_word(data))
+                    self.counts[channel] += 1
+                    if len(codes) == block_size:
+                        yield address, timestamps, codes
+                        buffers[channel] = self._new_block()
+        finally:
+            self.elapsed += (clock() - start) * 1e-9
+
+        for address, (timestamps, codes) in zip(addresses, buffers):
+            if codes:
+                yield address, timestamps, codes
+
+    def rates(self):
+        """Достигнутая частота опроса каждого канала, Гц"""
+        if not self.elapsed:
+            return {address: 0.0 for address in self.addresses}
+        return {address: count / self.elapsed for address, count in zip(self.addresses, self.counts)}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Поиск и опрос всех MCP3021 на шине I2C")
+    parser.add_argument("--duration", type=float, default=2.0, help="Продолжительность опроса, с")
+    parser.add_argument("--weights", help="Веса каналов через запятую")
+    parser.add_argument("--sim", action="store_true", help="Использовать модель шины вместо платы")
+    args = parser.parse_args()
+
+    if args.sim:
+        from labkit import sim
+        bus = sim.FakeSMBus({
+            0x48: sim.FakeMCP3021(sim.dc_signal(1.0)),
+            0x4B: sim.FakeMCP3021(sim.sine_signal(2.5, 2.0, 1.0)),
+            0x4D: sim.FakeMCP3021(sim.dc_signal(4.0)),
+        }, transaction_time=1e-4)
+    else:
+        bus = POOL.acquire(1)
+
+    try:
+        addresses = scan(bus)
+        print(f"Найдены MCP3021: {', '.join(f'0x{a:02X}' for a in addresses) or 'нет'}")
+        if addresses:
+            weights = [int(w) for w in args.weights.split(",")] if args.weights else None
+            reader = MultiChannelReader(bus, addresses, weights)
+            blocks = 0
+            for _ in reader.blocks(duration=args.duration):
+                blocks += 1
+            print(f"Получено блоков: {blocks}")
+            for address, rate in reader.rates().items():
+                print(f"  0x{address:02X}: {rate:.0f} отсчетов/с")
+    finally:
+        bus.close()
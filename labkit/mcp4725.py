@@ -0,0 +1,60 @@
+from labkit.i2c_bus import POOL
+
+DEFAULT_ADDRESS = 0x61
+MAX_NUMBER = 4095
+
+
+def encode_number(number, wm=0x00, pds=0x00):
+    """Два байта команды быстрой записи MCP4725 для 12-битного числа"""
+    first_byte = wm | pds | number >> 8
+    second_byte = number & 0xFF
+    return first_byte, second_byte
+
+
+class MCP4725:
+    def __init__(self, dynamic_range, address=DEFAULT_ADDRESS, verbose=True, bus=None, bus_number=1):
+        """
+        Конструктор класса MCP4725
+
+        Args:
+            dynamic_range (float): Динамический диапазон ЦАП в Вольтах
+            address (int): Адрес микросхемы на шине I2C
+            verbose (bool): Флаг отладочного вывода
+            bus: Объект с интерфейсом smbus.SMBus (по умолчанию - общая шина bus_number из POOL)
+            bus_number (int): Номер шины I2C
+        """
+        self.owns_bus = bus is None
+        self.bus = POOL.acquire(bus_number) if bus is None else bus
+        self.address = address
+        self.wm = 0x00
+        self.pds = 0x00
+
+        self.verbose = verbose
+        self.dynamic_range = dynamic_range
+
+    def deinit(self):
+        """Освобождает шину I2C; повторный вызов ничего не делает"""
+        if self.bus is None:
+            return
+        if self.owns_bus:
+            self.bus.close()
+        self.bus = None
+
+    def set_number(self, number):
+        if not isinstance(number, int):
+            print("На вход ЦАП можно подавать только целые числа")
+
+        if not (0 <= number <= MAX_NUMBER):
+            print("Число выходит за разрядность MCP4752 (12 bit)")
+        first_byte, second_byte = encode_number(number, self.wm, self.pds)
+        self.bus.write_byte_data(self.address, first_byte, second_byte)
+
+        if self.verbose:
+            print(f"Число: {number}, отправленные по I2C данные: [0x{(self.address << 1):02X}, 0x{second_byte:02X}]\n")
+
+    def set_voltage(self, voltage):
+        if not (0.0 <= voltage <= self.dynamic_range):
+            print(f"Напряжение выходит за динамический диапазон ЦАП (0.00 - {self.dynamic_range:.2f}) B")
+            print("Устанавливаем 0.0 В")
+            self.set_number(0)
+        self.set_number(int(voltage / self.dynamic_range * MAX_NUMBER))
@@ -0,0 +1,327 @@
+"""
+Многопроцессный конвейер: измерение, анализ и графики в отдельных процессах
+
+Процесс измерения пишет коды АЦП и метки времени в кольцевой буфер в
+multiprocessing.shared_memory. Процессы анализа и графиков читают его
+напрямую через memoryview (или numpy.frombuffer) без копирования и без
+pickle: между процессами передается только имя сегмента памяти.
+"""
+import multiprocessing as mp
+import os
+import time
+from multiprocessing import shared_memory
+
+HEADER_SIZE = 64  # write_count (int64), capacity (int64), выравнивание до 64 байт
+
+
+class SharedRing:
+    """
+    Кольцевой буфер кодов (uint16) и меток времени (int64, нс) в разделяемой памяти
+
+    Писатель один. Счетчик записанных отсчетов обновляется после записи данных,
+    поэтому читатель видит только полностью записанные отсчеты.
+    """
+
+    def __init__(self, shm, owner):
+        self.shm = shm
+        self.owner = owner
+        self.header = shm.buf[:16].cast("q")
+        self.capacity = self.header[1]
+        ts_end = HEADER_SIZE + self.capacity * 8
+        self.timestamps = shm.buf[HEADER_SIZE:ts_end].cast("q")
+        self.codes = shm.buf[ts_end:ts_end + self.capacity * 2].cast("H")
+
+    @classmethod
+    def create(cls, capacity):
+        """Создает новый буфер на capacity отсчетов"""
+        shm = shared_memory.SharedMemory(create=True, size=HEADER_SIZE + capacity * 10)
+        header = shm.buf[:16].cast("q")
+        header[0] = 0
+        header[1] = capacity
+        header.release()
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """Подключается к буферу, созданному другим процессом"""
+        return cls(shared_memory.SharedMemory(name=name), owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    @property
+    def write_count(self):
+        return self.header[0]
+
+    def write(self, code, timestamp):
+        """Добавляет один отсчет"""
+        count = self.header[0]
+        index = count % self.capacity
+        self.codes[index] = code
+        self.timestamps[index] = timestamp
+        self.header[0] = count + 1
+
+    def reserve(self, max_count):
+        """
+        Срезы кольца под следующие отсчеты для записи на месте (до конца кольца)
+
+        Записанное становится видно читателям только после commit().
+
+        Returns:
+            tuple: (memoryview кодов, memoryview меток времени)
+        """
+        index = self.header[0] % self.capacity
+        end = min(index + max_count, self.capacity)
+        return self.codes[index:end], self.timestamps[index:end]
+
+    def commit(self, count):
+        """Публикует count отсчетов, записанных в срезы из reserve()"""
+        self.header[0] += count
+
+    def numpy_views(self):
+        """Массивы numpy поверх той же памяти (без копирования)"""
+        import numpy as np
+
+        ts_offset = HEADER_SIZE
+        codes_offset = HEADER_SIZE + self.capacity * 8
+        timestamps = np.frombuffer(self.shm.buf, dtype=np.int64, count=self.capacity, offset=ts_offset)
+        codes = np.frombuffer(self.shm.buf, dtype=np.uint16, count=self.capacity, offset=codes_offset)
+        return codes, timestamps
+
+    def close(self):
+        """Освобождает представления памяти; создатель буфера также удаляет сегмент"""
+        for view in (self.codes, self.timestamps, self.header):
+            view.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class RingReader:
+    """Читатель кольцевого буфера со своей позицией"""
+
+    def __init__(self, ring, from_start=False):
+        self.ring = ring
+        self.position = 0 if from_start else ring.write_count
+        self.lost = 0
+
+    def read(self, max_count=None):
+        """
+        Возвращает новые отсчеты как срезы memoryview без копирования
+
+        Returns:
+            list: Один или два кортежа (codes, timestamps) - два, если данные
+            переходят через конец кольца. Срезы действительны до следующего
+            read(), после которого писатель может их перезаписать.
+        """
+        ring = self.ring
+        count = ring.write_count
+        if count - self.position > ring.capacity:
+            # Писатель обогнал читателя на целое кольцо - старые данные потеряны
+            self.lost += count - self.position - ring.capacity
+            self.position = count - ring.capacity
+
+        available = count - self.position
+        if max_count is not None:
+            available = min(available, max_count)
+        if available <= 0:
+            return []
+
+        start = self.position % ring.capacity
+        first = min(available, ring.capacity - start)
+        segments = [(ring.codes[start:start + first], ring.timestamps[start:start + first])]
+        if available > first:
+            rest = available - first
+            segments.append((ring.codes[:rest], ring.timestamps[:rest]))
+        self.position += available
+        return segments
+
+
+def set_realtime(cpu=None, rt_priority=None):
+    """Привязывает процесс к ядру и включает приоритет реального времени, если разрешено"""
+    if cpu is not None:
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except (AttributeError, OSError) as e:
+            print(f"Не удалось привязать процесс к ядру {cpu}: {e}")
+    if rt_priority is not None:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(rt_priority))
+        except (AttributeError, OSError) as e:
+            print(f"Приоритет реального времени недоступен: {e}")
+
+
+def acquisition_worker(ring_name, adc_settings, stop, use_sim=False, cpu=None, rt_priority=None, block=64):
+    """
+    Процесс измерения: только АЦП и запись в кольцевой буфер
+
+    АЦП пишет блоками по block отсчетов прямо в разделяемую память
+    (read_into), без промежуточных объектов на каждый отсчет.
+    """
+    from labkit.cli import load_config, make_adc
+
+    set_realtime(cpu, rt_priority)
+    config = load_config(None)
+    config.read_dict({"adc": adc_settings})
+    adc = make_adc(config, use_sim=use_sim)
+    ring = SharedRing.attach(ring_name)
+
+    codes = timestamps = None
+    try:
+        while not stop.is_set():
+            codes, timestamps = ring.reserve(block)
+            ring.commit(adc.read_into(codes, timestamps))
+            codes.release()
+            timestamps.release()
+    finally:
+        # Срезы держат память сегмента: без release() ring.close() выдаст BufferError
+        for view in (codes, timestamps):
+            if view is not None:
+                view.release()
+        adc.deinit()
+        ring.close()
+
+
+def block_stats(segments):
+    """Число отсчетов, сумма, минимум и максимум кодов по срезам из RingReader.read()"""
+    total = 0
+    code_sum = 0
+    code_min = None
+    code_max = None
+    for codes, _ in segments:
+        total += len(codes)
+        code_sum += sum(codes)
+        low, high = min(codes), max(codes)
+        code_min = low if code_min is None else min(code_min, low)
+        code_max = high if code_max is None else max(code_max, high)
+    return total, code_sum, code_min, code_max
+
+
+def analysis_worker(ring_name, stop, max_value, dynamic_range, report_period=1.0):
+    """Процесс анализа: раз в report_period печатает статистику новых отсчетов"""
+    ring = SharedRing.attach(ring_name)
+    reader = RingReader(ring)
+    scale = dynamic_range / max_value
+    try:
+        while not stop.is_set():
+            time.sleep(report_period)
+            total, code_sum, code_min, code_max = block_stats(reader.read())
+            if total:
+                print(f"Отсчетов: {total:6d} ({total / report_period:.0f} Гц), "
+                      f"среднее {code_sum / total * scale:.3f} В, "
+                      f"мин {code_min * scale:.3f} В, макс {code_max * scale:.3f} В, "
+                      f"потеряно {reader.lost}")
+    finally:
+        ring.close()
+
+
+def plot_worker(ring_name, stop, max_value, dynamic_range, window=2000, refresh=0.2):
+    """Процесс графиков: показывает последние window отсчетов"""
+    import matplotlib.pyplot as plt
+    import numpy as np
+
+    ring = SharedRing.attach(ring_name)
+    codes, timestamps = ring.numpy_views()
+    scale = dynamic_range / max_value
+
+    plt.ion()
+    figure, axes = plt.subplots(figsize=(12, 6))
+    line, = axes.plot([], [], 'b-', linewidth=1)
+    axes.set_xlabel('Время, с')
+    axes.set_ylabel('Напряжение, В')
+    axes.set_ylim(0, dynamic_range * 1.1)
+    axes.grid(True, linestyle='--', alpha=0.7)
+
+    try:
+        while not stop.is_set() and plt.fignum_exists(figure.number):
+            count = ring.write_count
+            n = min(count, window, ring.capacity)
+            if n:
+                indices = np.arange(count - n, count) % ring.capacity
+                t = (timestamps[indices] - timestamps[indices[-1]]) * 1e-9
+                line.set_data(t, codes[indices] * scale)
+                axes.set_xlim(t[0], 0)
+            plt.pause(refresh)
+    finally:
+        del codes, timestamps
+        plt.close(figure)
+        ring.close()
+
+
+def publish_worker(ring_name, stop, address, period=0.05):
+    """Процесс рассылки: раз в period отправляет новые отсчеты подписчикам StreamServer"""
+    from labkit.stream_server import StreamServer
+
+    ring = SharedRing.attach(ring_name)
+    reader = RingReader(ring)
+    server = StreamServer(address)
+    print(f"Поток отсчетов доступен по адресу {server.address}")
+    try:
+        while not stop.is_set():
+            time.sleep(period)
+            for codes, timestamps in reader.read():
+                server.publish(codes, timestamps)
+                del codes, timestamps
+    finally:
+        server.close()
+        ring.close()
+
+
+def dashboard_worker(ring_name, stop, port, max_value, dynamic_range, period=0.05):
+    """Процесс панели в браузере: прореживает новые отсчеты и отдает их по HTTP"""
+    from labkit.dashboard import Dashboard, MinMaxDecimator
+
+    ring = SharedRing.attach(ring_name)
+    reader = RingReader(ring)
+    decimator = MinMaxDecimator(scale=dynamic_range / max_value)
+    dashboard = Dashboard(decimator, port=port, voltage_range=dynamic_range)
+    dashboard.start()
+    print(f"Панель измерений: {dashboard.url}")
+    try:
+        while not stop.is_set():
+            time.sleep(period)
+            for codes, timestamps in reader.read():
+                decimator.add(codes, timestamps)
+                del codes, timestamps
+    finally:
+        dashboard.stop()
+        ring.close()
+
+
+def run_pipeline(adc_settings, duration, use_sim=False, cpu=None, rt_priority=None, plot=False,
+                 capacity=1 << 16, max_value=255, dynamic_range=3.3, serve=None, dashboard_port=None):
+    """
+    Запускает процессы измерения, анализа и (по желанию) графиков на duration секунд
+
+    serve - адрес StreamServer ((хост, порт) или путь к Unix-сокету), чтобы
+    рассылать отсчеты клиентам из отдельного процесса; dashboard_port -
+    порт панели в браузере вместо окна matplotlib
+    """
+    ring = SharedRing.create(capacity)
+    stop = mp.Event()
+    processes = [
+        mp.Process(target=acquisition_worker, args=(ring.name, adc_settings, stop, use_sim, cpu, rt_priority)),
+        mp.Process(target=analysis_worker, args=(ring.name, stop, max_value, dynamic_range)),
+    ]
+    if plot:
+        processes.append(mp.Process(target=plot_worker, args=(ring.name, stop, max_value, dynamic_range)))
+    if serve is not None:
+        processes.append(mp.Process(target=publish_worker, args=(ring.name, stop, serve)))
+    if dashboard_port is not None:
+        processes.append(mp.Process(target=dashboard_worker,
+                                    args=(ring.name, stop, dashboard_port, max_value, dynamic_range)))
+
+    for process in processes:
+        process.start()
+    try:
+        stop.wait(duration)
+    except KeyboardInterrupt:
+        print("\nИзмерения прерваны пользователем")
+    finally:
+        stop.set()
+        for process in processes:
+            process.join()
+        total = ring.write_count
+        ring.close()
+    return total
@@ -0,0 +1,55 @@
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+def plot_voltage_vs_time(time_data, voltage_data, max_voltage, label='Измеренное напряжение'):
+    """Строит график зависимости напряжения от времени"""
+    plt.figure(figsize=(12, 6))
+    plt.plot(time_data, voltage_data, 'b-', linewidth=1, marker='o', markersize=3, label=label)
+    plt.title('Зависимость напряжения от времени')
+    plt.xlabel('Время, с')
+    plt.ylabel('Напряжение, В')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.ylim(0, max_voltage * 1.1)
+    if len(time_data):
+        plt.xlim(0, max(time_data))
+    plt.legend()
+    plt.tight_layout()
+    plt.show()
+
+
+def plot_sampling_period_hist(measurement_times, bin_width=0.01, method_name=""):
+    """Строит распределение количества измерений по их продолжительности"""
+    if not len(measurement_times):
+        print("Нет данных для построения гистограммы")
+        return
+
+    plt.figure(figsize=(10, 6))
+    bins = np.arange(0, max(measurement_times) + bin_width, bin_width)
+    plt.hist(measurement_times, bins=bins, color='lightblue', edgecolor='black', alpha=0.7, rwidth=0.8)
+
+    title = 'Распределение продолжительности измерений АЦП'
+    plt.title(f'{title} ({method_name})' if method_name else title)
+    plt.xlabel('Продолжительность измерения, с')
+    plt.ylabel('Количество измерений')
+    plt.grid(True, linestyle='--', alpha=0.7, axis='y')
+
+    mean_time = np.mean(measurement_times)
+    plt.axvline(mean_time, color='red', linestyle='--', linewidth=2, label=f'Среднее: {mean_time:.3f} с')
+    plt.legend()
+    plt.tight_layout()
+    plt.show()
+
+
+def plot_spectrum(freqs, power, title='Спектр мощности'):
+    """Строит спектр мощности в дБ относительно максимума"""
+    power_db = 10 * np.log10(np.maximum(power, 1e-20) / np.max(power))
+    plt.figure(figsize=(12, 6))
+    plt.plot(freqs, power_db, 'b-', linewidth=1)
+    plt.title(title)
+    plt.xlabel('Частота, Гц')
+    plt.ylabel('Мощность, дБ')
+    plt.grid(True, linestyle='--', alpha=0.7)
+    plt.ylim(max(np.min(power_db), -140), 5)
+    plt.tight_layout()
+    plt.show()
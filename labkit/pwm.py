@@ -0,0 +1,141 @@
+"""
+Программный ШИМ на много каналов в одном потоке
+
+GPIO.PWM создает по потоку на каждый пин. Здесь один поток ведет все каналы:
+на каждый набор коэффициентов заполнения заранее строится расписание
+периода - в начале периода все включенные каналы зажигаются одной записью,
+а каналы с одинаковым моментом выключения гасятся тоже одной записью.
+"""
+import threading
+import time
+
+from labkit.r2r_adc import _load_gpio
+
+BAR_PINS = (16, 12, 25, 17, 27, 23, 22, 24)  # Светодиодная шкала на 8 сегментов
+
+
+def build_timeline(pins, duties, resolution):
+    """
+    Расписание одного периода ШИМ
+
+    Args:
+        pins (sequence): Пины каналов
+        duties (sequence): Коэффициенты заполнения в процентах
+        resolution (int): Число ступеней яркости за период
+
+    Returns:
+        tuple: (уровни всех пинов в начале периода,
+                [(доля периода, пины, которые гасятся в этот момент), ...] по возрастанию)
+    """
+    start_levels = []
+    edges = {}
+    for pin, duty in zip(pins, duties):
+        step = round(min(max(duty, 0.0), 100.0) / 100.0 * resolution)
+        start_levels.append(1 if step > 0 else 0)
+        if 0 < step < resolution:
+            edges.setdefault(step, []).append(pin)
+    timeline = [(step / resolution, off_pins) for step, off_pins in sorted(edges.items())]
+    return start_levels, timeline
+
+
+class SoftPWM:
+    def __init__(self, pins=BAR_PINS, frequency=100, resolution=64, gpio=None):
+        """
+        Args:
+            pins (sequence): Пины каналов
+            frequency (float): Частота ШИМ в Герцах
+            resolution (int): Число ступеней яркости за период
+            gpio: Модуль с интерфейсом RPi.GPIO (по умолчанию - сам RPi.GPIO)
+        """
+        self.gpio = gpio if gpio is not None else _load_gpio()
+        self.pins = list(pins)
+        self.period = 1.0 / frequency
+        self.resolution = resolution
+        self.duties = [0.0] * len(self.pins)
+        self._timeline = build_timeline(self.pins, self.duties, resolution)
+        self._running = False
+        self._thread = None
+        self.periods = 0
+
+        self.gpio.setmode(self.gpio.BCM)
+        self.gpio.setup(self.pins, self.gpio.OUT, initial=0)
+
+    def start(self):
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="soft-pwm", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.gpio.output(self.pins, 0)
+
+    def deinit(self):
+        self.stop()
+        self.gpio.cleanup()
+
+    def set_duty(self, channel, duty):
+        """Задает коэффициент заполнения (0-100 %) одного канала по его номеру"""
+        self.duties[channel] = duty
+        self._timeline = build_timeline(self.pins, self.duties, self.resolution)
+
+    def set_duties(self, duties):
+        """Задает коэффициенты заполнения всех каналов сразу (одно перестроение расписания)"""
+        self.duties = list(duties)
+        self._timeline = build_timeline(self.pins, self.duties, self.resolution)
+
+    def set_bar(self, level, brightness=100.0):
+        """
+        Шкала: level в диапазоне 0..число каналов, дробная часть - яркость
+        следующего сегмента
+        """
+        duties = []
+        for i in range(len(self.pins)):
+            fill = min(max(level - i, 0.0), 1.0)
+            duties.append(fill * brightness)
+        self.set_duties(duties)
+
+    def _run(self):
+        output = self.gpio.output
+        pins = self.pins
+        period = self.period
+        clock = time.perf_counter
+        sleep = time.sleep
+
+        next_start = clock()
+        while self._running:
+            # Расписание меняется заменой ссылки, поэтому период всегда согласован
+            start_levels, timeline = self._timeline
+            period_start = next_start
+            output(pins, start_levels)
+            for fraction, off_pins in timeline:
+                delay = period_start + fraction * period - clock()
+                if delay > 0:
+                    sleep(delay)
+                output(off_pins, 0)
+            next_start = period_start + period
+            delay = next_start - clock()
+            if delay > 0:
+                sleep(delay)
+            else:
+                # Не успели - начинаем следующий период от текущего момента
+                next_start = clock()
+            self.periods += 1
+
+
+if __name__ == "__main__":
+    pwm = SoftPWM()
+    pwm.start()
+    try:
+        level = 0.0
+        while True:
+            pwm.set_bar(level)
+            level = (level + 0.05) % (len(pwm.pins) + 1)
+            time.sleep(0.02)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pwm.deinit()
@@ -0,0 +1,675 @@
+import hashlib
+import math
+import os
+import tempfile
+import time
+
+from labkit.trace import COMPARE, CONVERSION, DAC, PRINT, SETTLE
+
+# Стандартное подключение R2R-ЦАП (от старшего бита к младшему) и компаратора
+DAC_PINS = (26, 20, 19, 16, 13, 12, 25, 11)
+COMP_PIN = 21  # GPIO21 - физический пин 40
+
+ALGORITHMS = ("sar", "counting", "redundant", "subranging")
+
+
+def _load_gpio():
+    import RPi.GPIO as GPIO
+    return GPIO
+
+
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+
+
+def self_test_cache_path(bits_gpio, comp_pins, comp_taps, dynamic_range):
+    """
+    Файл-отметка о пройденной быстрой самопроверке для текущей загрузки
+
+    Ключ - boot_id ядра, пины и настройки компараторов: после перезагрузки
+    или смены подключения проверка выполняется заново. None, если boot_id
+    недоступен.
+    """
+    try:
+        with open(BOOT_ID_PATH) as f:
+            boot_id = f.read().strip()
+    except OSError:
+        return None
+    key = f"{boot_id}|{list(bits_gpio)}|{list(comp_pins)}|{list(comp_taps)}|{dynamic_range}"
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(directory, f"labkit-selftest-{hashlib.sha1(key.encode()).hexdigest()[:16]}")
+
+
+def _redundant_result(number, weights, bits):
+    """Результат избыточного SAR для целого входа number при точном компараторе"""
+    max_value = (1 << bits) - 1
+    target = 1 << (bits - 1)
+    for weight in weights:
+        test_value = min(max(target, 0), max_value)
+        below = number >= test_value
+        target = target + weight if below else target - weight
+    return test_value if below else test_value - 1
+
+
+def redundant_weights(bits, extra=2):
+    """
+    Веса шагов избыточного SAR с основанием меньше 2
+
+    Вместо bits шагов с весами 2^k делается bits + extra шагов с весами
+    r^k, r < 2. Шаги перекрываются: ошибка решения на шаге i, если вход
+    был ближе к тестовому значению, чем на sum(w[i+1:]) - w[i] МЗР,
+    исправляется следующими шагами.
+
+    Returns:
+        list: Веса шагов в МЗР, начиная с первого
+    """
+    steps = bits + extra
+    target = 1 << (bits - 1)
+
+    def make(radix):
+        return [max(1, math.floor(radix ** (steps - 1 - i))) for i in range(steps)]
+
+    # Наименьшее основание, при котором шаги еще покрывают всю шкалу
+    low, high = 1.0, 2.0
+    for _ in range(50):
+        radix = (low + high) / 2
+        if sum(make(radix)) >= target:
+            high = radix
+        else:
+            low = radix
+    weights = make(high)
+
+    max_value = (1 << bits) - 1
+    if any(_redundant_result(n, weights, bits) != n for n in range(max_value + 1)):
+        raise ValueError(f"Веса {weights} не покрывают шкалу {bits} бит, увеличьте extra")
+    return weights
+
+
+class R2R_ADC:
+    def __init__(self, dynamic_range, compare_time=0.001, bits_gpio=DAC_PINS, comp_gpio=COMP_PIN,
+                 algorithm="sar", self_test=None, verbose=False, gpio=None, sleep=None,
+                 vote_reads=1, vote_margin=2, redundancy=2, tracer=None, comp_taps=None):
+        """
+        Конструктор класса R2R_ADC
+
+        Args:
+            dynamic_range (float): Динамический диапазон ЦАП в Вольтах
+            compare_time (float): Время установления ЦАП перед чтением компаратора, с
+            bits_gpio (sequence): Пины ЦАП, начиная со старшего бита
+            comp_gpio (int or sequence): Пин компаратора или список пинов нескольких компараторов;
+                                         первый - основной, его используют все алгоритмы, кроме "subranging"
+                                         и многоканального multichannel_counting_adc()
+            algorithm (str): Алгоритм по умолчанию для get_number(): "sar", "counting", "redundant"
+                             или "subranging" (несколько компараторов)
+            self_test (str): Проверка компаратора при запуске: None, "short", "full"
+                             или "quick" (быстрая, результат запоминается до перезагрузки)
+            verbose (bool): Флаг отладочного вывода
+            gpio: Модуль с интерфейсом RPi.GPIO (по умолчанию - сам RPi.GPIO)
+            sleep (callable): Функция ожидания (по умолчанию - time.sleep)
+            vote_reads (int): Максимум чтений компаратора для спорного бита SAR (1 - без голосования)
+            vote_margin (int): Насколько близко (в МЗР) к прошлому результату бит считается спорным
+            redundancy (int): Число дополнительных шагов избыточного SAR
+            tracer (labkit.trace.ConversionTracer): Запись времени каждого шага (None - без трассировки)
+            comp_taps (sequence): Для каждого пина компаратора (gain, offset): он сравнивает вход
+                                  с gain * U_ЦАП + offset (offset в Вольтах); по умолчанию (1, 0)
+        """
+        if vote_reads < 1 or vote_reads % 2 == 0:
+            raise ValueError("vote_reads должно быть нечетным положительным числом")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Неизвестный алгоритм АЦП: {algorithm}, доступны: {ALGORITHMS}")
+
+        self.dynamic_range = dynamic_range
+        self.compare_time = compare_time
+        self.bits_gpio = list(bits_gpio)
+        self.comp_pins = [comp_gpio] if isinstance(comp_gpio, int) else list(comp_gpio)
+        self.comp_gpio = self.comp_pins[0]
+        self.comp_taps = [(1.0, 0.0)] * len(self.comp_pins) if comp_taps is None else list(comp_taps)
+        if len(self.comp_taps) != len(self.comp_pins):
+            raise ValueError("comp_taps нужно задать для каждого пина компаратора")
+        self.algorithm = algorithm
+        self.verbose = verbose
+        self.vote_reads = vote_reads
+        self.vote_margin = vote_margin
+        self.last_number = None
+        self.tracer = tracer
+        # Результат быстрой самопроверки запоминается только для настоящего RPi.GPIO
+        self._gpio_injected = gpio is not None
+        self.gpio = gpio if gpio is not None else _load_gpio()
+        self.sleep = sleep if sleep is not None else time.sleep
+
+        self.bits = len(self.bits_gpio)
+        self.max_value = (1 << self.bits) - 1
+        # Уровни всех пинов ЦАП для каждого числа: одна запись GPIO.output на число
+        self._levels = [tuple((number >> (self.bits - 1 - i)) & 1 for i in range(self.bits))
+                        for number in range(self.max_value + 1)]
+        self._active = False
+
+        # Избыточный SAR: веса шагов и время установления перед каждым шагом.
+        # Постоянная времени ЦАП считается такой, что скачок на всю шкалу за
+        # compare_time устанавливается до 0.5 МЗР, как нужно бинарному SAR.
+        # Шагу i достаточно установиться до своего запаса на исправление,
+        # шаги без запаса устанавливаются до 0.1 МЗР.
+        self.redundant_weights = redundant_weights(self.bits, redundancy)
+        tau = compare_time / math.log(2 * self.max_value)
+        self.redundant_settle = []
+        jump = self.max_value
+        for i, weight in enumerate(self.redundant_weights):
+            allowed = max(sum(self.redundant_weights[i + 1:]) - weight, 0.1)
+            self.redundant_settle.append(min(max(tau * math.log(jump / allowed), 0.0), compare_time))
+            jump = weight + allowed
+
+        # Многокомпараторный SAR: для каждого числа ЦАП - границы результата,
+        # которые дает ответ каждого компаратора: (пин, нижняя при 0, верхняя при 1)
+        code_scale = self.max_value / dynamic_range
+        self._subrange_bounds = []
+        for number in range(self.max_value + 1):
+            thresholds = [gain * number + offset * code_scale for gain, offset in self.comp_taps]
+            self._subrange_bounds.append(tuple((pin, math.floor(t), math.ceil(t) - 1)
+                                               for pin, t in zip(self.comp_pins, thresholds)))
+        self._subrange_plan = {}
+
+        self.gpio.setmode(self.gpio.BCM)
+        self.gpio.setup(self.bits_gpio, self.gpio.OUT, initial=0)
+        self.gpio.setup(self.comp_pins if len(self.comp_pins) > 1 else self.comp_gpio, self.gpio.IN)
+        self._active = True
+
+        if self.verbose:
+            print(f"Пины ЦАП: {self.bits_gpio}")
+            print(f"Пин компаратора: {self.comp_gpio}")
+
+        if self_test == "short":
+            self.test_comparator((0, self.max_value))
+        elif self_test == "full":
+            self.test_comparator()
+        elif self_test == "quick":
+            self.quick_self_test()
+        elif self_test is not None:
+            raise ValueError(f"Неизвестный режим самопроверки: {self_test}")
+
+    def deinit(self):
+        """Выставляет 0 на выход ЦАП и очищает настройки GPIO"""
+        if self._active:
+            self._active = False
+            self.gpio.output(self.bits_gpio, 0)
+            self.gpio.cleanup()
+
+    def __del__(self):
+        """Деструктор - вызывает deinit(), если его не вызвали явно"""
+        if getattr(self, "_active", False):
+            self.deinit()
+
+    def number_to_dac(self, number):
+        """Подает число number на вход ЦАП"""
+        self.gpio.output(self.bits_gpio, self._levels[number])
+
+    def test_comparator(self, test_values=None):
+        """Тестирует работу компаратора на нескольких значениях ЦАП"""
+        if test_values is None:
+            test_values = range(0, self.max_value + 1, (self.max_value + 1) // 8)
+            test_values = list(test_values) + [self.max_value]
+
+        print("\n=== ТЕСТИРОВАНИЕ КОМПАРАТОРА ===")
+        states = []
+        for val in test_values:
+            self.number_to_dac(val)
+            self.sleep(0.1)  # Даем время на установление напряжения
+            comp_state = self.gpio.input(self.comp_gpio)
+            states.append(comp_state)
+            voltage = (val / self.max_value) * self.dynamic_range
+            print(f"ЦАП={val:3d} ({voltage:.2f} В) -> Компаратор: {comp_state}")
+        print("=== ТЕСТ ЗАВЕРШЕН ===\n")
+        return states
+
+    def _settled_compare(self, number, max_wait=0.02):
+        """Состояние компаратора для числа number: ждет, пока два чтения подряд не совпадут"""
+        self.number_to_dac(number)
+        wait = max(self.compare_time, 1e-5)
+        waited = wait
+        self.sleep(wait)
+        state = self.gpio.input(self.comp_gpio)
+        while waited < max_wait:
+            self.sleep(wait)
+            waited += wait
+            again = self.gpio.input(self.comp_gpio)
+            if again == state:
+                break
+            state = again
+            wait *= 2
+        return state
+
+    def quick_self_test(self, use_cache=True):
+        """
+        Быстрая проверка полярности компаратора и монотонности ЦАП
+
+        На полной шкале компаратор должен выдавать 1. Затем бинарным поиском
+        находится порог входного напряжения, и для каждого бита проверяется,
+        что число выше порога на вес бита дает 1, а ниже - 0. Ожидание после
+        смены числа - от compare_time, пока компаратор не перестанет меняться.
+        Успешный результат запоминается до перезагрузки (self_test_cache_path);
+        для подставленного модуля gpio (симулятор) - не запоминается.
+
+        Raises:
+            RuntimeError: Если проверка не пройдена
+        """
+        path = None
+        if use_cache and not self._gpio_injected:
+            path = self_test_cache_path(self.bits_gpio, self.comp_pins, self.comp_taps, self.dynamic_range)
+        if path is not None and os.path.exists(path):
+            if self.verbose:
+                print("Самопроверка уже пройдена после загрузки")
+            return
+
+        if self._settled_compare(self.max_value) != 1:
+            if self._settled_compare(0) == 1:
+                raise RuntimeError("Компаратор выдает 1 при нуле ЦАП и 0 на полной шкале: "
+                                   "перепутана полярность компаратора")
+            raise RuntimeError("Компаратор выдает 0 на всей шкале ЦАП: входное напряжение выше "
+                               f"диапазона {self.dynamic_range} В, нет питания ЦАП или компаратор не подключен")
+        threshold = 0
+        for bit in range(self.bits - 1, -1, -1):
+            candidate = threshold | (1 << bit)
+            if self._settled_compare(candidate) == 0:
+                threshold = candidate
+
+        failed = []
+        for bit in range(self.bits):
+            step = (1 << bit) + 1
+            if threshold + step <= self.max_value and self._settled_compare(threshold + step) != 1:
+                failed.append(threshold + step)
+            if threshold - step >= 0 and self._settled_compare(threshold - step) != 0:
+                failed.append(threshold - step)
+        self.number_to_dac(0)
+        if failed:
+            raise RuntimeError(f"ЦАП немонотонен около порога {threshold}: неверный ответ компаратора "
+                               f"для чисел {failed} - проверьте пины {self.bits_gpio}")
+
+        if self.verbose:
+            print(f"Самопроверка пройдена, порог входа: {threshold}")
+        if path is not None:
+            try:
+                with open(path, "w") as f:
+                    f.write(f"{threshold}\n")
+            except OSError:
+                pass
+
+    def sequential_counting_adc(self):
+        """Последовательный счетный АЦП"""
+        levels = self._levels
+        output = self.gpio.output
+        read = self.gpio.input
+        bits_gpio = self.bits_gpio
+        comp_gpio = self.comp_gpio
+        compare_time = self.compare_time
+        sleep = self.sleep
+        tracer = self.tracer
+        if tracer is not None:
+            conversion_start = t = tracer.clock()
+
+        for number in range(self.max_value + 1):
+            output(bits_gpio, levels[number])
+            if tracer is not None:
+                t = tracer.mark(DAC, t, number)
+            if compare_time:
+                sleep(compare_time)
+                if tracer is not None:
+                    t = tracer.mark(SETTLE, t)
+
+            # 0 = U_DAC < U_ADC, 1 = U_DAC > U_ADC
+            comparator_state = read(comp_gpio)
+            if tracer is not None:
+                t = tracer.mark(COMPARE, t, comparator_state)
+
+            if self.verbose:
+                print(f"Number: {number}, Binary: {number:0{self.bits}b}, Comparator: {comparator_state}")
+                if tracer is not None:
+                    t = tracer.mark(PRINT, t)
+
+            # Если напряжение на ЦАП превысило входное напряжение
+            if comparator_state == 1:
+                if tracer is not None:
+                    tracer.mark(CONVERSION, conversion_start, number)
+                return number
+
+        # Если не превысило - возвращаем максимальное значение
+        if tracer is not None:
+            tracer.mark(CONVERSION, conversion_start, self.max_value)
+        return self.max_value
+
+    # Быстрый последовательный АЦП - тот же счетный алгоритм
+    fast_sequential_adc = sequential_counting_adc
+
+    def multichannel_counting_adc(self):
+        """
+        Счетный АЦП на несколько входов с общей пилой ЦАП
+
+        На каждом компараторе из comp_gpio - свой входной сигнал. На каждом
+        шаге пилы читаются компараторы еще не измеренных каналов; код канала
+        запоминается на шаге, где его компаратор переключился в 1. Пила
+        останавливается, когда измерены все каналы, так что N каналов
+        занимают время одного прохода, а не N.
+
+        Returns:
+            list: Коды каналов в порядке comp_gpio
+        """
+        levels = self._levels
+        output = self.gpio.output
+        read = self.gpio.input
+        bits_gpio = self.bits_gpio
+        pins = self.comp_pins
+        compare_time = self.compare_time
+        sleep = self.sleep
+        tracer = self.tracer
+        if tracer is not None:
+            conversion_start = t = tracer.clock()
+
+        results = [self.max_value] * len(pins)
+        pending = list(range(len(pins)))
+        for number in range(self.max_value + 1):
+            output(bits_gpio, levels[number])
+            if tracer is not None:
+                t = tracer.mark(DAC, t, number)
+            if compare_time:
+                sleep(compare_time)
+                if tracer is not None:
+                    t = tracer.mark(SETTLE, t)
+
+            still_pending = []
+            for channel in pending:
+                if read(pins[channel]):
+                    results[channel] = number
+                else:
+                    still_pending.append(channel)
+            if tracer is not None:
+                t = tracer.mark(COMPARE, t, len(pending) - len(still_pending))
+
+            if self.verbose and len(still_pending) != len(pending):
+                print(f"Number: {number}, измерено каналов: {len(pins) - len(still_pending)} из {len(pins)}")
+                if tracer is not None:
+                    t = tracer.mark(PRINT, t)
+
+            pending = still_pending
+            if not pending:
+                break
+
+        if tracer is not None:
+            tracer.mark(CONVERSION, conversion_start, number)
+        return results
+
+    def get_channel_voltages(self):
+        """Напряжения всех каналов comp_gpio за один проход пилы, В"""
+        scale = self.dynamic_range / self.max_value
+        return [number * scale for number in self.multichannel_counting_adc()]
+
+    def _vote(self, first):
+        """
+        Уточняет спорное решение компаратора голосованием
+
+        Второе чтение делается всегда; если оно совпало с первым, решение
+        принято. Иначе читаем дальше, пока одно из значений не наберет
+        большинство из vote_reads.
+        """
+        read = self.gpio.input
+        comp_gpio = self.comp_gpio
+        ones = first + read(comp_gpio)
+        reads = 2
+        if ones != 1:
+            return first
+        majority = self.vote_reads // 2 + 1
+        while reads < self.vote_reads and ones < majority and reads - ones < majority:
+            ones += read(comp_gpio)
+            reads += 1
+        return 1 if ones * 2 > reads else 0
+
+    def successive_approximation_adc(self):
+        """
+        Реализует алгоритм бинарного поиска напряжения на входе АЦП
+
+        При vote_reads > 1 биты, чье тестовое значение отличается от прошлого
+        результата не больше чем на vote_margin, решаются голосованием
+        нескольких чтений компаратора; остальные - одним чтением.
+        """
+        levels = self._levels
+        output = self.gpio.output
+        read = self.gpio.input
+        bits_gpio = self.bits_gpio
+        comp_gpio = self.comp_gpio
+        compare_time = self.compare_time
+        sleep = self.sleep
+        last = self.last_number if self.vote_reads > 1 else None
+        margin = self.vote_margin
+        tracer = self.tracer
+        if tracer is not None:
+            conversion_start = t = tracer.clock()
+
+        result = 0
+        # Маска для установки битов, начиная со старшего
+        bit_mask = 1 << (self.bits - 1)
+
+        while bit_mask:
+            test_value = result | bit_mask
+            output(bits_gpio, levels[test_value])
+            if tracer is not None:
+                t = tracer.mark(DAC, t, test_value)
+            if compare_time:
+                sleep(compare_time)
+                if tracer is not None:
+                    t = tracer.mark(SETTLE, t)
+
+            comp_state = read(comp_gpio)
+            if last is not None and -margin <= test_value - last <= margin:
+                comp_state = self._vote(comp_state)
+            if tracer is not None:
+                t = tracer.mark(COMPARE, t, comp_state)
+
+            if self.verbose:
+                voltage = (test_value / self.max_value) * self.dynamic_range
+                print(f"Тестовое значение: {test_value:3d} ({voltage:.2f} В) -> Компаратор: {comp_state}")
+                if tracer is not None:
+                    t = tracer.mark(PRINT, t)
+
+            if comp_state == 0:
+                # U_DAC < U_ADC - оставляем бит установленным
+                result = test_value
+
+            bit_mask >>= 1
+
+        if self.verbose:
+            print(f"Результат SAR: {result}")
+        if tracer is not None:
+            tracer.mark(CONVERSION, conversion_start, result)
+
+        self.last_number = result
+        return result
+
+    def redundant_sar_adc(self):
+        """
+        Избыточный SAR: шагов больше, чем бит, веса шагов перекрываются
+
+        Ранние шаги ждут установления ЦАП меньше compare_time: неверное
+        решение на них, вызванное недоустановлением, исправляют следующие
+        шаги. Последние шаги ждут почти полное время.
+        """
+        levels = self._levels
+        output = self.gpio.output
+        read = self.gpio.input
+        bits_gpio = self.bits_gpio
+        comp_gpio = self.comp_gpio
+        sleep = self.sleep
+        max_value = self.max_value
+        tracer = self.tracer
+        if tracer is not None:
+            conversion_start = t = tracer.clock()
+
+        target = 1 << (self.bits - 1)
+        for weight, settle in zip(self.redundant_weights, self.redundant_settle):
+            test_value = min(max(target, 0), max_value)
+            output(bits_gpio, levels[test_value])
+            if tracer is not None:
+                t = tracer.mark(DAC, t, test_value)
+            if settle:
+                sleep(settle)
+                if tracer is not None:
+                    t = tracer.mark(SETTLE, t)
+
+            comp_state = read(comp_gpio)
+            if tracer is not None:
+                t = tracer.mark(COMPARE, t, comp_state)
+
+            if self.verbose:
+                voltage = (test_value / self.max_value) * self.dynamic_range
+                print(f"Тестовое значение: {test_value:3d} ({voltage:.2f} В), шаг {weight} -> Компаратор: {comp_state}")
+                if tracer is not None:
+                    t = tracer.mark(PRINT, t)
+
+            # U_DAC < U_ADC - идем вверх, иначе вниз
+            target = target + weight if comp_state == 0 else target - weight
+
+        result = test_value if comp_state == 0 else test_value - 1
+        result = max(result, 0)
+        if self.verbose:
+            print(f"Результат избыточного SAR: {result}")
+        if tracer is not None:
+            tracer.mark(CONVERSION, conversion_start, result)
+
+        self.last_number = result
+        return result
+
+    def _plan_subrange(self, low, high):
+        """
+        Число ЦАП для следующего шага, когда результат лежит в [low, high]
+
+        Перебираются все числа; выбирается то, после которого худший из
+        возможных интервалов результата самый узкий (при равенстве - с
+        наименьшей средней шириной). Ответ запоминается: интервалы на пути
+        преобразования повторяются, и перебор делается один раз на интервал.
+        """
+        best_key = None
+        best_number = None
+        for number, bounds in enumerate(self._subrange_bounds):
+            # Пороги компараторов делят вход на участки; у каждого свой интервал результата
+            cuts = sorted((floor, ceil_minus_one) for _, floor, ceil_minus_one in bounds)
+            widths = []
+            region_low = low
+            for floor, ceil_minus_one in cuts:
+                region_high = min(high, ceil_minus_one)
+                if region_low <= region_high:
+                    widths.append(region_high - region_low + 1)
+                region_low = max(low, floor)
+            if region_low <= high:
+                widths.append(high - region_low + 1)
+            key = (max(widths), sum(w * w for w in widths))
+            if key[0] <= high - low and (best_key is None or key < best_key):
+                best_key, best_number = key, number
+        if best_number is None:
+            raise ValueError(f"Компараторы с comp_taps={self.comp_taps} не различают числа {low}..{high}")
+        self._subrange_plan[low, high] = best_number
+        return best_number
+
+    def subranging_adc(self):
+        """
+        SAR с несколькими компараторами (подинтервальный АЦП)
+
+        На каждом шаге ЦАП выставляется один раз, и читаются все компараторы:
+        их пороги gain * U_ЦАП + offset делят интервал возможного результата
+        на несколько частей сразу, так что шаг дает больше одного бита.
+        """
+        levels = self._levels
+        output = self.gpio.output
+        read = self.gpio.input
+        bits_gpio = self.bits_gpio
+        compare_time = self.compare_time
+        sleep = self.sleep
+        plan = self._subrange_plan
+        subrange_bounds = self._subrange_bounds
+        tracer = self.tracer
+        if tracer is not None:
+            conversion_start = t = tracer.clock()
+
+        low, high = 0, self.max_value
+        while low < high:
+            test_value = plan.get((low, high))
+            if test_value is None:
+                test_value = self._plan_subrange(low, high)
+            output(bits_gpio, levels[test_value])
+            if tracer is not None:
+                t = tracer.mark(DAC, t, test_value)
+            if compare_time:
+                sleep(compare_time)
+                if tracer is not None:
+                    t = tracer.mark(SETTLE, t)
+
+            states = 0
+            for pin, floor, ceil_minus_one in subrange_bounds[test_value]:
+                states <<= 1
+                if read(pin):
+                    # Порог выше входа
+                    states |= 1
+                    if ceil_minus_one < high:
+                        high = ceil_minus_one
+                elif floor > low:
+                    low = floor
+            if tracer is not None:
+                t = tracer.mark(COMPARE, t, states)
+
+            if self.verbose:
+                print(f"Тестовое значение: {test_value:3d} -> Компараторы: {states:0{len(self.comp_pins)}b}, "
+                      f"интервал {low}..{high}")
+                if tracer is not None:
+                    t = tracer.mark(PRINT, t)
+
+        # Противоречивые ответы (шум) могут дать low > high
+        result = min(low, self.max_value)
+        if tracer is not None:
+            tracer.mark(CONVERSION, conversion_start, result)
+        self.last_number = result
+        return result
+
+    def _converter(self, algorithm=None):
+        algorithm = algorithm or self.algorithm
+        if algorithm == "sar":
+            return self.successive_approximation_adc
+        if algorithm == "redundant":
+            return self.redundant_sar_adc
+        if algorithm == "subranging":
+            return self.subranging_adc
+        return self.sequential_counting_adc
+
+    def get_number(self, algorithm=None):
+        """Измеряет число выбранным алгоритмом (по умолчанию - заданным в конструкторе)"""
+        return self._converter(algorithm)()
+
+    def read_into(self, codes_buf, ts_buf, algorithm=None, clock=time.monotonic_ns):
+        """
+        Заполняет буферы кодами и метками времени на месте
+
+        Буферы - memoryview, array или numpy (uint16 и int64) любой длины;
+        их можно переиспользовать, например, срезы кольцевого буфера.
+        Метка времени (clock(), нс) берется после каждого измерения.
+
+        Returns:
+            int: Сколько отсчетов записано (по длине меньшего буфера)
+        """
+        convert = self._converter(algorithm)
+        count = min(len(codes_buf), len(ts_buf))
+        for i in range(count):
+            codes_buf[i] = convert()
+            ts_buf[i] = clock()
+        return count
+
+    def get_voltage(self, algorithm=None):
+        """Возвращает измеренное напряжение в Вольтах"""
+        return self.get_number(algorithm) / self.max_value * self.dynamic_range
+
+    def get_timed_voltage(self, algorithm=None):
+        """Возвращает измеренное напряжение в Вольтах и время измерения в секундах"""
+        start = time.perf_counter()
+        number = self.get_number(algorithm)
+        measurement_time = time.perf_counter() - start
+        return number / self.max_value * self.dynamic_range, measurement_time
+
+    def get_sc_voltage(self):
+        """Возвращает напряжение, измеренное счетным АЦП"""
+        return self.get_voltage("counting")
+
+    def get_sar_voltage(self):
+        """Возвращает напряжение, измеренное алгоритмом бинарного поиска"""
+        return self.get_voltage("sar")
@@ -0,0 +1,237 @@
+"""
+Оценка постоянной времени RC-цепочки по записи заряда и разряда
+
+Запись делится на события: участок от начала роста (заряд) или спада
+(разряд) до начала следующего. На каждом участке подбирается
+v(t) = v_inf + (v_start - v_inf) * exp(-(t - t_start) / tau).
+
+При известной асимптоте v_inf логарифм ln|v_inf - v| линеен по времени,
+и tau находится линейным МНК. Асимптота неизвестна, поэтому перебирается
+сетка кандидатов за пределами данных: все прямые МНК считаются одной
+операцией numpy (кандидаты x отсчеты), выбирается кандидат с наименьшей
+ошибкой в Вольтах, затем сетка сужается вокруг него.
+
+IncrementalRCFitter делает то же по мере поступления отсчетов и выдает
+результат, как только кривая установилась.
+"""
+import collections
+
+import numpy as np
+
+# Результат подбора: "charge" или "discharge", начало участка (с), tau (с),
+# асимптота и начальное напряжение (В), СКО остатков (В), число отсчетов
+RCFit = collections.namedtuple("RCFit", "kind t_start tau v_inf v_start rms points")
+
+
+def _scan(t, v, direction, candidates):
+    """Взвешенный МНК для ln|v_inf - v| сразу для всех кандидатов v_inf; возвращает (sse, a, b)"""
+    gap = direction * (candidates[:, None] - v[None, :])
+    y = np.log(gap)
+    # Вес gap^2 выравнивает вклад отсчетов: ошибка логарифма ~ шум / gap
+    w = gap ** 2
+    sw = w.sum(axis=1)
+    st = (w * t).sum(axis=1)
+    sy = (w * y).sum(axis=1)
+    stt = (w * t * t).sum(axis=1)
+    sty = (w * t * y).sum(axis=1)
+    det = sw * stt - st * st
+    b = (sw * sty - st * sy) / det
+    a = (sy - b * st) / sw
+    model = candidates[:, None] - direction * np.exp(a[:, None] + b[:, None] * t[None, :])
+    sse = ((model - v[None, :]) ** 2).sum(axis=1)
+    return sse, a, b
+
+
+def fit_exponential(t, v, direction=None, candidates=64, refinements=2):
+    """
+    Подбирает экспоненту к одному участку заряда или разряда
+
+    Args:
+        t (array): Время, с
+        v (array): Напряжение, В
+        direction (int): +1 - заряд (рост), -1 - разряд, None - по данным
+        candidates (int): Размер сетки асимптот на каждом проходе
+        refinements (int): Сколько раз сужать сетку вокруг лучшего кандидата
+
+    Returns:
+        RCFit или None, если участок слишком короткий или не экспоненциальный
+    """
+    t = np.asarray(t, dtype=float)
+    v = np.asarray(v, dtype=float)
+    if len(t) < 4:
+        return None
+    if direction is None:
+        direction = 1 if v[-1] >= v[0] else -1
+    t0 = t[0]
+    tr = t - t0
+
+    span = max(float(np.ptp(v)), 1e-9)
+    extreme = v.max() if direction > 0 else v.min()
+    # Асимптота - за крайним отсчетом, от почти вплотную до двух размахов
+    offsets = span * np.geomspace(1e-4, 2.0, candidates)
+    best = None
+    for _ in range(refinements + 1):
+        grid = extreme + direction * offsets
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            sse, a, b = _scan(tr, v, direction, grid)
+        sse = np.where(np.isfinite(sse) & (b < 0), sse, np.inf)
+        i = int(np.argmin(sse))
+        if not np.isfinite(sse[i]):
+            return None
+        best = (grid[i], a[i], b[i], sse[i])
+        low = offsets[max(i - 1, 0)]
+        high = offsets[min(i + 1, len(offsets) - 1)]
+        offsets = np.linspace(low, high, candidates)
+
+    v_inf, a, b, sse = best
+    v_start = v_inf - direction * np.exp(a)
+    return RCFit("charge" if direction > 0 else "discharge", float(t0), float(-1.0 / b), float(v_inf),
+                 float(v_start), float(np.sqrt(sse / len(t))), len(t))
+
+
+def _event_start(window, direction, threshold):
+    """
+    Индекс начала события в окне обнаружения
+
+    Окно начинается еще на полке: событие начинается с последнего отсчета,
+    отошедшего от первого меньше чем на threshold / 2 в сторону движения.
+    """
+    moved = direction * (np.asarray(window, dtype=float) - window[0])
+    return int(np.flatnonzero(moved <= threshold / 2)[-1])
+
+
+def segment(t, v, threshold=None, smooth=5):
+    """
+    Делит запись на участки заряда и разряда
+
+    Args:
+        threshold (float): Изменение за smooth отсчетов, считающееся движением, В
+                           (по умолчанию - 5 % размаха записи)
+        smooth (int): Окно сглаживания производной, отсчетов
+
+    Returns:
+        list: [(начальный индекс, конечный индекс (не включая), направление +1/-1), ...]
+    """
+    v = np.asarray(v, dtype=float)
+    if len(v) <= smooth:
+        return []
+    if threshold is None:
+        threshold = 0.05 * float(np.ptp(v))
+    change = v[smooth:] - v[:-smooth]
+    state = np.where(change > threshold, 1, np.where(change < -threshold, -1, 0))
+
+    # Начало участка - первый отсчет серии движения в новую сторону
+    moving = np.flatnonzero(state)
+    if not len(moving):
+        return []
+    directions = state[moving]
+    new = np.concatenate(([True], directions[1:] != directions[:-1]))
+    dirs = directions[new]
+    starts = np.array([_event_start(v[s:s + smooth + 1], d, threshold) + s for s, d in zip(moving[new], dirs)])
+    ends = np.concatenate((starts[1:], [len(v)]))
+    return [(int(s), int(e), int(d)) for s, e, d in zip(starts, ends, dirs)]
+
+
+def fit_capture(t, v, threshold=None, smooth=5, min_points=8):
+    """Подбирает экспоненты ко всем участкам записи; возвращает список RCFit"""
+    t = np.asarray(t, dtype=float)
+    v = np.asarray(v, dtype=float)
+    fits = []
+    for start, end, direction in segment(t, v, threshold, smooth):
+        if end - start >= min_points:
+            fit = fit_exponential(t[start:end], v[start:end], direction)
+            if fit is not None:
+                fits.append(fit)
+    return fits
+
+
+class IncrementalRCFitter:
+    def __init__(self, threshold=0.1, settle_band=0.05, settle_points=10, smooth=5):
+        """
+        Args:
+            threshold (float): Изменение за smooth отсчетов, с которого начинается новое событие, В
+            settle_band (float): Кривая установилась, если последние settle_points
+                                 отсчетов лежат в полосе такой ширины, В
+            settle_points (int): Сколько отсчетов проверять на установление
+            smooth (int): Окно для обнаружения начала события, отсчетов
+        """
+        self.threshold = threshold
+        self.settle_band = settle_band
+        self.settle_points = settle_points
+        self.smooth = smooth
+        self.t = []
+        self.v = []
+        self.direction = 0
+        self.reported = False
+        self.results = []
+
+    def add(self, t, v):
+        """
+        Добавляет отсчет
+
+        Returns:
+            RCFit: Результат, если текущее событие только что установилось, иначе None
+        """
+        self.t.append(t)
+        self.v.append(v)
+        n = len(self.v)
+        if n > self.smooth:
+            change = v - self.v[-1 - self.smooth]
+            direction = 1 if change > self.threshold else -1 if change < -self.threshold else 0
+            if direction and direction != self.direction:
+                # Новое событие: отбрасываем все до его начала
+                begin = n - 1 - self.smooth + _event_start(self.v[-1 - self.smooth:], direction, self.threshold)
+                del self.t[:begin]
+                del self.v[:begin]
+                self.direction = direction
+                self.reported = False
+                return None
+
+        if self.direction and not self.reported and len(self.v) >= self.smooth + self.settle_points:
+            tail = self.v[-self.settle_points:]
+            if max(tail) - min(tail) <= self.settle_band:
+                self.reported = True
+                fit = fit_exponential(self.t, self.v, self.direction)
+                if fit is not None:
+                    self.results.append(fit)
+                return fit
+        return None
+
+
+def print_fit(fit):
+    name = "Заряд" if fit.kind == "charge" else "Разряд"
+    print(f"{name} с {fit.t_start:7.3f} с: tau = {fit.tau * 1e3:8.2f} мс, "
+          f"{fit.v_start:.3f} В -> {fit.v_inf:.3f} В, СКО {fit.rms * 1e3:.1f} мВ, отсчетов {fit.points}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from labkit import sim
+
+    parser = argparse.ArgumentParser(description="Постоянная времени RC-цепочки в симуляторе")
+    parser.add_argument("--tau", type=float, default=0.2, help="Постоянная времени модели, с")
+    parser.add_argument("--period", type=float, default=2.0, help="Период прямоугольника на входе RC, с")
+    parser.add_argument("--noise", type=float, default=0.005, help="Шум компаратора, В")
+    parser.add_argument("--duration", type=float, default=6.0, help="Продолжительность записи, с")
+    args = parser.parse_args()
+
+    simulator = sim.SimulatedGPIO(sim.rc_signal(3.0, args.tau, args.period), noise=args.noise)
+    adc = simulator.make_adc(compare_time=0.0)
+    fitter = IncrementalRCFitter()
+    times, voltages = [], []
+    print("По ходу записи:")
+    while simulator.clock < args.duration:
+        t = simulator.clock
+        voltage = adc.get_voltage()
+        times.append(t)
+        voltages.append(voltage)
+        fit = fitter.add(t, voltage)
+        if fit is not None:
+            print_fit(fit)
+        simulator.sleep(0.005)
+    adc.deinit()
+
+    print("По всей записи:")
+    for fit in fit_capture(times, voltages):
+        print_fit(fit)
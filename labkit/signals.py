@@ -0,0 +1,26 @@
+import math
+import time
+
+
+def get_sin_wave_amplitude(freq, time):
+    """Нормированная в диапазон [0, 1] синусоида частоты freq в момент time"""
+    sin_value = math.sin(2 * math.pi * freq * time)
+    return (sin_value + 1) / 2
+
+
+def wait_for_sampling_period(sampling_frequency):
+    if sampling_frequency <= 0:
+        raise ValueError("Частота дискретизации должна быть положительным числом")
+    time.sleep(1.0 / sampling_frequency)
+
+
+def generate_signal(dac, signal_frequency, amplitude, sampling_frequency, duration=None):
+    """Подает на dac синусоиду; при duration=None генерирует бесконечно"""
+    start_time = time.time()
+    end_time = None if duration is None else start_time + duration
+
+    while end_time is None or time.time() < end_time:
+        current_time = time.time() - start_time
+        signal_value = get_sin_wave_amplitude(signal_frequency, current_time) * amplitude
+        dac.set_voltage(signal_value)
+        wait_for_sampling_period(sampling_frequency)
@@ -0,0 +1,290 @@
+import math
+import random
+import sys
+import time
+import types
+
+
+class SimulatedGPIO:
+    """
+    Симулятор R2R-ЦАП с компаратором, повторяющий интерфейс модуля RPi.GPIO
+
+    Компаратор выдает 1, если напряжение ЦАП больше входного напряжения.
+    Время моделируется виртуальными часами: каждое чтение компаратора
+    сдвигает их на trial_time, а sleep() - на время ожидания, поэтому
+    результаты воспроизводимы. При settle_tau > 0 выход ЦАП после смены
+    числа подходит к новому напряжению экспоненциально с этой постоянной
+    времени.
+    """
+    BCM = 11
+    BOARD = 10
+    OUT = 0
+    IN = 1
+    LOW = 0
+    HIGH = 1
+    PUD_OFF = 20
+    PUD_DOWN = 21
+    PUD_UP = 22
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+
+    def __init__(self, signal, dynamic_range=3.3, bits_gpio=(26, 20, 19, 16, 13, 12, 25, 11),
+                 comp_gpio=21, trial_time=1e-4, noise=0.0, seed=0, settle_tau=0.0):
+        """
+        Args:
+            signal (callable): Входное напряжение как функция времени signal(t) в Вольтах
+            dynamic_range (float): Динамический диапазон ЦАП в Вольтах
+            bits_gpio (sequence): Пины ЦАП, начиная со старшего бита
+            comp_gpio (int): Пин компаратора
+            trial_time (float): Виртуальное время одного сравнения в секундах
+            noise (float): СКО шума на входе компаратора в Вольтах
+            seed (int): Зерно генератора шума
+            settle_tau (float): Постоянная времени установления ЦАП в секундах (0 - мгновенно)
+        """
+        self.dynamic_range = dynamic_range
+        self.bits_gpio = list(bits_gpio)
+        self.comp_gpio = comp_gpio
+        self.trial_time = trial_time
+        self.noise = noise
+        self.seed = seed
+        self.settle_tau = settle_tau
+        self.levels = {}
+        self.callbacks = {}
+        # Пин компаратора: (gain, offset) - сравнивает вход с gain * U_ЦАП + offset
+        self.comparators = {comp_gpio: (1.0, 0.0)}
+        # Собственные входные сигналы компараторов (остальные видят signal)
+        self.channel_signals = {}
+        self.reset(signal)
+
+    def reset(self, signal, noise=None):
+        """Задает новый входной сигнал и обнуляет часы и счетчики"""
+        self.signal = signal
+        if noise is not None:
+            self.noise = noise
+        self.rng = random.Random(self.seed)
+        self.clock = 0.0
+        self.input_count = 0
+        self.output_count = 0
+        self.last_true_voltage = signal(0.0)
+        self.last_voltages = {}
+        # Установление ЦАП: (напряжение в момент смены числа, время смены)
+        self._settle_from = (self.dac_target_voltage(), 0.0)
+
+    def install(self):
+        """Подменяет модуль RPi.GPIO симулятором, чтобы скрипты работали без платы"""
+        package = types.ModuleType("RPi")
+        package.GPIO = self
+        sys.modules["RPi"] = package
+        sys.modules["RPi.GPIO"] = self
+        return self
+
+    def sleep(self, seconds):
+        """Замена time.sleep: сдвигает виртуальные часы без реального ожидания"""
+        self.clock += seconds
+
+    def add_comparator(self, channel, gain=1.0, offset=0.0, signal=None):
+        """
+        Добавляет компаратор на пине channel с порогом gain * U_ЦАП + offset (В)
+
+        signal - собственный входной сигнал компаратора (отдельный канал);
+        None - общий сигнал симулятора.
+        """
+        self.comparators[channel] = (gain, offset)
+        if signal is None:
+            self.channel_signals.pop(channel, None)
+        else:
+            self.channel_signals[channel] = signal
+        return self
+
+    def make_adc(self, dynamic_range=None, **kwargs):
+        """Создает R2R_ADC, подключенный к симулятору (со всеми добавленными компараторами)"""
+        from labkit.r2r_adc import R2R_ADC
+        if len(self.comparators) > 1 and "comp_gpio" not in kwargs:
+            kwargs["comp_gpio"] = list(self.comparators)
+            kwargs["comp_taps"] = list(self.comparators.values())
+        kwargs.setdefault("comp_gpio", self.comp_gpio)
+        return R2R_ADC(self.dynamic_range if dynamic_range is None else dynamic_range,
+                       bits_gpio=self.bits_gpio, gpio=self, sleep=self.sleep, **kwargs)
+
+    def setmode(self, mode):
+        pass
+
+    def setwarnings(self, flag):
+        pass
+
+    def setup(self, channel, direction, initial=None, pull_up_down=None):
+        if direction == self.OUT:
+            self.output(channel, 0 if initial is None else initial)
+
+    def cleanup(self, channel=None):
+        pass
+
+    def output(self, channel, value):
+        start_voltage = self.dac_voltage() if self.settle_tau else None
+        if isinstance(channel, (list, tuple)):
+            if isinstance(value, (list, tuple)):
+                for pin, level in zip(channel, value):
+                    self.levels[pin] = int(bool(level))
+            else:
+                for pin in channel:
+                    self.levels[pin] = int(bool(value))
+        else:
+            self.levels[channel] = int(bool(value))
+        self.output_count += 1
+        if start_voltage is not None:
+            self._settle_from = (start_voltage, self.clock)
+
+    def add_event_detect(self, channel, edge, callback=None, bouncetime=None):
+        self.callbacks[channel] = (edge, callback)
+
+    def remove_event_detect(self, channel):
+        self.callbacks.pop(channel, None)
+
+    def drive(self, channel, level):
+        """Задает уровень на входном пине и вызывает обработчик фронта, как прерывание"""
+        old = self.levels.get(channel, 0)
+        self.levels[channel] = int(bool(level))
+        edge, callback = self.callbacks.get(channel, (None, None))
+        if callback is None or old == self.levels[channel]:
+            return
+        if edge == self.BOTH or edge == (self.RISING if level else self.FALLING):
+            callback(channel)
+
+    def dac_code(self):
+        """Число, поданное сейчас на вход ЦАП"""
+        code = 0
+        for pin in self.bits_gpio:
+            code = (code << 1) | self.levels.get(pin, 0)
+        return code
+
+    def dac_target_voltage(self):
+        """Напряжение, к которому придет ЦАП для текущего числа"""
+        max_code = (1 << len(self.bits_gpio)) - 1
+        return self.dac_code() / max_code * self.dynamic_range
+
+    def dac_voltage(self):
+        """Напряжение на выходе ЦАП сейчас, с учетом установления"""
+        target = self.dac_target_voltage()
+        if not self.settle_tau:
+            return target
+        start_voltage, changed_at = self._settle_from
+        return target + (start_voltage - target) * math.exp(-(self.clock - changed_at) / self.settle_tau)
+
+    def input(self, channel):
+        tap = self.comparators.get(channel)
+        if tap is None:
+            return self.levels.get(channel, 0)
+
+        self.input_count += 1
+        self.clock += self.trial_time
+        signal = self.channel_signals.get(channel)
+        if signal is None:
+            voltage = self.last_true_voltage = self.signal(self.clock)
+        else:
+            voltage = signal(self.clock)
+        self.last_voltages[channel] = voltage
+        if self.noise:
+            voltage += self.rng.gauss(0.0, self.noise)
+        gain, offset = tap
+        return 1 if gain * self.dac_voltage() + offset > voltage else 0
+
+
+# Профили входного сигнала для симулятора
+def dc_signal(voltage):
+    """Постоянное напряжение"""
+    return lambda t: voltage
+
+
+def ramp_signal(v_start, v_end, period):
+    """Пилообразный сигнал от v_start до v_end с периодом period"""
+    return lambda t: v_start + (v_end - v_start) * ((t / period) % 1.0)
+
+
+def sine_signal(offset, amplitude, frequency):
+    """Синусоида вокруг offset"""
+    return lambda t: offset + amplitude * math.sin(2 * math.pi * frequency * t)
+
+
+def rc_signal(high, tau, period):
+    """Конденсатор RC-цепочки, на которую подан прямоугольник 0 / high; в момент 0 разряжен"""
+    half = period / 2
+    q = math.exp(-half / tau)
+    settled = high * q / (1 + q)  # Напряжение в начале заряда в установившемся режиме
+
+    def signal(t):
+        n, phase = divmod(t, period)
+        start = settled * (1 - q ** (2 * n))
+        if phase < half:
+            return high + (start - high) * math.exp(-phase / tau)
+        peak = high + (start - high) * q
+        return peak * math.exp(-(phase - half) / tau)
+    return signal
+
+
+class FakeMCP3021:
+    """Модель MCP3021 для FakeSMBus: отдает код входного напряжения signal(t)"""
+
+    def __init__(self, signal, dynamic_range=5.0, clock=None):
+        self.signal = signal
+        self.dynamic_range = dynamic_range
+        self.clock = clock if clock is not None else time.monotonic
+        self.reads = 0
+
+    def read_word_data(self, cmd):
+        self.reads += 1
+        voltage = min(max(self.signal(self.clock()), 0.0), self.dynamic_range)
+        number = int(voltage / self.dynamic_range * 1023)
+        # Обратное преобразование к labkit.mcp3021.decode_word
+        return ((number >> 6) & 0x0F) << 8 | (number & 0x3F) << 2
+
+
+class FakeMCP4725:
+    """Модель MCP4725 для FakeSMBus: запоминает последнее записанное число"""
+
+    def __init__(self):
+        self.number = 0
+        self.writes = 0
+
+    def write_byte_data(self, cmd, value):
+        self.writes += 1
+        self.number = ((cmd & 0x0F) << 8) | value
+
+
+class FakeSMBus:
+    """
+    Шина I2C в памяти с интерфейсом smbus.SMBus
+
+    Устройства подключаются по адресам; обращение к пустому адресу дает
+    OSError, как у настоящей шины. transaction_time моделирует длительность
+    одной транзакции (реальным ожиданием).
+    """
+
+    def __init__(self, devices=None, transaction_time=0.0):
+        self.devices = dict(devices or {})
+        self.transaction_time = transaction_time
+        self.transactions = 0
+        self.closed = False
+
+    def _device(self, address):
+        if self.closed:
+            raise ValueError("Шина I2C закрыта")
+        self.transactions += 1
+        if self.transaction_time:
+            time.sleep(self.transaction_time)
+        device = self.devices.get(address)
+        if device is None:
+            raise OSError(121, "Remote I/O error")
+        return device
+
+    def read_word_data(self, address, cmd):
+        return self._device(address).read_word_data(cmd)
+
+    def write_byte_data(self, address, cmd, value):
+        self._device(address).write_byte_data(cmd, value)
+
+    def read_byte(self, address):
+        return self._device(address).read_word_data(0) >> 8
+
+    def close(self):
+        self.closed = True
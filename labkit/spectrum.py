@@ -0,0 +1,229 @@
+"""
+Спектр и динамические характеристики записей АЦП
+
+Запись - метки времени и значения (из CSV команды acquire или от любого
+драйвера). Неравномерные метки сначала приводятся к равномерной сетке
+линейной интерполяцией. Для синуса известной частоты (например, от
+signal_generator) считаются SNR, SINAD, SFDR и ENOB по стандартной
+методике: мощность основной гармоники, гармоник искажений и остальных
+бинов шума в спектре с окном.
+"""
+import math
+
+import numpy as np
+
+# Половина ширины главного лепестка окна в бинах: столько бинов по обе
+# стороны от пика относятся к одной спектральной линии
+MAIN_LOBE = {"rectangular": 1, "hann": 2, "blackmanharris": 4}
+# Относительный шум double: ниже eps^2 от мощности сигнала шум и
+# искажения не различимы, а у идеального синуса бывают ровно нулевыми
+POWER_FLOOR = np.finfo(float).eps ** 2
+
+
+def window(name, n):
+    """Окно длины n: rectangular, hann или blackmanharris (4 члена, -92 дБ)"""
+    if name == "rectangular":
+        return np.ones(n)
+    k = np.arange(n) * (2 * math.pi / n)
+    if name == "hann":
+        return 0.5 - 0.5 * np.cos(k)
+    if name == "blackmanharris":
+        return 0.35875 - 0.48829 * np.cos(k) + 0.14128 * np.cos(2 * k) - 0.01168 * np.cos(3 * k)
+    raise ValueError(f"Неизвестное окно: {name}, доступны: {tuple(MAIN_LOBE)}")
+
+
+def to_uniform(times, values, rate=None, tolerance=0.01):
+    """
+    Приводит запись к равномерной сетке времени
+
+    Если разброс интервалов меньше tolerance от медианного, значения
+    возвращаются как есть; иначе они интерполируются на сетку с частотой
+    rate (по умолчанию - по медианному интервалу).
+
+    Returns:
+        tuple: (np.ndarray значений, частота дискретизации в Гц)
+    """
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if len(times) < 2:
+        raise ValueError(f"Для спектра нужно хотя бы 2 отсчета, в записи {len(times)}")
+    intervals = np.diff(times)
+    median = float(np.median(intervals))
+    if rate is None and np.max(np.abs(intervals - median)) <= tolerance * median:
+        return values, 1.0 / median
+
+    rate = 1.0 / median if rate is None else rate
+    grid = times[0] + np.arange(int((times[-1] - times[0]) * rate) + 1) / rate
+    return np.interp(grid, times, values), rate
+
+
+def power_spectrum(values, rate, window_name="blackmanharris"):
+    """
+    Односторонний спектр мощности с окном
+
+    Нормирован так, что синус амплитуды A дает в сумме бинов своего
+    лепестка A^2 / 2, а сумма всех бинов (кроме нулевого) - дисперсию.
+
+    Returns:
+        tuple: (np.ndarray частот, np.ndarray мощности в каждом бине)
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    w = window(window_name, n)
+    spectrum = np.fft.rfft((values - values.mean()) * w)
+    power = np.abs(spectrum) ** 2 / (np.sum(w ** 2) * n)
+    power[1:] *= 2
+    if n % 2 == 0:
+        power[-1] /= 2
+    return np.fft.rfftfreq(n, 1.0 / rate), power
+
+
+def welch(values, rate, segment=256, overlap=0.5, window_name="hann"):
+    """
+    Спектральная плотность мощности методом Уэлча (усреднение сегментов)
+
+    Returns:
+        tuple: (np.ndarray частот, np.ndarray СПМ в В^2/Гц)
+    """
+    values = np.asarray(values, dtype=float)
+    segment = min(segment, len(values))
+    step = max(1, int(segment * (1 - overlap)))
+    starts = np.arange(0, len(values) - segment + 1, step)
+    segments = values[starts[:, None] + np.arange(segment)]
+    segments = segments - segments.mean(axis=1, keepdims=True)
+
+    w = window(window_name, segment)
+    spectra = np.abs(np.fft.rfft(segments * w, axis=1)) ** 2
+    psd = spectra.mean(axis=0) / (rate * np.sum(w ** 2))
+    psd[1:] *= 2
+    if segment % 2 == 0:
+        psd[-1] /= 2
+    return np.fft.rfftfreq(segment, 1.0 / rate), psd
+
+
+def _alias_bin(frequency, rate, n):
+    """Бин, в который попадает частота после наложения спектров"""
+    folded = frequency % rate
+    if folded > rate / 2:
+        folded = rate - folded
+    return int(round(folded * n / rate))
+
+
+def sine_metrics(values, rate, frequency=None, window_name="blackmanharris", harmonics=5, full_scale=None):
+    """
+    Динамические характеристики по записи синуса
+
+    Args:
+        values (array): Равномерные отсчеты, В
+        rate (float): Частота дискретизации, Гц
+        frequency (float): Частота синуса, Гц (None - самый сильный пик)
+        harmonics (int): Сколько гармоник (начиная со 2-й) считать искажениями
+        full_scale (float): Размах шкалы АЦП, В - тогда ENOB приводится к полной шкале
+
+    Returns:
+        dict: frequency, amplitude, snr_db, sinad_db, thd_db, sfdr_db, enob
+    """
+    freqs, power = power_spectrum(values, rate, window_name)
+    n = len(values)
+    lobe = MAIN_LOBE[window_name]
+    bins = len(power)
+
+    def lobe_slice(center):
+        return slice(max(center - lobe, 0), min(center + lobe + 1, bins))
+
+    if frequency is None:
+        search = power.copy()
+        search[:lobe + 1] = 0
+        peak = int(np.argmax(search))
+    else:
+        # Уточняем пик около заданной частоты: генератор редко точен до бина
+        guess = _alias_bin(frequency, rate, n)
+        around = lobe_slice(guess)
+        peak = around.start + int(np.argmax(power[around]))
+    fundamental = float(freqs[peak])
+
+    used = np.zeros(bins, dtype=bool)
+    used[:lobe + 1] = True  # Постоянная составляющая и ее лепесток
+    signal_slice = lobe_slice(peak)
+    signal_power = power[signal_slice].sum()
+    used[signal_slice] = True
+
+    distortion_power = 0.0
+    spur_peak = 0.0
+    for h in range(2, harmonics + 2):
+        center = _alias_bin(h * fundamental, rate, n)
+        harmonic = lobe_slice(center)
+        if used[harmonic].any():
+            continue
+        distortion_power += power[harmonic].sum()
+        spur_peak = max(spur_peak, power[harmonic].sum())
+        used[harmonic] = True
+
+    noise_bins = ~used
+    # Шум в занятых бинах оцениваем по среднему в свободных
+    noise_power = power[noise_bins].mean() * (bins - 1) if noise_bins.any() else 0.0
+
+    # Наибольший паразитный пик: гармоника или любая линия среди бинов шума
+    if noise_bins.any():
+        spurs = np.convolve(np.where(noise_bins, power, 0.0), np.ones(2 * lobe + 1), mode="same")
+        spur_peak = max(spur_peak, spurs.max())
+
+    floor = max(signal_power * POWER_FLOOR, np.finfo(float).tiny)
+
+    def db(ratio):
+        return 10 * math.log10(ratio) if ratio > 0 else float("-inf")
+
+    sinad = db(signal_power / max(noise_power + distortion_power, floor))
+    amplitude = math.sqrt(2 * signal_power)
+    enob = (sinad - 1.76) / 6.02
+    if full_scale is not None and amplitude > 0:
+        # Синус не на всю шкалу: ENOB, приведенный к полной амплитуде
+        enob += math.log2(full_scale / 2 / amplitude)
+    return {
+        "frequency": fundamental,
+        "amplitude": amplitude,
+        "snr_db": db(signal_power / max(noise_power, floor)),
+        "sinad_db": sinad,
+        "thd_db": db(distortion_power / max(signal_power, np.finfo(float).tiny)),
+        "sfdr_db": db(signal_power / max(spur_peak, floor)),
+        "enob": enob,
+    }
+
+
+def print_metrics(metrics):
+    print(f"Основная гармоника: {metrics['frequency']:.3f} Гц, амплитуда {metrics['amplitude']:.4f} В")
+    print(f"SNR {metrics['snr_db']:.1f} дБ, SINAD {metrics['sinad_db']:.1f} дБ, "
+          f"THD {metrics['thd_db']:.1f} дБ, SFDR {metrics['sfdr_db']:.1f} дБ, ENOB {metrics['enob']:.2f} бит")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from labkit import sim
+
+    parser = argparse.ArgumentParser(description="ENOB АЦП в симуляторе для разных compare_time")
+    parser.add_argument("--samples", type=int, default=2048, help="Отсчетов на запись")
+    parser.add_argument("--frequency", type=float, default=0.5, help="Частота синуса, Гц")
+    parser.add_argument("--noise", type=float, default=0.005, help="Шум на входе компаратора, В")
+    parser.add_argument("--algorithm", default="sar", help="Алгоритм АЦП")
+    args = parser.parse_args()
+
+    dynamic_range = 3.3
+    for compare_time in (1e-3, 3e-4, 1e-4, 3e-5, 1e-5):
+        simulator = sim.SimulatedGPIO(sim.sine_signal(1.65, 1.5, args.frequency), dynamic_range=dynamic_range,
+                                      trial_time=1e-5, noise=args.noise)
+        simulator.settle_tau = 1e-3 / math.log(510)
+        adc = simulator.make_adc(compare_time=compare_time, algorithm=args.algorithm)
+        times = np.empty(args.samples)
+        values = np.empty(args.samples)
+        for i in range(args.samples):
+            start = simulator.clock
+            values[i] = adc.get_voltage()
+            times[i] = (start + simulator.clock) / 2
+        adc.deinit()
+
+        uniform, rate = to_uniform(times, values)
+        metrics = sine_metrics(uniform, rate, args.frequency, full_scale=dynamic_range)
+        print(f"compare_time {compare_time * 1e3:6.3f} мс, {rate:7.1f} отсч./с: "
+              f"SNR {metrics['snr_db']:5.1f} дБ, SINAD {metrics['sinad_db']:5.1f} дБ, "
+              f"SFDR {metrics['sfdr_db']:5.1f} дБ, ENOB {metrics['enob']:.2f} бит")
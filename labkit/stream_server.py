@@ -0,0 +1,268 @@
+"""
+Локальный сервер потока отсчетов для нескольких подписчиков
+
+Процесс измерения публикует блоки кодов с метками времени, сервер
+рассылает их всем подключенным клиентам по TCP или Unix-сокету.
+Формат кадра: заголовок FRAME_HEADER (магия, канал, номер кадра, число
+отсчетов), затем коды uint16 и метки времени int64 (нс), little-endian.
+
+У каждого подписчика своя очередь на max_queue кадров и свой поток
+отправки. publish() никогда не ждет сеть: если клиент не успевает,
+из его очереди выбрасываются самые старые кадры, а клиент по пропуску
+в номерах кадров видит, сколько потеряно.
+"""
+import array
+import collections
+import os
+import socket
+import struct
+import sys
+import threading
+
+FRAME_MAGIC = b"LK"
+# Магия, канал, номер кадра, число отсчетов
+FRAME_HEADER = struct.Struct("<2sHII")
+
+
+def parse_address(text):
+    """"хост:порт" - TCP, иначе путь к Unix-сокету"""
+    host, sep, port = text.rpartition(":")
+    if sep and port.isdigit():
+        return host or "127.0.0.1", int(port)
+    return text
+
+
+def _to_le_bytes(values, typecode):
+    if sys.byteorder == "little" and isinstance(values, array.array) and values.typecode == typecode:
+        return values.tobytes()
+    data = array.array(typecode, values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+
+def encode_frame(seq, codes, timestamps, channel=0):
+    """Кадр в байтах: заголовок, коды uint16, метки времени int64"""
+    count = len(codes)
+    return b"".join((FRAME_HEADER.pack(FRAME_MAGIC, channel, seq, count),
+                     _to_le_bytes(codes, "H"), _to_le_bytes(timestamps, "q")))
+
+
+class _Subscriber:
+    def __init__(self, connection, max_queue):
+        self.connection = connection
+        self.frames = collections.deque()
+        self.max_queue = max_queue
+        self.condition = threading.Condition()
+        self.dropped = 0
+        self.sent = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name="stream-subscriber", daemon=True)
+
+    def offer(self, frame):
+        """Кладет кадр в очередь; при переполнении выбрасывает самый старый"""
+        with self.condition:
+            if len(self.frames) >= self.max_queue:
+                self.frames.popleft()
+                self.dropped += 1
+            self.frames.append(frame)
+            self.condition.notify()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+    def _run(self):
+        try:
+            while True:
+                with self.condition:
+                    while not self.frames and not self.closed:
+                        self.condition.wait()
+                    if self.closed:
+                        return
+                    frame = self.frames.popleft()
+                self.connection.sendall(frame)
+                self.sent += 1
+        except OSError:
+            pass
+        finally:
+            self.closed = True
+            self.connection.close()
+
+
+class StreamServer:
+    def __init__(self, address, max_queue=64):
+        """
+        Args:
+            address: (хост, порт) для TCP или путь к Unix-сокету
+            max_queue (int): Кадров в очереди каждого подписчика
+        """
+        self.address = address
+        self.max_queue = max_queue
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.dropped_total = 0
+
+        if isinstance(address, str):
+            if os.path.exists(address):
+                os.remove(address)
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind(address)
+        self.socket.listen()
+        if not isinstance(address, str):
+            self.address = self.socket.getsockname()
+
+        self._accept_thread = threading.Thread(target=self._accept, name="stream-accept", daemon=True)
+        self._accept_thread.start()
+
+    def _accept(self):
+        while True:
+            try:
+                connection, _ = self.socket.accept()
+            except OSError:
+                return
+            if connection.family != socket.AF_UNIX:
+                connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            subscriber = _Subscriber(connection, self.max_queue)
+            with self.lock:
+                self.subscribers.append(subscriber)
+            subscriber.thread.start()
+
+    @property
+    def subscriber_count(self):
+        with self.lock:
+            return sum(1 for s in self.subscribers if not s.closed)
+
+    def publish(self, codes, timestamps, channel=0):
+        """
+        Рассылает блок отсчетов всем подписчикам, не дожидаясь отправки
+
+        Returns:
+            int: Номер кадра
+        """
+        with self.lock:
+            seq = self.seq
+            self.seq += 1
+            # Отключившиеся клиенты убираются здесь же
+            alive = []
+            for subscriber in self.subscribers:
+                if subscriber.closed:
+                    self.dropped_total += subscriber.dropped
+                else:
+                    alive.append(subscriber)
+            self.subscribers = alive
+        if alive:
+            frame = encode_frame(seq, codes, timestamps, channel)
+            for subscriber in alive:
+                subscriber.offer(frame)
+        return seq
+
+    def close(self):
+        self.socket.close()
+        with self.lock:
+            subscribers, self.subscribers = self.subscribers, []
+        for subscriber in subscribers:
+            subscriber.close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)
+
+
+class StreamClient:
+    def __init__(self, address, timeout=None):
+        """
+        Args:
+            address: (хост, порт) или путь к Unix-сокету, как у StreamServer
+            timeout (float): Таймаут чтения, с (None - ждать бесконечно)
+        """
+        if isinstance(address, str):
+            self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.socket.connect(address)
+        else:
+            self.socket = socket.create_connection(address)
+        self.socket.settimeout(timeout)
+        self.buffer = bytearray(1 << 16)
+        self.view = memoryview(self.buffer)
+        self.expected_seq = None
+        self.frames_received = 0
+        self.frames_lost = 0
+
+    def close(self):
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_exactly(self, size):
+        if size > len(self.buffer):
+            self.buffer = bytearray(size)
+            self.view = memoryview(self.buffer)
+        received = 0
+        while received < size:
+            n = self.socket.recv_into(self.view[received:size])
+            if n == 0:
+                raise EOFError("Сервер закрыл соединение")
+            received += n
+        return self.view[:size]
+
+    def read_frame(self):
+        """
+        Читает следующий кадр
+
+        Returns:
+            tuple: (канал, номер кадра, array('H') кодов, array('q') меток времени)
+        """
+        magic, channel, seq, count = FRAME_HEADER.unpack(self._read_exactly(FRAME_HEADER.size))
+        if magic != FRAME_MAGIC:
+            raise ValueError("Поток рассинхронизирован: неверная магия кадра")
+        payload = self._read_exactly(count * 10)
+        codes = array.array("H")
+        codes.frombytes(payload[:count * 2])
+        timestamps = array.array("q")
+        timestamps.frombytes(payload[count * 2:])
+        if sys.byteorder != "little":
+            codes.byteswap()
+            timestamps.byteswap()
+
+        if self.expected_seq is not None and seq != self.expected_seq:
+            self.frames_lost += seq - self.expected_seq
+        self.expected_seq = seq + 1
+        self.frames_received += 1
+        return channel, seq, codes, timestamps
+
+    def frames(self):
+        """Кадры до закрытия соединения сервером"""
+        while True:
+            try:
+                yield self.read_frame()
+            except EOFError:
+                return
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Клиент потока отсчетов: печатает статистику кадров")
+    parser.add_argument("address", help="хост:порт или путь к Unix-сокету")
+    parser.add_argument("--duration", type=float, help="Сколько секунд слушать")
+    args = parser.parse_args()
+
+    start = time.monotonic()
+    samples = 0
+    with StreamClient(parse_address(args.address)) as client:
+        for channel, seq, codes, timestamps in client.frames():
+            samples += len(codes)
+            if client.frames_received % 20 == 0:
+                print(f"Кадр {seq}: канал {channel}, отсчетов всего {samples}, "
+                      f"последний код {codes[-1] if codes else '-'}, потеряно кадров {client.frames_lost}")
+            if args.duration is not None and time.monotonic() - start > args.duration:
+                break
+    print(f"Получено кадров: {client.frames_received}, потеряно: {client.frames_lost}")
@@ -0,0 +1,143 @@
+"""
+Неблокирующие анимации светодиодов в одном цикле
+
+Анимация - генератор. Он отдает словарь {пин: яркость в процентах}, чтобы
+изменить пины, или число, чтобы подождать столько секунд. Timeline ведет
+все анимации из одного цикла без потоков и без time.sleep внутри эффектов.
+Если несколько анимаций управляют одним пином, на нем выставляется
+максимальная из их яркостей.
+"""
+import heapq
+import itertools
+import time
+
+from labkit.r2r_adc import _load_gpio
+
+GAMMA = 2.2
+GAMMA_STEPS = 101
+# Яркость, воспринимаемая глазом как линейная: GAMMA_TABLE[i] для i% шкалы
+GAMMA_TABLE = tuple(100.0 * (i / (GAMMA_STEPS - 1)) ** GAMMA for i in range(GAMMA_STEPS))
+
+
+def blink(pin, period=1.0, count=None):
+    """Мигание с периодом period; count=None - бесконечно"""
+    for _ in (itertools.count() if count is None else range(count)):
+        yield {pin: 100}
+        yield period / 2
+        yield {pin: 0}
+        yield period / 2
+
+
+def chase(pins, step=0.2, bounce=True, repeat=1):
+    """Бегущий огонь по pins; bounce - затем в обратную сторону"""
+    path = list(pins) + (list(reversed(pins)) if bounce else [])
+    for _ in (itertools.count() if repeat is None else range(repeat)):
+        for pin in path:
+            yield {pin: 100}
+            yield step
+            yield {pin: 0}
+
+
+def fade(pin, period=5.0, steps=100, repeat=None, table=GAMMA_TABLE):
+    """Плавное нарастание яркости за period по гамма-кривой; repeat=None - бесконечно"""
+    levels = [table[round(i * (len(table) - 1) / steps)] for i in range(steps + 1)]
+    for _ in (itertools.count() if repeat is None else range(repeat)):
+        for level in levels:
+            yield {pin: level}
+            yield period / steps
+
+
+class Timeline:
+    def __init__(self, gpio=None, pwm=None):
+        """
+        Args:
+            gpio: Модуль с интерфейсом RPi.GPIO для цифровых пинов (по умолчанию - сам RPi.GPIO)
+            pwm (labkit.pwm.SoftPWM): Движок ШИМ для пинов с плавной яркостью
+        """
+        self.pwm = pwm
+        self.gpio = gpio if gpio is not None else (pwm.gpio if pwm is not None else _load_gpio())
+        self.pwm_channels = {pin: i for i, pin in enumerate(pwm.pins)} if pwm is not None else {}
+        self.queue = []  # (время, номер, генератор)
+        self.layers = {}  # номер анимации -> {пин: яркость}
+        self.levels = {}  # пин -> выставленная яркость
+        self.counter = itertools.count()
+        self.digital_pins = set()
+        self.gpio.setmode(self.gpio.BCM)
+
+    def add(self, animation, delay=0.0):
+        """Запускает анимацию через delay секунд, возвращает ее номер"""
+        number = next(self.counter)
+        self.layers[number] = {}
+        heapq.heappush(self.queue, (time.monotonic() + delay, number, animation))
+        return number
+
+    def remove(self, number):
+        """Останавливает анимацию; ее вклад в яркость пинов снимается"""
+        self.queue = [item for item in self.queue if item[1] != number]
+        heapq.heapify(self.queue)
+        changed = self.layers.pop(number, {})
+        self._apply(changed)
+
+    def _composite(self, pin):
+        return max((layer.get(pin, 0) for layer in self.layers.values()), default=0)
+
+    def _apply(self, pins):
+        duties = None
+        for pin in pins:
+            level = self._composite(pin)
+            if self.levels.get(pin) == level:
+                continue
+            self.levels[pin] = level
+            channel = self.pwm_channels.get(pin)
+            if channel is not None:
+                if duties is None:
+                    duties = list(self.pwm.duties)
+                duties[channel] = level
+            else:
+                if pin not in self.digital_pins:
+                    self.gpio.setup(pin, self.gpio.OUT)
+                    self.digital_pins.add(pin)
+                self.gpio.output(pin, 1 if level > 0 else 0)
+        if duties is not None:
+            # Все изменения ШИМ за шаг - одно перестроение расписания
+            self.pwm.set_duties(duties)
+
+    def step(self):
+        """
+        Выполняет все наступившие шаги анимаций
+
+        Returns:
+            float: Время (time.monotonic) следующего шага или None, если анимаций нет
+        """
+        now = time.monotonic()
+        changed = set()
+        while self.queue and self.queue[0][0] <= now:
+            due, number, animation = heapq.heappop(self.queue)
+            layer = self.layers[number]
+            for action in animation:
+                if isinstance(action, dict):
+                    layer.update(action)
+                    changed.update(action)
+                    continue
+                # Отсчет от запланированного времени, а не от now - без накопления сдвига
+                heapq.heappush(self.queue, (due + action, number, animation))
+                break
+            else:
+                changed.update(self.layers.pop(number))
+        self._apply(changed)
+        return self.queue[0][0] if self.queue else None
+
+    def run(self, duration=None):
+        """Крутит анимации, пока они есть (или duration секунд)"""
+        end = None if duration is None else time.monotonic() + duration
+        while True:
+            next_time = self.step()
+            if next_time is None:
+                return
+            if end is not None:
+                if time.monotonic() >= end:
+                    return
+                next_time = min(next_time, end)
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
@@ -0,0 +1,101 @@
+"""
+Трассировка шагов преобразования АЦП
+
+Трассировщик включается передачей tracer=ConversionTracer() в R2R_ADC.
+Каждый шаг цикла (выставление числа на ЦАП, ожидание compare_time, чтение
+компаратора, отладочная печать) записывается как интервал времени в
+заранее выделенные массивы - во время измерений память не выделяется.
+save() сохраняет интервалы в формате Chrome trace (JSON), который
+открывается в chrome://tracing или ui.perfetto.dev как временная шкала.
+"""
+import array
+import json
+import os
+import threading
+import time
+
+# Виды интервалов; номер вида хранится в буфере, имя - только при экспорте
+CONVERSION = 0
+DAC = 1
+SETTLE = 2
+COMPARE = 3
+PRINT = 4
+EVENT_NAMES = ("conversion", "number_to_dac", "compare_time", "GPIO.input", "verbose")
+
+
+class ConversionTracer:
+    def __init__(self, capacity=1 << 16, clock=None):
+        """
+        Args:
+            capacity (int): Сколько интервалов помещается в буфер; лишние отбрасываются
+            clock (callable): Часы в наносекундах (по умолчанию - time.perf_counter_ns)
+        """
+        self.capacity = capacity
+        self.clock = clock if clock is not None else time.perf_counter_ns
+        self.kinds = array.array("B", bytes(capacity))
+        self.starts = array.array("q", bytes(8 * capacity))
+        self.ends = array.array("q", bytes(8 * capacity))
+        self.values = array.array("q", bytes(8 * capacity))
+        self.count = 0
+        self.dropped = 0
+
+    def mark(self, kind, start, value=-1):
+        """
+        Записывает интервал от start до текущего момента
+
+        Returns:
+            int: Текущий момент - начало следующего интервала
+        """
+        end = self.clock()
+        i = self.count
+        if i < self.capacity:
+            self.kinds[i] = kind
+            self.starts[i] = start
+            self.ends[i] = end
+            self.values[i] = value
+            self.count = i + 1
+        else:
+            self.dropped += 1
+        return end
+
+    def clear(self):
+        self.count = 0
+        self.dropped = 0
+
+    def totals(self):
+        """Суммарное время каждого вида интервалов в секундах: {имя: время}"""
+        sums = [0] * len(EVENT_NAMES)
+        kinds, starts, ends = self.kinds, self.starts, self.ends
+        for i in range(self.count):
+            sums[kinds[i]] += ends[i] - starts[i]
+        return {name: total * 1e-9 for name, total in zip(EVENT_NAMES, sums)}
+
+    def chrome_events(self, pid=None, tid=None):
+        """Интервалы как список событий Chrome trace ("ph": "X", время в мкс)"""
+        pid = os.getpid() if pid is None else pid
+        tid = threading.get_ident() if tid is None else tid
+        events = []
+        for i in range(self.count):
+            start = self.starts[i]
+            event = {
+                "name": EVENT_NAMES[self.kinds[i]],
+                "ph": "X",
+                "ts": start / 1e3,
+                "dur": (self.ends[i] - start) / 1e3,
+                "pid": pid,
+                "tid": tid,
+            }
+            if self.values[i] >= 0:
+                event["args"] = {"value": self.values[i]}
+            events.append(event)
+        return events
+
+    def save(self, path):
+        """Сохраняет трассу в JSON для chrome://tracing или Perfetto"""
+        trace = {
+            "traceEvents": self.chrome_events(),
+            "displayTimeUnit": "ns",
+            "otherData": {"dropped": self.dropped},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from labkit import sim
+from labkit.aio_i2c import AsyncMCP3021, AsyncMCP4725, BusArbiter
+
+
+class RecordingDevice(sim.FakeMCP3021):
+    """MCP3021 с постоянным входом, записывающий порядок обращений в общий журнал"""
+
+    def __init__(self, name, log):
+        super().__init__(sim.dc_signal(1.0), clock=lambda: 0.0)
+        self.name = name
+        self.log = log
+
+    def read_word_data(self, cmd):
+        self.log.append(self.name)
+        return super().read_word_data(cmd)
+
+
+def test_round_robin_between_devices():
+    log = []
+    bus = sim.FakeSMBus({0x48: RecordingDevice("a", log), 0x4D: RecordingDevice("b", log)})
+
+    async def main():
+        async with BusArbiter(bus) as arbiter:
+            # Все запросы в очереди до первого прохода рабочей задачи
+            futures = [arbiter.submit(0x48, "read_word_data", 0x48, 0) for _ in range(4)]
+            futures += [arbiter.submit(0x4D, "read_word_data", 0x4D, 0) for _ in range(2)]
+            await asyncio.gather(*futures)
+
+    asyncio.run(main())
+    assert log == ["a", "b", "a", "b", "a", "a"]
+
+
+def test_max_batch_limits_transactions_per_batch():
+    bus = sim.FakeSMBus({0x4D: sim.FakeMCP3021(sim.dc_signal(2.5))})
+
+    async def main():
+        async with BusArbiter(bus, max_batch=3) as arbiter:
+            adc = AsyncMCP3021(arbiter, 5.0, 0x4D)
+            numbers = await asyncio.gather(*(adc.get_number() for _ in range(10)))
+            return numbers, arbiter.batches, arbiter.transactions
+
+    numbers, batches, transactions = asyncio.run(main())
+    assert numbers == [511] * 10
+    assert transactions == 10
+    assert batches == 4
+
+
+def test_error_reaches_only_its_request():
+    dac_device = sim.FakeMCP4725()
+    bus = sim.FakeSMBus({0x61: dac_device})
+
+    async def main():
+        async with BusArbiter(bus) as arbiter:
+            missing = AsyncMCP3021(arbiter, 5.0, 0x4D)
+            dac = AsyncMCP4725(arbiter, 5.0, 0x61)
+            return await asyncio.gather(missing.get_number(), dac.set_number(1234), return_exceptions=True)
+
+    error, result = asyncio.run(main())
+    assert isinstance(error, OSError)
+    assert result is None
+    assert dac_device.number == 1234
+
+
+def test_close_cancels_in_flight_and_queued_requests():
+    bus = sim.FakeSMBus({0x4D: sim.FakeMCP3021(sim.dc_signal(1.0))}, transaction_time=0.05)
+
+    async def main():
+        arbiter = BusArbiter(bus, max_batch=1)
+        first = arbiter.submit(0x4D, "read_word_data", 0x4D, 0)
+        second = arbiter.submit(0x4D, "read_word_data", 0x4D, 0)
+        while not arbiter.in_flight:
+            await asyncio.sleep(0.001)
+        await arbiter.close()
+        with pytest.raises(RuntimeError):
+            arbiter.submit(0x4D, "read_word_data", 0x4D, 0)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first.cancelled()
+    assert second.cancelled()
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from labkit import cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile(module):
+    """
+    Импортирует module в чистом интерпретаторе с -X importtime
+
+    Returns:
+        tuple: (суммарное время импорта module в с, загруженные тяжелые модули)
+    """
+    code = (f"import sys, {module}\n"
+            f"print(','.join(m for m in {cli.HEAVY_MODULES!r} if m in sys.modules))\n")
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            env=env, capture_output=True, text=True, check=True)
+    cumulative = None
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            cumulative = int(fields[1]) * 1e-6
+    heavy = [m for m in result.stdout.strip().split(",") if m]
+    return cumulative, heavy
+
+
+@pytest.mark.parametrize("module", ["labkit", "labkit.cli"])
+def test_import_stays_light(module):
+    # Лучший из нескольких запусков: первый может попасть на холодный кэш диска
+    runs = [import_profile(module) for _ in range(3)]
+    best = min(seconds for seconds, _ in runs)
+    assert best < cli.STARTUP_BUDGET, f"import {module}: {best * 1e3:.1f} мс"
+    assert runs[-1][1] == [], f"import {module} загрузил {runs[-1][1]}"
+
+
+def test_read_capture_empty_file(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text("")
+    with pytest.raises(ValueError, match="пуст"):
+        cli.read_capture(str(path))
+
+
+def test_read_capture_header_only(tmp_path):
+    path = tmp_path / "header.csv"
+    path.write_text("time,voltage,measurement_time\n")
+    assert cli.read_capture(str(path)) == ([], [], [])